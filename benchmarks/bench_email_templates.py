@@ -0,0 +1,148 @@
+"""
+Render throughput of the "interview_scheduled" email.
+
+Compares the old per-call f-string (kept here verbatim as the baseline) with the compiled
+template, for single renders and batch renders.
+
+    python -m benchmarks.bench_email_templates --recipients 1000 --repeat 5
+"""
+import argparse
+import json
+import time
+from datetime import date, time as time_of_day
+
+from src.mailer.templates import get_template
+
+
+def legacy_render(candidate_name, interview_date, interview_time, confirmation_link):
+    return f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <style>
+            body {{
+                font-family: Arial, sans-serif;
+                background-color: #f9f9f9;
+                margin: 0;
+                padding: 0;
+            }}
+            .email-container {{
+                max-width: 600px;
+                margin: 50px auto;
+                background-color: #ffffff;
+                border: 1px solid #e0e0e0;
+                border-radius: 8px;
+                box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
+                overflow: hidden;
+            }}
+            .email-header {{
+                background-color: #4caf50;
+                color: #ffffff;
+                padding: 20px;
+                text-align: center;
+                font-size: 20px;
+            }}
+            .email-body {{
+                padding: 20px;
+                color: #333333;
+                line-height: 1.6;
+            }}
+            .email-body p {{
+                margin: 10px 0;
+            }}
+            .email-footer {{
+                background-color: #f1f1f1;
+                padding: 10px;
+                text-align: center;
+                font-size: 12px;
+                color: #666666;
+            }}
+        </style>
+    </head>
+    <body>
+        <div class="email-container">
+            <div class="email-header">
+                Interview Scheduled
+            </div>
+            <div class="email-body">
+            <p>Dear <span style="font-weight: bold;">{candidate_name}</span>,</p>
+            <p>Your interview has been scheduled. Please find the details below:</p>
+            <p><strong>Date:</strong> {interview_date.strftime('%d-%m-%Y')}</p>
+            <p><strong>Time:</strong> {interview_time.strftime('%H:%M')}</p>
+            <p>We recommend that you join the meeting at least 10 minutes early to ensure your setup is working correctly. Please ensure you have a stable internet connection and a quiet environment for the interview. The meeting link will be shared with you separately.</p>
+            <p>To confirm the completion of your interview, please click the link below:</p>
+            <p><a href="{confirmation_link}">Confirm Interview Completion</a></p>
+            <p>Should you have any questions or need to reschedule, feel free to contact us at support@yourcompany.com.</p>
+            <p>Best regards,<br>Your Company</p>
+            </div>
+        <div class="email-footer">
+            &copy; 2025 Your Company. All rights reserved.
+        </div>
+        </div>
+    </body>
+    </html>
+    """
+
+
+def make_recipients(count):
+    return [
+        {
+            "candidate_name": f"Candidate {index}",
+            "interview_date": date(2025, 1, 1 + index % 28),
+            "interview_time": time_of_day(9 + index % 8, (index * 15) % 60),
+            "confirmation_link": f"http://localhost:5173/confirm-interview/{index}?token=abc{index}",
+        }
+        for index in range(count)
+    ]
+
+
+def template_fields(recipient):
+    return {
+        "candidate_name": recipient["candidate_name"],
+        "interview_date": recipient["interview_date"].strftime('%d-%m-%Y'),
+        "interview_time": recipient["interview_time"].strftime('%H:%M'),
+        "confirmation_link": recipient["confirmation_link"],
+    }
+
+
+def best_of(repeat, function):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recipients", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    recipients = make_recipients(args.recipients)
+    started = time.perf_counter()
+    get_template.cache_clear()
+    template = get_template("interview_scheduled")
+    compile_ms = (time.perf_counter() - started) * 1000
+
+    cases = {
+        "legacy_fstring": lambda: [legacy_render(**recipient) for recipient in recipients],
+        "compiled_render": lambda: [template.render(**template_fields(recipient)) for recipient in recipients],
+        "compiled_render_many": lambda: template.render_many(template_fields(recipient) for recipient in recipients),
+    }
+    results = {"recipients": args.recipients, "compile_ms": round(compile_ms, 3), "cases": {}}
+    for name, case in cases.items():
+        seconds = best_of(args.repeat, case)
+        rendered = case()
+        results["cases"][name] = {
+            "seconds": round(seconds, 6),
+            "bytes_per_email": round(sum(len(body) for body in rendered) / len(rendered)),
+            "renders_per_second": round(args.recipients / seconds),
+            "us_per_render": round(seconds / args.recipients * 1e6, 3),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
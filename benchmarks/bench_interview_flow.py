@@ -0,0 +1,394 @@
+"""
+End-to-end load test of the interview flow.
+
+Runs the FastAPI app in-process (uvicorn, real HTTP) against the local fake LLM server
+(benchmarks/fake_llm.py) and a local Postgres database, then drives N concurrent simulated
+candidates through signup, login, resume upload, start, several answers and the report.
+Per endpoint it reports client-side p50/p95/p99 latency and, measured inside the app, the time
+spent in the database and in LLM calls. Output is JSON; `--compare` checks it against an
+earlier result and exits with status 1 on a p95 regression.
+
+The app uses Postgres-only features (range types, exclusion constraints, ON CONFLICT,
+SKIP LOCKED), so the stand-in is a throwaway local Postgres rather than SQLite:
+
+    docker run --rm -d -p 5432:5432 -e POSTGRES_PASSWORD=bench -e POSTGRES_DB=interview_bench postgres:16
+    DB_USERNAME=postgres DB_PASSWORD=bench DB_HOST=localhost DB_NAME=interview_bench \\
+        python -m benchmarks.bench_interview_flow --candidates 50 --concurrency 20 --answers 5 \\
+        --llm-median-ms 800 --output results/interview_flow.json
+"""
+import argparse
+import contextvars
+import io
+import json
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import requests
+
+from benchmarks.common import git_commit, open_output
+from benchmarks.fake_llm import FakeLLM, start_in_background
+
+ENDPOINTS = {
+    "signup": ("POST", "/users/create"),
+    "login": ("POST", "/users/login"),
+    "upload_resume": ("POST", "/qna/upload-resume"),
+    "start_interview": ("POST", "/qna/start-interview/"),
+    "submit_answer": ("POST", "/qna/submit-answer/"),
+    "interview_report": ("GET", "/qna/generate-interview-report/"),
+}
+ENDPOINT_BY_PATH = {path: name for name, (_, path) in ENDPOINTS.items()}
+
+JOB_TITLES = ("Senior Python Developer", "Data Engineer", "Frontend Engineer", "DevOps Engineer", "Product Manager")
+SKILLS = ("Python", "PostgreSQL", "Kafka", "React", "Kubernetes", "AWS", "Terraform", "Django", "Airflow", "GraphQL")
+
+# Time spent inside the app per request, filled in by the hooks installed by `instrument`
+request_timing = contextvars.ContextVar("request_timing", default=None)
+
+
+def configure_environment(args, upload_directory):
+    """Settings the app reads at import time; existing environment variables win."""
+    os.environ.setdefault("OPENAI_KEY", "sk-benchmark")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+    os.environ.setdefault("DB_USERNAME", "postgres")
+    os.environ.setdefault("DB_PASSWORD", "bench")
+    os.environ.setdefault("DB_HOST", "localhost")
+    os.environ.setdefault("DB_NAME", "interview_bench")
+    os.environ["RESUME_UPLOAD_PATH"] = upload_directory
+    # The fake server has no provider limits; keep the dispatcher from becoming the bottleneck
+    os.environ.setdefault("LLM_MAX_CONCURRENCY", str(max(16, args.concurrency * 2)))
+    os.environ.setdefault("LLM_DEFAULT_RPM", "1000000")
+    os.environ.setdefault("LLM_DEFAULT_TPM", "1000000000")
+
+
+def create_schema(engine, reset: bool):
+    from sqlalchemy import text
+    from src.routers.users.models import users
+    from src.routers.qna.models import qna
+    from src.routers.dashboard.models import dashboard
+    from src.routers.feedback.models import feedback
+    from src.jobs import models as job_models
+    from src.mailer import models as mail_models
+
+    with engine.begin() as connection:
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
+    bases = [users.Base, qna.Base, dashboard.Base, feedback.Base, job_models.Base, mail_models.Base]
+    if reset:
+        for base in reversed(bases):
+            base.metadata.drop_all(engine)
+    for base in bases:
+        base.metadata.create_all(engine)
+
+
+def instrument(app, engine, model_router):
+    """
+    Collects DB and LLM time per request, keyed by endpoint. LLM time is taken on the
+    `ModelRouter` instance: the modules bound `src.llm.complete` at import, but that shortcut
+    looks up `router.complete` on every call, so patching the instance reaches every caller.
+    """
+    from sqlalchemy import event
+
+    server_stats = defaultdict(list)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        connection.info.setdefault("bench_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        started = connection.info["bench_started"].pop()
+        timing = request_timing.get()
+        if timing is not None:
+            timing["db_ms"] += (time.perf_counter() - started) * 1000
+            timing["db_queries"] += 1
+
+    original_complete = model_router.complete
+
+    def timed_complete(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return original_complete(*args, **kwargs)
+        finally:
+            timing = request_timing.get()
+            if timing is not None:
+                timing["llm_ms"] += (time.perf_counter() - started) * 1000
+                timing["llm_calls"] += 1
+
+    model_router.complete = timed_complete
+
+    @app.middleware("http")
+    async def collect_timing(request, call_next):
+        timing = {"db_ms": 0.0, "db_queries": 0, "llm_ms": 0.0, "llm_calls": 0}
+        token = request_timing.set(timing)
+        started = time.perf_counter()
+        try:
+            return await call_next(request)
+        finally:
+            request_timing.reset(token)
+            timing["total_ms"] = (time.perf_counter() - started) * 1000
+            server_stats[ENDPOINT_BY_PATH.get(request.url.path, request.url.path)].append(timing)
+
+    return server_stats
+
+
+def start_app(app, port: int):
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, name="app", daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 30
+    while not server.started:
+        if time.monotonic() > deadline or not thread.is_alive():
+            raise RuntimeError("The app did not start.")
+        time.sleep(0.05)
+    return server, thread
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def make_resume(rng: random.Random, name: str, job_title: str) -> bytes:
+    from docx import Document
+
+    document = Document()
+    document.add_heading(name, level=1)
+    document.add_paragraph(job_title)
+    for _ in range(6):
+        skills = ", ".join(rng.sample(SKILLS, 3))
+        document.add_paragraph(f"Built and operated services using {skills}; led {rng.randint(2, 9)} engineers.")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def make_answer(rng: random.Random) -> str:
+    if rng.random() < 0.2:
+        return rng.choice(("I don't know", "pass", "not sure"))  # scored locally
+    skill, other = rng.sample(SKILLS, 2)
+    return (
+        f"In my last role I owned the {skill} platform. I migrated it to {other}, which cut p95 latency by "
+        f"{rng.randint(20, 60)}%. I wrote the design doc, ran the rollout in stages and mentored two engineers on it."
+    )
+
+
+class Candidate:
+    """One simulated candidate going through the whole flow."""
+
+    def __init__(self, index: int, base_url: str, answers: int, think_seconds: float, seed: int, run_id: str):
+        self.index = index
+        self.base_url = base_url
+        self.answers = answers
+        self.think_seconds = think_seconds
+        self.rng = random.Random(seed * 100003 + index)
+        self.http = requests.Session()
+        self.email = f"candidate{index}.{run_id}@bench.example.com"
+        self.phone = f"+1{int(run_id[-8:]) % 10**7:07d}{index:05d}"  # unique across runs too
+        self.samples = []  # (endpoint, milliseconds, ok)
+
+    def call(self, endpoint: str, **kwargs):
+        method, path = ENDPOINTS[endpoint]
+        started = time.perf_counter()
+        try:
+            response = self.http.request(method, self.base_url + path, timeout=120, **kwargs)
+            body = response.json() if response.content else {}
+            # Some endpoints report failures in the body with a 200 status
+            ok = response.status_code < 400 and body.get("success", True) is not False
+        except (requests.RequestException, ValueError):
+            body, ok = {}, False
+        self.samples.append((endpoint, (time.perf_counter() - started) * 1000, ok))
+        if not ok:
+            raise RuntimeError(f"{endpoint} failed for candidate {self.index}: {body}")
+        return body
+
+    def think(self):
+        if self.think_seconds:
+            time.sleep(self.rng.uniform(0.5, 1.5) * self.think_seconds)
+
+    def run(self) -> bool:
+        try:
+            password = "benchmark-password"
+            self.call("signup", json={
+                "name": f"Candidate {self.index}",
+                "email": self.email,
+                "phone_number": self.phone,
+                "password": password,
+            })
+            token = self.call("login", json={"email": self.email, "password": password})["data"]["access_token"]
+            self.http.headers["Authorization"] = f"Bearer {token}"
+
+            job_title = self.rng.choice(JOB_TITLES)
+            self.call("upload_resume", data={
+                "job_title": job_title,
+                "job_description": f"We are hiring a {job_title} with {', '.join(self.rng.sample(SKILLS, 4))} experience.",
+            }, files={"file": (f"resume_{self.index}.docx", make_resume(self.rng, f"Candidate {self.index}", job_title))})
+            self.think()
+
+            started = self.call("start_interview")
+            session_id, qna_id = started["session_id"], started["qna_id"]
+            for _ in range(self.answers):
+                self.think()
+                result = self.call("submit_answer", json={"qna_id": qna_id, "user_answer": make_answer(self.rng)})
+                if "next_qna_id" not in result:
+                    break
+                qna_id = result["next_qna_id"]
+            self.call("interview_report", json={"session_id": session_id})
+            return True
+        except RuntimeError as e:
+            print(e, file=sys.stderr)
+            return False
+
+
+def percentile(values, q):
+    return round(float(np.percentile(values, q)), 2) if values else None
+
+
+def summarize(samples, server_stats, duration, completed, failed, fake):
+    by_endpoint = defaultdict(list)
+    errors = defaultdict(int)
+    for endpoint, milliseconds, ok in samples:
+        by_endpoint[endpoint].append(milliseconds)
+        errors[endpoint] += not ok
+
+    endpoints = {}
+    for endpoint in ENDPOINTS:
+        latencies = by_endpoint.get(endpoint, [])
+        server = server_stats.get(endpoint, [])
+        entry = {
+            "count": len(latencies),
+            "errors": errors[endpoint],
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+            "mean_ms": round(float(np.mean(latencies)), 2) if latencies else None,
+        }
+        if server:
+            mean = {key: float(np.mean([timing[key] for timing in server])) for key in server[0]}
+            entry["server"] = {
+                "mean_total_ms": round(mean["total_ms"], 2),
+                "mean_db_ms": round(mean["db_ms"], 2),
+                "mean_db_queries": round(mean["db_queries"], 2),
+                "mean_llm_ms": round(mean["llm_ms"], 2),
+                "mean_llm_calls": round(mean["llm_calls"], 2),
+                "mean_other_ms": round(mean["total_ms"] - mean["db_ms"] - mean["llm_ms"], 2),
+            }
+        endpoints[endpoint] = entry
+
+    return {
+        "duration_seconds": round(duration, 3),
+        "throughput": {
+            "requests_per_second": round(len(samples) / duration, 2),
+            "candidates_per_minute": round(completed / duration * 60, 2),
+            "completed_candidates": completed,
+            "failed_candidates": failed,
+        },
+        "endpoints": endpoints,
+        "llm_calls": fake.calls,
+        "llm_calls_in_requests": sum(timing["llm_calls"] for timings in server_stats.values() for timing in timings),
+    }
+
+
+def compare(results, baseline_path, tolerance):
+    """Prints p95 changes against a previous result; returns True when one regressed."""
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)
+    regressed = False
+    for endpoint, entry in results["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(endpoint, {}).get("p95_ms")
+        after = entry["p95_ms"]
+        if not before or after is None:
+            continue
+        change = (after - before) / before
+        flag = "REGRESSION" if change > tolerance else ""
+        regressed = regressed or bool(flag)
+        print(f"{endpoint:18} p95 {before:9.1f} -> {after:9.1f} ms  {change:+7.1%}  {flag}", file=sys.stderr)
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=20, help="simulated candidates in total")
+    parser.add_argument("--concurrency", type=int, default=10, help="candidates running at once")
+    parser.add_argument("--answers", type=int, default=5, help="answers per interview")
+    parser.add_argument("--think-ms", type=float, default=0, help="mean pause between a candidate's steps")
+    parser.add_argument("--llm-median-ms", type=float, default=800)
+    parser.add_argument("--llm-sigma", type=float, default=0.5)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--reset", action="store_true", help="drop and recreate the tables first")
+    parser.add_argument("--output", help="also write the JSON result to this file")
+    parser.add_argument("--compare", help="earlier JSON result to check p95 latencies against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed p95 increase for --compare")
+    parser.add_argument("--verbose", action="store_true", help="keep the app's info logs")
+    args = parser.parse_args()
+
+    upload_directory = tempfile.mkdtemp(prefix="interview-bench-")
+    configure_environment(args, upload_directory)
+
+    fake = FakeLLM(args.llm_median_ms, args.llm_sigma, args.llm_error_rate, args.seed)
+    llm_server = start_in_background(fake)
+
+    from loguru import logger
+    if not args.verbose:
+        logger.remove()
+        logger.add(sys.stderr, level="WARNING")
+
+    import openai
+    from main import app
+    from src.utils.db import db_util
+    from src.llm.router import router as model_router
+
+    openai.api_base = f"http://127.0.0.1:{llm_server.server_address[1]}/v1"
+    create_schema(db_util.engine, args.reset)
+    server_stats = instrument(app, db_util.engine, model_router)
+    port = free_port()
+    server, _ = start_app(app, port)
+
+    run_id = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    candidates = [
+        Candidate(index, f"http://127.0.0.1:{port}", args.answers, args.think_ms / 1000, args.seed, run_id)
+        for index in range(args.candidates)
+    ]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        outcomes = list(executor.map(Candidate.run, candidates))
+    duration = time.perf_counter() - started
+
+    server.should_exit = True
+    llm_server.shutdown()
+
+    samples = [sample for candidate in candidates for sample in candidate.samples]
+    results = {
+        "benchmark": "interview_flow",
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "git_commit": git_commit(),
+        "parameters": {
+            key: getattr(args, key)
+            for key in ("candidates", "concurrency", "answers", "think_ms", "llm_median_ms", "llm_sigma", "llm_error_rate", "seed")
+        },
+        **summarize(samples, server_stats, duration, sum(outcomes), len(outcomes) - sum(outcomes), fake),
+    }
+    print(json.dumps(results, indent=2))
+    if results["llm_calls"] and not results["llm_calls_in_requests"]:
+        # Every LLM request went unseen by the timer, so llm_ms would be counted as other time
+        print("The fake LLM served requests but none were timed inside a request.", file=sys.stderr)
+    if args.output:
+        with open_output(args.output) as output:
+            json.dump(results, output, indent=2)
+    if args.compare and compare(results, args.compare, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
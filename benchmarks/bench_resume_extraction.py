@@ -0,0 +1,214 @@
+"""
+Micro-benchmarks of the CPU-bound interview paths: resume text extraction
+(`extract_text_from_pdf`, `extract_text_from_docx`) and question prompt building
+(`build_question_messages`).
+
+A deterministic corpus of PDF and DOCX resumes of varied size is generated first (cached in
+--corpus-dir). For each document and prompt case the benchmark reports the median and best
+time over --repeat runs and the peak Python memory of one run (tracemalloc, in a separate
+pass so it doesn't skew the timings). Each run is appended to --history with the git commit,
+and compared with the previous entry there.
+
+    python -m benchmarks.bench_resume_extraction --repeat 7 --history benchmarks/results/extraction.jsonl
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from benchmarks.common import git_commit, open_output
+
+PDF_PAGES = (1, 2, 5, 10, 25)
+DOCX_PARAGRAPHS = (20, 50, 100, 250, 500)
+LINES_PER_PAGE = 50
+
+WORDS = (
+    "designed built migrated scaled led mentored reduced improved automated launched owned shipped "
+    "python postgresql kafka react kubernetes terraform aws django airflow graphql redis spark "
+    "latency throughput reliability pipelines services platform dashboards onboarding incidents "
+    "customers revenue costs team roadmap architecture testing deployment monitoring security"
+).split()
+
+
+def resume_lines(rng: random.Random, count: int):
+    return [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 16))).capitalize() + "."
+        for _ in range(count)
+    ]
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path: str, pages):
+    """Writes a minimal text PDF (Helvetica, one content stream per page)."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for lines in pages:
+        stream = "BT /F1 10 Tf 14 TL 50 800 Td " + " ".join(f"({_pdf_escape(line)}) Tj T*" for line in lines) + " ET"
+        stream = stream.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] /Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % content_id
+        )
+        page_ids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % page_id for page_id in page_ids), len(page_ids)
+    )
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as pdf:
+        pdf.write(output)
+
+
+def write_docx(path: str, lines):
+    from docx import Document
+
+    document = Document()
+    document.add_heading("Candidate Resume", level=1)
+    for line in lines:
+        document.add_paragraph(line)
+    document.save(path)
+
+
+def build_corpus(directory: str, seed: int):
+    """Generates the corpus once per seed (the seed is in the file names); returns [(kind, label, path)]."""
+    os.makedirs(directory, exist_ok=True)
+    corpus = []
+    for pages in PDF_PAGES:
+        path = os.path.join(directory, f"resume_{pages}p_s{seed}.pdf")
+        if not os.path.exists(path):
+            rng = random.Random(seed * 1000 + pages)
+            write_pdf(path, [resume_lines(rng, LINES_PER_PAGE) for _ in range(pages)])
+        corpus.append(("pdf", f"{pages}_pages", path))
+    for paragraphs in DOCX_PARAGRAPHS:
+        path = os.path.join(directory, f"resume_{paragraphs}para_s{seed}.docx")
+        if not os.path.exists(path):
+            write_docx(path, resume_lines(random.Random(seed * 1000 + paragraphs), paragraphs))
+        corpus.append(("docx", f"{paragraphs}_paragraphs", path))
+    return corpus
+
+
+def measure(function, repeat: int):
+    """Median and best wall time, and the peak traced memory of one extra run."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    result = function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "best_ms": round(min(timings) * 1000, 3),
+        "peak_kib": round(peak / 1024, 1),
+    }, result
+
+
+def prompt_cases(resume_texts):
+    """(label, kwargs) for build_question_messages across stages and resume sizes."""
+    summary = "\n".join(
+        f"Q: Tell me about project {index}? A (4/5): I led the migration of the billing service to Kafka." for index in range(6)
+    )
+    cases = []
+    for label, resume_text in resume_texts:
+        arguments = {
+            "job_title": "Senior Python Developer",
+            "job_description": "Build and operate Python services on PostgreSQL and Kafka. " * 5,
+            "resume_text": resume_text,
+        }
+        cases.append((f"q1_{label}", dict(arguments, question_count=1)))
+        cases.append((f"q3_follow_up_{label}", dict(
+            arguments, question_count=3, previous_answer="I migrated the service to Kafka.", candidates=4, summary=summary,
+        )))
+    return cases
+
+
+def previous_run(history_path: str):
+    if not history_path or not os.path.exists(history_path):
+        return None
+    with open(history_path) as history:
+        lines = [line for line in history if line.strip()]
+    return json.loads(lines[-1]) if lines else None
+
+
+def print_comparison(results, previous):
+    print(f"Compared with {previous.get('git_commit')} ({previous.get('timestamp')}):", file=sys.stderr)
+    for section in ("extraction", "prompts"):
+        for name, entry in results[section].items():
+            before = previous.get(section, {}).get(name)
+            if before:
+                change = (entry["median_ms"] - before["median_ms"]) / before["median_ms"] if before["median_ms"] else 0.0
+                print(f"  {section:10} {name:40} {before['median_ms']:9.3f} -> {entry['median_ms']:9.3f} ms  {change:+7.1%}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--corpus-dir", default=os.path.join(tempfile.gettempdir(), "interview-bench-corpus"))
+    parser.add_argument("--history", help="JSONL file the run is appended to (and compared with)")
+    args = parser.parse_args()
+
+    # The controller reads these at import time; no network access happens here
+    os.environ.setdefault("OPENAI_KEY", "sk-benchmark")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+    from src.routers.qna import controller
+
+    corpus = build_corpus(args.corpus_dir, args.seed)
+    results = {
+        "benchmark": "resume_extraction",
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "git_commit": git_commit(),
+        "python": sys.version.split()[0],
+        "parameters": {"repeat": args.repeat, "seed": args.seed},
+        "extraction": {},
+        "prompts": {},
+    }
+
+    resume_texts = []
+    for kind, label, path in corpus:
+        extract = controller.extract_text_from_pdf if kind == "pdf" else controller.extract_text_from_docx
+        stats, text = measure(lambda: extract(path), args.repeat)
+        stats.update({"file_kib": round(os.path.getsize(path) / 1024, 1), "text_chars": len(text)})
+        results["extraction"][f"{kind}_{label}"] = stats
+        resume_texts.append((f"{kind}_{label}", text))
+
+    # Prompt building for the smallest and the largest resume of each kind
+    pdf_texts = resume_texts[:len(PDF_PAGES)]
+    docx_texts = resume_texts[len(PDF_PAGES):]
+    for label, kwargs in prompt_cases([pdf_texts[0], pdf_texts[-1], docx_texts[0], docx_texts[-1]]):
+        stats, messages = measure(lambda: controller.build_question_messages(**kwargs), args.repeat * 20)
+        stats["prompt_chars"] = sum(len(message["content"]) for message in messages)
+        results["prompts"][label] = stats
+
+    print(json.dumps(results, indent=2))
+    if args.history:
+        previous = previous_run(args.history)
+        if previous:
+            print_comparison(results, previous)
+        with open_output(args.history, "a") as history:
+            history.write(json.dumps(results) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+"""Helpers shared by the benchmark scripts."""
+import os
+import subprocess
+
+
+def git_commit():
+    """Short hash of the checked-out commit, or None outside a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def open_output(path: str, mode: str = "w"):
+    """Opens a results file, creating its directory first."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    return open(path, mode)
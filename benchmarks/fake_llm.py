@@ -0,0 +1,130 @@
+"""
+Local stand-in for the OpenAI chat completions API, with tunable latency and error rate.
+
+Responses are shaped for the app's call sites (JSON question lists, 1-5 scores, model
+answers, study suggestions), so the interview flow runs end to end without network access.
+
+    python -m benchmarks.fake_llm --port 8999 --median-ms 800 --sigma 0.5 --error-rate 0.01
+
+Point the app at it with `openai.api_base = "http://127.0.0.1:8999/v1"`.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TOPICS = (
+    "database migrations", "API design", "team leadership", "incident response", "code reviews",
+    "performance tuning", "testing strategy", "cloud costs", "mentoring", "stakeholder updates",
+    "data pipelines", "security reviews", "release planning", "caching", "on-call rotations",
+)
+
+
+class FakeLLM:
+    """Latency and content model of the fake server (seeded, so runs are repeatable)."""
+
+    def __init__(self, median_ms: float = 800, sigma: float = 0.5, error_rate: float = 0.0, seed: int = 0):
+        self.median_ms = median_ms
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = 0
+
+    def _draw(self):
+        with self.lock:
+            self.calls += 1
+            latency = self.median_ms * self.random.lognormvariate(0.0, self.sigma) if self.median_ms else 0.0
+            return latency / 1000, self.random.random() < self.error_rate, self.random.random()
+
+    def respond(self, request: dict):
+        """Returns (status, body) after the synthetic latency."""
+        delay, fail, draw = self._draw()
+        time.sleep(delay)
+        if fail:
+            return 500, {"error": {"message": "Synthetic server error.", "type": "server_error"}}
+
+        messages = request.get("messages") or [{}]
+        system = messages[0].get("content") or ""
+        prompt = messages[-1].get("content") or ""
+        topic = TOPICS[int(draw * len(TOPICS))]
+        if (request.get("response_format") or {}).get("type") == "json_object":
+            count = 4
+            questions = [f"Can you walk me through your experience with {TOPICS[(int(draw * 97) + index * 4) % len(TOPICS)]}?" for index in range(count)]
+            content = json.dumps({"questions": questions})
+        elif request.get("max_tokens") == 10:
+            content = str(2 + int(draw * 4))  # answer scores 2-5
+        elif "study suggestions" in system:
+            content = f"Review {topic} fundamentals, practice explaining trade-offs, and prepare two concrete examples."
+        elif prompt.startswith("Provide a concise and clear answer"):
+            content = f"A strong answer names a concrete project, the role played in {topic}, and a measurable result."
+        else:
+            content = f"What was the most challenging part of your work on {topic}?"
+
+        prompt_tokens = sum(len(message.get("content") or "") for message in messages) // 4
+        completion_tokens = len(content) // 4
+        return 200, {
+            "id": f"chatcmpl-fake-{self.calls}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+
+def make_server(fake: FakeLLM, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """An HTTP server answering POST /v1/chat/completions (port 0 picks a free port)."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            try:
+                request = json.loads(body or b"{}")
+            except ValueError:
+                request = {}
+            status, payload = fake.respond(request) if self.path.endswith("/chat/completions") else (404, {"error": {"message": "Not found"}})
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_background(fake: FakeLLM, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    server = make_server(fake, host, port)
+    threading.Thread(target=server.serve_forever, name="fake-llm", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8999)
+    parser.add_argument("--median-ms", type=float, default=800)
+    parser.add_argument("--sigma", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = make_server(FakeLLM(args.median_ms, args.sigma, args.error_rate, args.seed), args.host, args.port)
+    print(f"Fake LLM listening on http://{args.host}:{server.server_address[1]}/v1")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
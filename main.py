@@ -1,9 +1,14 @@
 import uvicorn
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, Response
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from src.routers import users_router, qna_router, feedback_router,dashboard_route
+from src.routers import users_router, qna_router, feedback_router,dashboard_route, admin_router
 from src.config import APPNAME, VERSION
+from src.mailer import compile_all as compile_email_templates
+from src.utils.db import db_util
+from src.utils.metrics import PrometheusMiddleware, instrument_engine, register_app_collector, render_metrics
+from src.utils.tracing import instrument_app as instrument_tracing
+from src.utils import query_stats
 
 # Defining the application
 app = FastAPI(
@@ -27,11 +32,32 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
+# Prometheus metrics for requests, database queries and the app components (`/metrics`)
+app.add_middleware(PrometheusMiddleware)
+instrument_engine(db_util.engine)
+register_app_collector(db_util.engine, db_util.SessionLocal)
+
+# Query count, DB time and commits per request; over-budget, slow and repeated queries are logged
+app.add_middleware(query_stats.QueryStatsMiddleware)
+query_stats.instrument_engine(db_util.engine)
+
+# Tracing spans for requests, controller functions, SQL statements and LLM calls (off unless TRACING_EXPORTER is set)
+instrument_tracing(app, db_util.engine)
+
 # Including all the routes for the 'users' module
 app.include_router(users_router)
 app.include_router(qna_router)
 app.include_router(feedback_router)
 app.include_router(dashboard_route)
+app.include_router(admin_router)
+
+@app.on_event("startup")
+def compile_templates():
+    """
+    Compile the email templates once, before the first request.
+    Background jobs and email delivery run in the worker (`python -m src.jobs.worker`).
+    """
+    compile_email_templates()
 
 @app.get("/")
 def main_function():
@@ -40,6 +66,14 @@ def main_function():
     """
     return RedirectResponse(url="/docs/")
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """
+    Prometheus metrics of this worker.
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
 @app.post("/token")
 def forward_to_login():
     """
@@ -1,9 +1,10 @@
-from .config import APPNAME,VERSION,SECRET_KEY,ACCESS_TOKEN_EXPIRE_MINUTES,ALGORITHM
+from .config import APPNAME,VERSION,SECRET_KEY,ACCESS_TOKEN_EXPIRE_MINUTES,ALGORITHM,INTERVIEW_COMPLETION_INTERVAL_SECONDS
 
 __all__=[
     "APPNAME",
     "VERSION",
     "SECRET_KEY",
     "ACCESS_TOKEN_EXPIRE_MINUTES",
-    "ALGORITHM"
-]
\ No newline at end of file
+    "ALGORITHM",
+    "INTERVIEW_COMPLETION_INTERVAL_SECONDS"
+]
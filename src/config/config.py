@@ -1,8 +1,75 @@
 # src/config.py
 import os
+import json
 
 APPNAME = "AI Interview Bot"
 VERSION = "v1"
 SECRET_KEY = os.getenv("SECRET_KEY", "mysecretkey")  # Replace with a more secure secret in production
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30  # Token expiry time in minutes
+
+# Background jobs
+INTERVIEW_COMPLETION_INTERVAL_SECONDS = int(os.getenv("INTERVIEW_COMPLETION_INTERVAL_SECONDS", "300"))
+
+# Outbound email
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "465"))
+SMTP_USE_SSL = os.getenv("SMTP_USE_SSL", "true").lower() == "true"
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "false").lower() == "true"
+SMTP_USERNAME = os.getenv("SMTP_USERNAME", os.getenv("EMAIL"))
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", os.getenv("APP_PASSWORD"))
+EMAIL_FROM = os.getenv("EMAIL_FROM", SMTP_USERNAME)
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "2"))
+SMTP_TIMEOUT_SECONDS = int(os.getenv("SMTP_TIMEOUT_SECONDS", "30"))
+EMAIL_RATE_PER_SECOND = float(os.getenv("EMAIL_RATE_PER_SECOND", "5"))
+EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", "50"))
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "6"))
+EMAIL_RETRY_BASE_SECONDS = int(os.getenv("EMAIL_RETRY_BASE_SECONDS", "30"))
+EMAIL_POLL_INTERVAL_SECONDS = float(os.getenv("EMAIL_POLL_INTERVAL_SECONDS", "2"))
+
+# Job queue worker
+JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", "4"))
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "1"))
+JOB_RETRY_BASE_SECONDS = int(os.getenv("JOB_RETRY_BASE_SECONDS", "10"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+JOB_WORKER_METRICS_PORT = int(os.getenv("JOB_WORKER_METRICS_PORT", "0"))  # Prometheus port of the worker, 0 disables it
+
+# Outbound LLM calls
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_RESERVED_INTERACTIVE = int(os.getenv("LLM_RESERVED_INTERACTIVE", "4"))  # slots background calls can't use
+LLM_MAX_QUEUE = int(os.getenv("LLM_MAX_QUEUE", "100"))  # waiting calls per priority class
+LLM_QUEUE_TIMEOUT_SECONDS = float(os.getenv("LLM_QUEUE_TIMEOUT_SECONDS", "30"))
+# Per-model limits, e.g. '{"gpt-3.5-turbo": {"rpm": 3500, "tpm": 160000}}'
+LLM_MODEL_LIMITS = json.loads(os.getenv("LLM_MODEL_LIMITS", "{}"))
+LLM_DEFAULT_RPM = int(os.getenv("LLM_DEFAULT_RPM", "500"))
+LLM_DEFAULT_TPM = int(os.getenv("LLM_DEFAULT_TPM", "200000"))
+# Model routing per call purpose; overrides are merged over the defaults in src/llm/router.py,
+# e.g. '{"question": {"hedge_after_ms": 1500}}'
+LLM_ROUTES = json.loads(os.getenv("LLM_ROUTES", "{}"))
+LLM_STATS_WINDOW = int(os.getenv("LLM_STATS_WINDOW", "200"))  # calls kept per model, latencies per model and purpose
+LLM_STATS_MAX_AGE_SECONDS = float(os.getenv("LLM_STATS_MAX_AGE_SECONDS", "300"))  # older samples are dropped
+LLM_PROBE_INTERVAL_SECONDS = float(os.getenv("LLM_PROBE_INTERVAL_SECONDS", "30"))  # probes of a primary the route moved away from
+LLM_BREAKER_ERROR_RATE = float(os.getenv("LLM_BREAKER_ERROR_RATE", "0.5"))
+LLM_BREAKER_MIN_CALLS = int(os.getenv("LLM_BREAKER_MIN_CALLS", "10"))
+LLM_BREAKER_COOLDOWN_SECONDS = float(os.getenv("LLM_BREAKER_COOLDOWN_SECONDS", "30"))
+
+# LLM transport: "openai", "record:<cassette.jsonl>" or "replay:<cassette.jsonl>" (src/llm/transport.py)
+LLM_TRANSPORT = os.getenv("LLM_TRANSPORT", "openai")
+LLM_REPLAY_LATENCY = os.getenv("LLM_REPLAY_LATENCY", "recorded")  # e.g. "lognormal:median=800,sigma=0.5"
+LLM_REPLAY_ON_MISS = os.getenv("LLM_REPLAY_ON_MISS", "error")  # "error" or "shape"
+LLM_REPLAY_SEED = int(os.getenv("LLM_REPLAY_SEED", "0"))
+
+# Tracing (src/utils/tracing.py): "none", "otlp", "file:<spans.jsonl>" or "console"
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "none")
+TRACING_SAMPLE_RATIO = float(os.getenv("TRACING_SAMPLE_RATIO", "0.05"))
+
+# Per-request SQL accounting (src/utils/query_stats.py)
+QUERY_STATS_HEADER = os.getenv("QUERY_STATS_HEADER", "false").lower() == "true"  # adds X-DB-Stats to responses
+QUERY_BUDGET_DEFAULT = int(os.getenv("QUERY_BUDGET_DEFAULT", "25"))  # queries per request before it is logged
+# Budgets per route template, e.g. '{"POST /qna/submit-answer/": 12}'
+QUERY_BUDGETS = json.loads(os.getenv("QUERY_BUDGETS", "{}"))
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+REPEATED_QUERY_THRESHOLD = int(os.getenv("REPEATED_QUERY_THRESHOLD", "5"))  # same SELECT this often in a request is logged as N+1
+
+# Precomputed opening questions (src/routers/qna/question_bank.py)
+QUESTION_BANK_REFRESH_SECONDS = int(os.getenv("QUESTION_BANK_REFRESH_SECONDS", str(7 * 24 * 3600)))
@@ -0,0 +1,9 @@
+from .models import Job
+from .queue import job, enqueue, queue_depth
+
+__all__ = [
+    "Job",
+    "job",
+    "enqueue",
+    "queue_depth"
+]
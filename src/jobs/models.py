@@ -0,0 +1,66 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Text,
+    TIMESTAMP,
+    DateTime,
+    func,
+    Index,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.declarative import declarative_base
+Base = declarative_base()
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), nullable=False)
+    payload = Column(JSONB, nullable=False, default=dict)
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, done, failed
+    priority = Column(Integer, nullable=False, default=0)  # lower runs first
+    unique_key = Column(String(255), nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    run_at = Column(DateTime, nullable=False, server_default=func.now())
+    locked_at = Column(DateTime, nullable=True)
+    locked_by = Column(String(100), nullable=True)
+    last_error = Column(Text, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_jobs_due", "priority", "run_at", postgresql_where=text("status = 'queued'")),
+        # At most one queued/running job per unique_key (used for periodic jobs)
+        Index(
+            "ux_jobs_unique_key",
+            "unique_key",
+            unique=True,
+            postgresql_where=text("status IN ('queued', 'running')"),
+        ),
+    )
+
+
+"""
+CREATE TABLE jobs (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    payload JSONB NOT NULL DEFAULT '{}',
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    priority INTEGER NOT NULL DEFAULT 0,
+    unique_key VARCHAR(255),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 5,
+    run_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    locked_at TIMESTAMP,
+    locked_by VARCHAR(100),
+    last_error TEXT,
+    finished_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+CREATE INDEX ix_jobs_due ON jobs (priority, run_at) WHERE status = 'queued';
+CREATE UNIQUE INDEX ux_jobs_unique_key ON jobs (unique_key) WHERE status IN ('queued', 'running');
+"""
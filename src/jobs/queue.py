@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from src.config.config import JOB_MAX_ATTEMPTS
+from .models import Job
+
+# name -> (function, options); filled by the @job decorator
+JOB_REGISTRY = {}
+
+# name -> interval in seconds; the worker keeps one instance of each queued
+PERIODIC_JOBS = {}
+
+
+def job(name: str, max_attempts: int = JOB_MAX_ATTEMPTS, concurrency: int = None, every_seconds: int = None):
+    """
+    Registers a function as a job handler. The handler is called as `function(db, **payload)`
+    with a database session owned by the worker.
+
+    Args:
+        name (str): The job name used with `enqueue`.
+        max_attempts (int): Attempts before the job is marked failed.
+        concurrency (int): Maximum number of this job running at once in one worker.
+        every_seconds (int): Makes the job periodic; the worker schedules it at this interval.
+    """
+    def decorator(function):
+        JOB_REGISTRY[name] = (function, {"max_attempts": max_attempts, "concurrency": concurrency})
+        if every_seconds:
+            PERIODIC_JOBS[name] = every_seconds
+        return function
+    return decorator
+
+
+def enqueue(
+    db: Session,
+    name: str,
+    payload: dict = None,
+    run_at: datetime = None,
+    delay_seconds: float = 0,
+    priority: int = 0,
+    unique_key: str = None,
+    max_attempts: int = None,
+):
+    """
+    Adds a job to the durable queue. The caller commits, so the job only exists if the
+    surrounding transaction succeeds. Jobs with a `unique_key` that is already queued or
+    running are skipped.
+    """
+    if run_at is None:
+        run_at = datetime.utcnow() + timedelta(seconds=delay_seconds)
+    if max_attempts is None:
+        max_attempts = JOB_REGISTRY[name][1]["max_attempts"] if name in JOB_REGISTRY else JOB_MAX_ATTEMPTS
+    stmt = insert(Job).values(
+        name=name,
+        payload=payload or {},
+        run_at=run_at,
+        priority=priority,
+        unique_key=unique_key,
+        max_attempts=max_attempts,
+        status="queued",
+        attempts=0,
+    )
+    if unique_key is not None:
+        stmt = stmt.on_conflict_do_nothing(
+            index_elements=["unique_key"],
+            index_where=Job.status.in_(["queued", "running"]),
+        )
+    db.execute(stmt)
+
+
+def queue_depth(db: Session) -> dict:
+    """Number of jobs per status, e.g. {"queued": 3, "running": 1}."""
+    return dict(
+        db.query(Job.status, func.count(Job.id))
+        .filter(Job.status.in_(["queued", "running"]))
+        .group_by(Job.status)
+        .all()
+    )
@@ -0,0 +1,32 @@
+from sqlalchemy.orm import Session
+from src.config.config import INTERVIEW_COMPLETION_INTERVAL_SECONDS, QUESTION_BANK_REFRESH_SECONDS
+from src.routers.qna import controller as qna_controller
+from src.routers.qna import batch_scoring, question_bank, idempotency
+from .queue import job, enqueue
+
+
+@job("enforce_session_timeout")
+def enforce_session_timeout(db: Session, session_id: int):
+    qna_controller.enforce_session_timeout(session_id, db)
+
+
+@job("complete_past_interviews", concurrency=1, every_seconds=INTERVIEW_COMPLETION_INTERVAL_SECONDS)
+def complete_past_interviews(db: Session):
+    qna_controller.complete_past_interviews(db)
+
+
+@job("batch_score_answers", concurrency=1)
+def batch_score_answers(db: Session, run_id: int):
+    # Work in time slices and re-queue, so one long backfill never looks like a stuck job
+    if not batch_scoring.run_batch_scoring(db, run_id, max_seconds=batch_scoring.SLICE_SECONDS):
+        enqueue(db, "batch_score_answers", {"run_id": run_id})
+
+
+@job("build_question_bank", max_attempts=1, concurrency=1, every_seconds=QUESTION_BANK_REFRESH_SECONDS)
+def build_question_bank(db: Session):
+    question_bank.build_question_bank(db)
+
+
+@job("purge_idempotency_keys", concurrency=1, every_seconds=3600)
+def purge_idempotency_keys(db: Session):
+    idempotency.purge_expired_keys(db)
@@ -0,0 +1,231 @@
+"""
+Job queue worker process.
+
+    python -m src.jobs.worker --concurrency 4
+
+Runs the queued jobs (see `src/jobs/tasks.py`) outside the web workers, reschedules the
+periodic ones, and drains the email outbox.
+"""
+import os
+import time
+import signal
+import random
+import socket
+import argparse
+from threading import Event, Lock
+from collections import Counter
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import select, update
+from loguru import logger as logging
+from src.config.config import JOB_WORKER_CONCURRENCY, JOB_POLL_INTERVAL_SECONDS, JOB_RETRY_BASE_SECONDS, JOB_WORKER_METRICS_PORT
+from src.utils import tracing
+from src.utils.db import db_util
+from .models import Job
+from .queue import JOB_REGISTRY, PERIODIC_JOBS, enqueue
+from . import tasks  # noqa: F401  (registers the job handlers)
+
+# Jobs left "running" longer than this (e.g. the worker died) are retried
+STALE_LOCK_MINUTES = 15
+MAX_RETRY_DELAY_SECONDS = 60 * 60
+
+
+def periodic_key(name: str) -> str:
+    return f"periodic:{name}"
+
+
+class Worker:
+    """Claims due jobs with FOR UPDATE SKIP LOCKED and runs them on a bounded thread pool."""
+
+    def __init__(self, session_factory, concurrency: int = JOB_WORKER_CONCURRENCY, poll_interval: float = JOB_POLL_INTERVAL_SECONDS):
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="job")
+        self.running = Counter()
+        self.running_lock = Lock()
+        self.stop_event = Event()
+
+    def schedule_periodic_jobs(self, db, delay_seconds: float = 0, names=None):
+        """Queues the next run of periodic jobs, unless one is already queued or running."""
+        for name in names or PERIODIC_JOBS:
+            enqueue(db, name, run_at=datetime.utcnow() + timedelta(seconds=delay_seconds), unique_key=periodic_key(name))
+        db.commit()
+
+    def _remaining_slots(self) -> dict:
+        """Free slots per job name, for the names with a concurrency limit."""
+        with self.running_lock:
+            return {
+                name: options["concurrency"] - self.running[name]
+                for name, (_, options) in JOB_REGISTRY.items()
+                if options["concurrency"] is not None
+            }
+
+    def claim(self, db, limit: int):
+        """Marks up to `limit` due jobs as running for this worker and returns them."""
+        now = datetime.utcnow()
+        db.execute(
+            update(Job)
+            .where(Job.status == "running", Job.locked_at < now - timedelta(minutes=STALE_LOCK_MINUTES))
+            .values(status="queued", locked_at=None, locked_by=None)
+        )
+        slots = self._remaining_slots()
+        due = (
+            select(Job.id, Job.name)
+            .where(Job.status == "queued", Job.run_at <= now, Job.name.in_(list(JOB_REGISTRY)))
+            .order_by(Job.priority, Job.run_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        blocked = [name for name, free in slots.items() if free <= 0]
+        if blocked:
+            due = due.where(Job.name.not_in(blocked))
+
+        # A page can hold several jobs of one name; take no more of each than its free slots.
+        # The rows left out are only locked until the commit below and stay queued.
+        taken, per_name = [], Counter()
+        for job_id, name in db.execute(due).all():
+            if name in slots and per_name[name] >= slots[name]:
+                continue
+            per_name[name] += 1
+            taken.append(job_id)
+        if not taken:
+            db.commit()
+            return []
+
+        claimed = db.execute(
+            update(Job)
+            .where(Job.id.in_(taken))
+            .values(status="running", locked_at=now, locked_by=self.worker_id, attempts=Job.attempts + 1)
+            .returning(Job.id, Job.name, Job.payload, Job.attempts, Job.max_attempts)
+        ).all()
+        db.commit()
+        return claimed
+
+    def execute(self, claimed):
+        """Runs one claimed job with its own session and records the outcome."""
+        function, _ = JOB_REGISTRY[claimed.name]
+        started = time.perf_counter()
+        db = self.session_factory()
+        error = None
+        try:
+            with tracing.tracer.start_as_current_span(f"job {claimed.name}", attributes={"job.id": claimed.id, "job.attempt": claimed.attempts}):
+                function(db, **(claimed.payload or {}))
+                db.commit()
+        except Exception as e:
+            db.rollback()
+            error = e
+        finally:
+            db.close()
+
+        duration_ms = (time.perf_counter() - started) * 1000
+        db = self.session_factory()
+        try:
+            now = datetime.utcnow()
+            if error is None:
+                values = {"status": "done", "finished_at": now, "locked_at": None}
+                logging.info(f"Job {claimed.id} ({claimed.name}) done in {duration_ms:.1f} ms.")
+            elif claimed.attempts >= claimed.max_attempts:
+                values = {"status": "failed", "finished_at": now, "locked_at": None, "last_error": str(error)[:2000]}
+                logging.error(f"Job {claimed.id} ({claimed.name}) failed permanently: {error}")
+            else:
+                delay = min(MAX_RETRY_DELAY_SECONDS, JOB_RETRY_BASE_SECONDS * 2 ** (claimed.attempts - 1))
+                values = {
+                    "status": "queued",
+                    "locked_at": None,
+                    "locked_by": None,
+                    "last_error": str(error)[:2000],
+                    "run_at": now + timedelta(seconds=delay * random.uniform(0.8, 1.2)),
+                }
+                logging.warning(f"Job {claimed.id} ({claimed.name}) attempt {claimed.attempts} failed, retrying: {error}")
+            db.execute(update(Job).where(Job.id == claimed.id).values(**values))
+            db.commit()
+
+            if values["status"] != "queued" and claimed.name in PERIODIC_JOBS:
+                self.schedule_periodic_jobs(db, PERIODIC_JOBS[claimed.name], names=[claimed.name])
+        except Exception as e:
+            db.rollback()
+            logging.error(f"Error while recording the result of job {claimed.id}: {e}")
+        finally:
+            db.close()
+            with self.running_lock:
+                self.running[claimed.name] -= 1
+
+    def run_once(self) -> int:
+        """Claims as many jobs as there are free slots and submits them. Returns the count."""
+        with self.running_lock:
+            free = self.concurrency - sum(self.running.values())
+        if free <= 0:
+            return 0
+        db = self.session_factory()
+        try:
+            claimed_jobs = self.claim(db, free)
+        except Exception as e:
+            db.rollback()
+            logging.error(f"Error while claiming jobs: {e}")
+            return 0
+        finally:
+            db.close()
+        for claimed in claimed_jobs:
+            with self.running_lock:
+                self.running[claimed.name] += 1
+            self.executor.submit(self.execute, claimed)
+        return len(claimed_jobs)
+
+    def run_forever(self):
+        db = self.session_factory()
+        try:
+            self.schedule_periodic_jobs(db)
+        finally:
+            db.close()
+        logging.info(f"Job worker {self.worker_id} started with concurrency {self.concurrency}.")
+        while not self.stop_event.is_set():
+            if self.run_once() == 0:
+                self.stop_event.wait(self.poll_interval)
+        self.executor.shutdown(wait=True)
+        logging.info(f"Job worker {self.worker_id} stopped.")
+
+    def stop(self, *_):
+        self.stop_event.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the background job worker.")
+    parser.add_argument("--concurrency", type=int, default=JOB_WORKER_CONCURRENCY)
+    parser.add_argument("--no-email", action="store_true", help="Do not drain the email outbox in this process.")
+    parser.add_argument("--metrics-port", type=int, default=JOB_WORKER_METRICS_PORT, help="Serve Prometheus metrics on this port.")
+    args = parser.parse_args()
+
+    if args.metrics_port:
+        from prometheus_client import start_http_server
+        from src.utils.metrics import instrument_engine, register_app_collector
+
+        instrument_engine(db_util.engine)
+        register_app_collector(db_util.engine, db_util.SessionLocal)
+        start_http_server(args.metrics_port)
+        logging.info(f"Serving worker metrics on port {args.metrics_port}.")
+
+    if tracing.configure_tracing("interview-worker"):
+        tracing.instrument_engine(db_util.engine)
+        tracing.trace_controllers()
+
+    worker = Worker(db_util.SessionLocal, concurrency=args.concurrency)
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+
+    email_sender = None
+    if not args.no_email:
+        from src.mailer import OutboxSender
+        email_sender = OutboxSender(db_util.SessionLocal)
+        email_sender.start()
+
+    try:
+        worker.run_forever()
+    finally:
+        if email_sender is not None:
+            email_sender.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+from .dispatcher import Priority, LLMQueueFull, LLMQueueTimeout, chat_completion, dispatcher
+from .router import CircuitOpen, ModelRouter, complete, router
+from .transport import CassetteMiss, LatencyModel, RecordingTransport, ReplayTransport, set_transport
+
+__all__ = [
+    "Priority",
+    "LLMQueueFull",
+    "LLMQueueTimeout",
+    "chat_completion",
+    "dispatcher",
+    "CircuitOpen",
+    "ModelRouter",
+    "complete",
+    "router",
+    "CassetteMiss",
+    "LatencyModel",
+    "RecordingTransport",
+    "ReplayTransport",
+    "set_transport"
+]
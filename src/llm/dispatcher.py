@@ -0,0 +1,196 @@
+import heapq
+import itertools
+import time
+from enum import IntEnum
+from threading import Condition
+import openai
+from loguru import logger as logging
+from src.config.config import (
+    LLM_MAX_CONCURRENCY,
+    LLM_RESERVED_INTERACTIVE,
+    LLM_MAX_QUEUE,
+    LLM_QUEUE_TIMEOUT_SECONDS,
+    LLM_MODEL_LIMITS,
+    LLM_DEFAULT_RPM,
+    LLM_DEFAULT_TPM,
+)
+from src.utils import metrics
+from src.utils.rate_limit import TokenBucket
+from .transport import get_transport
+
+
+class Priority(IntEnum):
+    """Lower values are served first."""
+    INTERACTIVE = 0  # a candidate is waiting on the response
+    BACKGROUND = 1  # model answers, report suggestions
+    BATCH = 2  # offline jobs (backfills, question bank builds)
+
+
+class LLMQueueFull(Exception):
+    """Raised when a priority class already has the maximum number of waiting calls."""
+
+
+class LLMQueueTimeout(Exception):
+    """Raised when a call waited longer than the queue timeout for capacity."""
+
+
+def estimate_tokens(messages, max_tokens: int = 0) -> int:
+    """Rough token estimate (4 characters per token) of a chat request, prompt plus completion."""
+    characters = sum(len(message.get("content") or "") for message in messages)
+    return characters // 4 + len(messages) * 4 + (max_tokens or 0)
+
+
+class _ModelLimits:
+    def __init__(self, rpm: int, tpm: int):
+        # Buckets refill per second; a full bucket allows a one-second burst of the minute budget
+        self.requests = TokenBucket(rpm / 60.0, capacity=max(1.0, rpm / 60.0))
+        self.tokens = TokenBucket(tpm / 60.0, capacity=max(1.0, tpm / 60.0))
+
+
+class LLMDispatcher:
+    """
+    Process-wide gate in front of the LLM provider.
+
+    Calls wait in a priority queue until a concurrency slot and their model's request and
+    token budgets are available. Higher priority calls are always served first, and
+    background calls can't take the last `reserved_interactive` slots. Each priority class
+    has a bounded queue; a full queue rejects new calls instead of letting latency grow.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        reserved_interactive: int = LLM_RESERVED_INTERACTIVE,
+        max_queue: int = LLM_MAX_QUEUE,
+        queue_timeout: float = LLM_QUEUE_TIMEOUT_SECONDS,
+        model_limits: dict = None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.reserved_interactive = min(reserved_interactive, max_concurrency - 1)
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.model_limits_config = model_limits if model_limits is not None else LLM_MODEL_LIMITS
+        self.models = {}
+        self.condition = Condition()
+        self.waiting = []  # heap of (priority, sequence, model)
+        self.waiting_per_priority = {priority: 0 for priority in Priority}
+        self.sequence = itertools.count()
+        self.in_flight = 0
+        self.stats = {
+            priority.name.lower(): {"calls": 0, "rejected": 0, "timed_out": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0}
+            for priority in Priority
+        }
+
+    def _limits(self, model: str) -> _ModelLimits:
+        if model not in self.models:
+            config = self.model_limits_config.get(model, {})
+            self.models[model] = _ModelLimits(config.get("rpm", LLM_DEFAULT_RPM), config.get("tpm", LLM_DEFAULT_TPM))
+        return self.models[model]
+
+    def _slot_available(self, priority: Priority) -> bool:
+        limit = self.max_concurrency if priority == Priority.INTERACTIVE else self.max_concurrency - self.reserved_interactive
+        return self.in_flight < limit
+
+    def _is_next(self, entry) -> bool:
+        """True when no waiter ahead of `entry` is competing for the same model or a higher class."""
+        priority, _, model = entry
+        for other in self.waiting:
+            if other >= entry:
+                continue
+            if other[0] < priority or other[2] == model:
+                return False
+        return True
+
+    def acquire(self, model: str, tokens: int, priority: Priority = Priority.INTERACTIVE):
+        """Blocks until the call may be sent. Returns the time waited in seconds."""
+        started = time.monotonic()
+        deadline = started + self.queue_timeout
+        stats = self.stats[priority.name.lower()]
+        with self.condition:
+            if self.waiting_per_priority[priority] >= self.max_queue:
+                stats["rejected"] += 1
+                raise LLMQueueFull(f"Too many {priority.name.lower()} LLM calls waiting.")
+            limits = self._limits(model)
+            entry = (priority, next(self.sequence), model)
+            heapq.heappush(self.waiting, entry)
+            self.waiting_per_priority[priority] += 1
+            try:
+                while True:
+                    wait = None
+                    if self._is_next(entry) and self._slot_available(priority):
+                        wait = max(limits.requests.wait_time(1), limits.tokens.wait_time(tokens))
+                        if wait == 0:
+                            limits.requests.try_acquire(1)
+                            limits.tokens.try_acquire(tokens)
+                            self.in_flight += 1
+                            break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        stats["timed_out"] += 1
+                        raise LLMQueueTimeout(f"Waited more than {self.queue_timeout}s for LLM capacity.")
+                    self.condition.wait(min(remaining, wait) if wait else remaining)
+            finally:
+                self.waiting.remove(entry)
+                heapq.heapify(self.waiting)
+                self.waiting_per_priority[priority] -= 1
+                self.condition.notify_all()
+
+        waited = time.monotonic() - started
+        with self.condition:
+            stats["calls"] += 1
+            stats["wait_ms_total"] += waited * 1000
+            stats["wait_ms_max"] = max(stats["wait_ms_max"], waited * 1000)
+        return waited
+
+    def release(self, model: str, estimated_tokens: int, used_tokens: int = None, rate_limited: bool = False):
+        """Frees the concurrency slot and corrects the token budget with the real usage."""
+        with self.condition:
+            self.in_flight -= 1
+            limits = self._limits(model)
+            if used_tokens is not None:
+                limits.tokens.adjust(estimated_tokens - used_tokens)
+            if rate_limited:
+                # The provider disagrees with our budget: empty the bucket so everyone backs off
+                limits.requests.adjust(-limits.requests.capacity)
+            self.condition.notify_all()
+
+    def get_stats(self) -> dict:
+        """Queue and wait statistics per priority class."""
+        with self.condition:
+            return {
+                "in_flight": self.in_flight,
+                "waiting": {priority.name.lower(): count for priority, count in self.waiting_per_priority.items()},
+                "priorities": {name: dict(values) for name, values in self.stats.items()},
+            }
+
+
+dispatcher = LLMDispatcher()
+
+
+def chat_completion(priority: Priority = Priority.INTERACTIVE, **kwargs):
+    """
+    Sends `openai.ChatCompletion.create(**kwargs)` through the process-wide dispatcher, using
+    the configured transport (OpenAI, or a record/replay cassette).
+
+    Raises:
+        LLMQueueFull: The priority class has too many waiting calls.
+        LLMQueueTimeout: No capacity became available within the queue timeout.
+    """
+    model = kwargs["model"]
+    estimated = estimate_tokens(kwargs.get("messages", []), kwargs.get("max_tokens", 0) * kwargs.get("n", 1))
+    waited = dispatcher.acquire(model, estimated, priority)
+    metrics.observe_llm_queue_wait(priority.name.lower(), waited)
+    if waited > 1:
+        logging.warning(f"{priority.name.lower()} call to {model} waited {waited:.2f}s for capacity.")
+    used = None
+    rate_limited = False
+    try:
+        response = get_transport()(**kwargs)
+        usage = response.get("usage") if hasattr(response, "get") else None
+        used = usage.get("total_tokens") if usage else None
+        return response
+    except openai.error.RateLimitError:
+        rate_limited = True
+        raise
+    finally:
+        dispatcher.release(model, estimated, used, rate_limited)
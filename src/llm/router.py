@@ -0,0 +1,293 @@
+import time
+import contextvars
+from collections import deque
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from loguru import logger as logging
+from src.config.config import (
+    LLM_ROUTES,
+    LLM_STATS_WINDOW,
+    LLM_STATS_MAX_AGE_SECONDS,
+    LLM_PROBE_INTERVAL_SECONDS,
+    LLM_BREAKER_ERROR_RATE,
+    LLM_BREAKER_MIN_CALLS,
+    LLM_BREAKER_COOLDOWN_SECONDS,
+)
+from src.utils import metrics, tracing
+from .dispatcher import Priority, LLMQueueFull, LLMQueueTimeout, chat_completion
+
+# primary/fallback model, p95 latency SLO, delay before the hedged backup request and the
+# per-request timeout, for each kind of call
+DEFAULT_ROUTES = {
+    "question": {"primary": "gpt-3.5-turbo", "fallback": "gpt-4o-mini-2024-07-18", "slo_p95_ms": 4000, "hedge_after_ms": 2500, "timeout_seconds": 15},
+    "scoring": {"primary": "gpt-4o-mini-2024-07-18", "fallback": "gpt-3.5-turbo", "slo_p95_ms": 3000, "hedge_after_ms": 2000, "timeout_seconds": 10},
+    "answer": {"primary": "gpt-3.5-turbo", "fallback": "gpt-4o-mini-2024-07-18", "slo_p95_ms": 4000, "hedge_after_ms": None, "timeout_seconds": 15},
+    "batch_scoring": {"primary": "gpt-4o-mini-2024-07-18", "fallback": "gpt-3.5-turbo", "slo_p95_ms": None, "hedge_after_ms": None, "timeout_seconds": 90},
+    "suggestions": {"primary": "gpt-4o-mini-2024-07-18", "fallback": "gpt-3.5-turbo", "slo_p95_ms": 8000, "hedge_after_ms": None, "timeout_seconds": 30},
+}
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class CircuitOpen(Exception):
+    """Raised when a model's circuit breaker rejects a request."""
+
+
+class ModelHealth:
+    """
+    Rolling windows and circuit breaker of one model. Errors are counted per model (an outage
+    hits every purpose), latencies per purpose (each route has its own SLO, and one model
+    serves both short and long calls). Samples older than `max_age` seconds are dropped.
+    """
+
+    def __init__(self, window: int = LLM_STATS_WINDOW, max_age: float = LLM_STATS_MAX_AGE_SECONDS):
+        self.window = window
+        self.max_age = max_age
+        self.calls = deque(maxlen=window)  # (recorded_at, ok)
+        self.latencies = {}  # purpose -> deque of (recorded_at, latency_ms) of successful calls
+        self.lock = Lock()
+        self.opened_at = None
+        self.probing = False
+
+    def _expire(self, now: float):
+        cutoff = now - self.max_age
+        for samples in (self.calls, *self.latencies.values()):
+            while samples and samples[0][0] < cutoff:
+                samples.popleft()
+
+    def record(self, purpose: str, latency_ms: float, ok: bool):
+        now = time.monotonic()
+        with self.lock:
+            self._expire(now)
+            self.calls.append((now, ok))
+            if ok:
+                self.latencies.setdefault(purpose, deque(maxlen=self.window)).append((now, latency_ms))
+            if self.opened_at is not None and self.probing:
+                # Half-open probe finished: close on success, re-open on failure
+                self.probing = False
+                self.opened_at = None if ok else now
+                if ok:
+                    self.calls.clear()
+                    self.latencies.clear()
+                return
+            recent = list(self.calls)[-LLM_BREAKER_MIN_CALLS:]
+            if (
+                self.opened_at is None
+                and len(recent) >= LLM_BREAKER_MIN_CALLS
+                and sum(1 for _, success in recent if not success) / len(recent) >= LLM_BREAKER_ERROR_RATE
+            ):
+                self.opened_at = now
+                logging.warning("LLM circuit breaker opened after sustained errors.")
+
+    def latency(self, purpose: str):
+        """(samples, p95 latency in ms) of the recent successful calls for `purpose`."""
+        with self.lock:
+            self._expire(time.monotonic())
+            latencies = sorted(latency for _, latency in self.latencies.get(purpose, ()))
+        return len(latencies), _percentile(latencies, 0.95)
+
+    def is_available(self) -> bool:
+        """Closed, or open with the cooldown over and no probe in flight."""
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            return not self.probing and time.monotonic() - self.opened_at >= LLM_BREAKER_COOLDOWN_SECONDS
+
+    def try_enter(self) -> bool:
+        """Called right before a request. When open, lets exactly one probe through after the cooldown."""
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if not self.probing and time.monotonic() - self.opened_at >= LLM_BREAKER_COOLDOWN_SECONDS:
+                self.probing = True
+                return True
+            return False
+
+    def cancel_probe(self):
+        """Frees the half-open probe slot of a request that never reached the model."""
+        with self.lock:
+            self.probing = False
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            self._expire(time.monotonic())
+            calls = list(self.calls)
+            latencies = {purpose: sorted(latency for _, latency in samples) for purpose, samples in self.latencies.items()}
+            state = "closed" if self.opened_at is None else ("half_open" if self.probing else "open")
+        return {
+            "calls": len(calls),
+            "error_rate": (sum(1 for _, ok in calls if not ok) / len(calls)) if calls else 0.0,
+            "breaker": state,
+            "purposes": {
+                purpose: {"calls": len(values), "p50_ms": _percentile(values, 0.50), "p95_ms": _percentile(values, 0.95)}
+                for purpose, values in latencies.items()
+            },
+        }
+
+
+class ModelRouter:
+    """
+    Picks the model for each call and protects interview latency:
+
+    - falls back to the route's fallback model while the primary breaks the route's p95 SLO
+      (measured on the route's own calls) or its circuit breaker is open;
+    - meanwhile sends a shadow probe to the primary every `LLM_PROBE_INTERVAL_SECONDS`, so
+      routes that never hedge still see it recover and switch back;
+    - sends a hedged backup request to the other model when the first one is slower than
+      `hedge_after_ms`, and returns whichever answers first;
+    - bounds every request with `timeout_seconds`.
+    """
+
+    def __init__(self, routes: dict = None, max_workers: int = 32):
+        self.routes = {name: dict(route) for name, route in DEFAULT_ROUTES.items()}
+        for name, route in (routes if routes is not None else LLM_ROUTES).items():
+            self.routes.setdefault(name, {}).update(route)
+        self.health = {}
+        self.health_lock = Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm")
+        self.hedges = {"sent": 0, "won": 0}
+        self.probes = {"sent": 0}
+        self.last_probe = {}  # (model, purpose) -> monotonic time of the last probe
+
+    def _health(self, model: str) -> ModelHealth:
+        with self.health_lock:
+            if model not in self.health:
+                self.health[model] = ModelHealth()
+            return self.health[model]
+
+    def _healthy(self, model: str, purpose: str, slo_p95_ms) -> bool:
+        samples, p95_ms = self._health(model).latency(purpose)
+        if slo_p95_ms and samples >= LLM_BREAKER_MIN_CALLS and (p95_ms or 0) > slo_p95_ms:
+            return False
+        return True
+
+    def choose_models(self, purpose: str):
+        """Returns (model to call first, model for the hedge/backup or None)."""
+        route = self.routes[purpose]
+        primary, fallback = route["primary"], route.get("fallback")
+        primary_available = self._health(primary).is_available()
+        if fallback and not (primary_available and self._healthy(primary, purpose, route.get("slo_p95_ms"))):
+            return fallback, primary if primary_available else None
+        return primary, fallback
+
+    def _call(self, model: str, purpose: str, priority: Priority, timeout_seconds, kwargs):
+        health = self._health(model)
+        if not health.try_enter():
+            raise CircuitOpen(f"Circuit breaker for {model} is open.")
+        with tracing.llm_span(model, purpose, priority.name.lower()) as span:
+            started = time.perf_counter()
+            try:
+                response = chat_completion(priority=priority, model=model, request_timeout=timeout_seconds, **kwargs)
+            except (LLMQueueFull, LLMQueueTimeout):
+                # Our own dispatcher's backpressure says nothing about the model's health
+                health.cancel_probe()
+                raise
+            except Exception as e:
+                elapsed = time.perf_counter() - started
+                health.record(purpose, elapsed * 1000, False)
+                metrics.observe_llm_call(model, purpose, elapsed, error=e)
+                raise
+            elapsed = time.perf_counter() - started
+            health.record(purpose, elapsed * 1000, True)
+            metrics.observe_llm_call(model, purpose, elapsed, response=response)
+            tracing.record_llm_response(span, response)
+            return response
+
+    def _probe_due(self, model: str, purpose: str) -> bool:
+        now = time.monotonic()
+        with self.health_lock:
+            if now - self.last_probe.get((model, purpose), float("-inf")) < LLM_PROBE_INTERVAL_SECONDS:
+                return False
+            self.last_probe[(model, purpose)] = now
+            self.probes["sent"] += 1
+            return True
+
+    def _probe(self, model: str, purpose: str, priority: Priority, timeout_seconds, kwargs):
+        """Shadow request to a primary the route moved away from; only its health record is kept."""
+        try:
+            self._call(model, purpose, priority, timeout_seconds, kwargs)
+        except Exception as e:
+            logging.debug(f"Probe of {model} for {purpose} failed: {e}")
+
+    def complete(self, purpose: str, priority: Priority = Priority.INTERACTIVE, **kwargs):
+        """
+        Sends a chat completion for `purpose` (a key of the routes) and returns the first
+        successful response. Raises the last error when every attempt failed.
+
+        Local backpressure (`LLMQueueFull`, `LLMQueueTimeout`) is raised as is: it is not sent
+        on to the backup model, which would only move the overload there.
+        """
+        route = self.routes[purpose]
+        model, backup = self.choose_models(purpose)
+        timeout_seconds = route.get("timeout_seconds")
+        hedge_after_ms = route.get("hedge_after_ms")
+
+        primary = route["primary"]
+        if model != primary and self._health(primary).is_available() and self._probe_due(primary, purpose):
+            self.executor.submit(contextvars.copy_context().run, self._probe, primary, purpose, priority, timeout_seconds, kwargs)
+
+        # The attempts run on the executor with a copy of the caller's context (trace, request)
+        futures = {self.executor.submit(contextvars.copy_context().run, self._call, model, purpose, priority, timeout_seconds, kwargs): model}
+        backup_sent = hedged = False
+        deadline = time.monotonic() + (timeout_seconds or 60) * 2
+        last_error = backpressure = None
+        while futures and time.monotonic() < deadline:
+            if not backup_sent and backup and hedge_after_ms:
+                timeout = min(hedge_after_ms / 1000, max(0.0, deadline - time.monotonic()))
+            else:
+                timeout = max(0.0, deadline - time.monotonic())
+            done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                used_model = futures.pop(future)
+                try:
+                    response = future.result()
+                except (LLMQueueFull, LLMQueueTimeout) as e:
+                    backpressure = e
+                    continue
+                except Exception as e:
+                    last_error = e
+                    logging.warning(f"LLM call to {used_model} for {purpose} failed: {e}")
+                    continue
+                if hedged and used_model == backup:
+                    with self.health_lock:
+                        self.hedges["won"] += 1
+                return response
+
+            if backpressure is not None and not futures:
+                raise backpressure
+            if not done and (backup_sent or not backup or not hedge_after_ms):
+                break  # overall deadline reached
+            # Hedge when the first request is slow, or retry on the backup when it failed
+            if not backup_sent and backup and backpressure is None and self._health(backup).is_available():
+                backup_sent = True
+                if not done:
+                    hedged = True
+                    with self.health_lock:
+                        self.hedges["sent"] += 1
+                futures[self.executor.submit(contextvars.copy_context().run, self._call, backup, purpose, priority, timeout_seconds, kwargs)] = backup
+            elif not futures:
+                break
+        raise last_error or TimeoutError(f"No LLM response for {purpose} within the deadline.")
+
+    def get_stats(self) -> dict:
+        with self.health_lock:
+            models = dict(self.health)
+        return {
+            "models": {model: health.snapshot() for model, health in models.items()},
+            "hedges": dict(self.hedges),
+            "probes": dict(self.probes),
+        }
+
+
+router = ModelRouter()
+
+
+def complete(purpose: str, priority: Priority = Priority.INTERACTIVE, **kwargs):
+    """Module-level shortcut for `router.complete`."""
+    return router.complete(purpose, priority, **kwargs)
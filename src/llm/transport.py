@@ -0,0 +1,227 @@
+"""
+Pluggable transport under `chat_completion`.
+
+    openai                  calls the OpenAI API (the default)
+    record:<path>           calls the OpenAI API and appends every request/response pair to a
+                            JSONL cassette, keyed by a hash of the prompt
+    replay:<path>           answers from a cassette without network access, after a synthetic
+                            latency drawn from LLM_REPLAY_LATENCY
+
+The transport is chosen with LLM_TRANSPORT, or installed in code with `set_transport`
+(tests and benchmarks). Replay is deterministic: the latency generator is seeded, and a prompt
+recorded several times is answered with its recordings in order.
+
+Latency specs (milliseconds):
+    recorded                    the latency measured while recording (the default)
+    recorded:scale=0.5          the same, scaled
+    fixed:ms=300
+    uniform:low=200,high=900
+    lognormal:median=800,sigma=0.5
+    none
+"""
+import os
+import json
+import time
+import random
+import hashlib
+from collections import defaultdict
+from threading import Lock
+import openai
+from loguru import logger as logging
+from src.config.config import LLM_TRANSPORT, LLM_REPLAY_LATENCY, LLM_REPLAY_ON_MISS, LLM_REPLAY_SEED
+
+# Request fields that change the response; the model is left out so a call that was served by
+# a fallback model while recording still replays
+KEY_FIELDS = ("messages", "response_format", "n", "max_tokens", "functions", "tools")
+
+
+class CassetteMiss(LookupError):
+    """Raised in strict replay when the cassette has no recording for a prompt."""
+
+
+def prompt_key(kwargs: dict) -> str:
+    """Hash of the prompt and the request fields that change the response."""
+    request = {field: kwargs[field] for field in KEY_FIELDS if field in kwargs}
+    return hashlib.sha256(json.dumps(request, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def shape_key(kwargs: dict) -> str:
+    """
+    Hash of the request without its variable parts (only the system prompt and the output
+    settings). Replay falls back to recordings of the same shape on a prompt miss.
+    """
+    messages = kwargs.get("messages") or []
+    system = [message.get("content") for message in messages if message.get("role") == "system"]
+    request = {"system": system, "response_format": kwargs.get("response_format"), "max_tokens": kwargs.get("max_tokens")}
+    return hashlib.sha256(json.dumps(request, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class LatencyModel:
+    """Synthetic latency of replayed calls."""
+
+    def __init__(self, kind: str = "recorded", seed: int = LLM_REPLAY_SEED, **params):
+        if kind not in ("recorded", "fixed", "uniform", "lognormal", "none"):
+            raise ValueError(f"Unknown latency distribution: {kind}")
+        self.kind = kind
+        self.params = params
+        self.random = random.Random(seed)
+        self.lock = Lock()
+
+    @classmethod
+    def parse(cls, spec: str, seed: int = LLM_REPLAY_SEED) -> "LatencyModel":
+        """Builds the model from a spec such as "lognormal:median=800,sigma=0.5"."""
+        kind, _, arguments = (spec or "recorded").partition(":")
+        params = {}
+        for argument in filter(None, arguments.split(",")):
+            name, _, value = argument.partition("=")
+            params[name.strip()] = float(value)
+        return cls(kind.strip(), seed=seed, **params)
+
+    def sample_ms(self, recorded_ms: float = None) -> float:
+        with self.lock:
+            if self.kind == "recorded":
+                return (recorded_ms or 0.0) * self.params.get("scale", 1.0)
+            if self.kind == "fixed":
+                return self.params.get("ms", 0.0)
+            if self.kind == "uniform":
+                return self.random.uniform(self.params.get("low", 0.0), self.params.get("high", 0.0))
+            if self.kind == "lognormal":
+                median = self.params.get("median", 500.0)
+                return median * self.random.lognormvariate(0.0, self.params.get("sigma", 0.5))
+            return 0.0
+
+
+def openai_transport(**kwargs):
+    return openai.ChatCompletion.create(**kwargs)
+
+
+class RecordingTransport:
+    """Calls `inner` and appends the exchange to a JSONL cassette."""
+
+    def __init__(self, path: str, inner=openai_transport):
+        self.path = path
+        self.inner = inner
+        self.lock = Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def __call__(self, **kwargs):
+        started = time.perf_counter()
+        entry = {"key": prompt_key(kwargs), "shape": shape_key(kwargs), "model": kwargs.get("model"), "request": kwargs}
+        try:
+            response = self.inner(**kwargs)
+            entry["response"] = json.loads(json.dumps(response, default=str))
+            return response
+        except Exception as e:
+            entry["error"] = {"type": type(e).__name__, "message": str(e)}
+            raise
+        finally:
+            entry["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            line = json.dumps(entry, default=str)
+            with self.lock:
+                with open(self.path, "a", encoding="utf-8") as cassette:
+                    cassette.write(line + "\n")
+
+
+class ReplayTransport:
+    """
+    Answers from a cassette.
+
+    Args:
+        path (str): The JSONL cassette written by `RecordingTransport`.
+        latency (LatencyModel): Synthetic latency added to each call.
+        on_miss (str): "error" raises `CassetteMiss` for an unknown prompt (regression tests);
+            "shape" answers with a recording of the same request shape (load tests with
+            generated inputs).
+    """
+
+    def __init__(self, path: str, latency: LatencyModel = None, on_miss: str = "error"):
+        if on_miss not in ("error", "shape"):
+            raise ValueError(f"Unknown on_miss mode: {on_miss}")
+        self.latency = latency or LatencyModel()
+        self.on_miss = on_miss
+        self.by_key = defaultdict(list)
+        self.by_shape = defaultdict(list)
+        self.cursors = defaultdict(int)
+        self.lock = Lock()
+        self.metrics = {"calls": 0, "hits": 0, "shape_hits": 0, "misses": 0}
+        with open(path, encoding="utf-8") as cassette:
+            for line in cassette:
+                if line.strip():
+                    entry = json.loads(line)
+                    self.by_key[entry["key"]].append(entry)
+                    if "error" not in entry:
+                        # Recorded failures are only replayed for their exact prompt
+                        self.by_shape[entry["shape"]].append(entry)
+        logging.info(f"Loaded LLM cassette {path} ({sum(map(len, self.by_key.values()))} recordings).")
+
+    def _next(self, index, key: str):
+        with self.lock:
+            entries = index.get(key)
+            if not entries:
+                return None
+            position = self.cursors[(id(index), key)]
+            self.cursors[(id(index), key)] = position + 1
+            return entries[position % len(entries)]
+
+    def __call__(self, **kwargs):
+        key = prompt_key(kwargs)
+        entry = self._next(self.by_key, key)
+        outcome = "hits"
+        if entry is None and self.on_miss == "shape":
+            entry = self._next(self.by_shape, shape_key(kwargs))
+            outcome = "shape_hits"
+        with self.lock:
+            self.metrics["calls"] += 1
+            self.metrics[outcome if entry is not None else "misses"] += 1
+        if entry is None:
+            raise CassetteMiss(f"No recording for prompt {key[:12]} (model {kwargs.get('model')}).")
+
+        delay_ms = self.latency.sample_ms(entry.get("latency_ms"))
+        timeout = kwargs.get("request_timeout")
+        if timeout is not None and delay_ms / 1000 > timeout:
+            time.sleep(timeout)
+            raise openai.error.Timeout("Request timed out (replayed latency).")
+        time.sleep(delay_ms / 1000)
+
+        if "error" in entry:
+            error_class = getattr(openai.error, entry["error"]["type"], openai.error.OpenAIError)
+            raise error_class(entry["error"]["message"])
+        return openai.util.convert_to_openai_object(entry["response"])
+
+    def get_metrics(self) -> dict:
+        with self.lock:
+            return dict(self.metrics)
+
+
+def build_transport(spec: str = LLM_TRANSPORT):
+    """Builds the transport described by an LLM_TRANSPORT value."""
+    mode, _, path = (spec or "openai").partition(":")
+    if mode == "openai":
+        return openai_transport
+    if mode == "record":
+        return RecordingTransport(path)
+    if mode == "replay":
+        return ReplayTransport(path, LatencyModel.parse(LLM_REPLAY_LATENCY), on_miss=LLM_REPLAY_ON_MISS)
+    raise ValueError(f"Unknown LLM transport: {spec}")
+
+
+_transport = None
+_transport_lock = Lock()
+
+
+def get_transport():
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = build_transport()
+    return _transport
+
+
+def set_transport(transport):
+    """Installs a transport (any callable taking the ChatCompletion arguments); None resets it."""
+    global _transport
+    with _transport_lock:
+        _transport = transport
@@ -0,0 +1,15 @@
+from .models import EmailOutbox
+from .pool import SMTPConnectionPool
+from .outbox import OutboxSender, enqueue_email, enqueue_emails
+from .templates import EmailTemplate, get_template, compile_all
+
+__all__ = [
+    "EmailOutbox",
+    "SMTPConnectionPool",
+    "OutboxSender",
+    "enqueue_email",
+    "enqueue_emails",
+    "EmailTemplate",
+    "get_template",
+    "compile_all"
+]
@@ -0,0 +1,52 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Text,
+    TIMESTAMP,
+    DateTime,
+    func,
+    Index,
+)
+from sqlalchemy.ext.declarative import declarative_base
+Base = declarative_base()
+
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    to_email = Column(String(255), nullable=False)
+    subject = Column(String(255), nullable=False)
+    body = Column(Text, nullable=False)
+    content_type = Column(String(20), nullable=False, default="plain")
+    status = Column(String(20), nullable=False, default="pending")  # pending, sending, sent, dead
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, server_default=func.now())
+    locked_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    sent_at = Column(DateTime, nullable=True)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_email_outbox_due", "next_attempt_at", postgresql_where=(status == "pending")),
+    )
+
+
+"""
+CREATE TABLE email_outbox (
+    id SERIAL PRIMARY KEY,
+    to_email VARCHAR(255) NOT NULL,
+    subject VARCHAR(255) NOT NULL,
+    body TEXT NOT NULL,
+    content_type VARCHAR(20) NOT NULL DEFAULT 'plain',
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    locked_at TIMESTAMP,
+    last_error TEXT,
+    sent_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+CREATE INDEX ix_email_outbox_due ON email_outbox (next_attempt_at) WHERE status = 'pending';
+"""
@@ -0,0 +1,248 @@
+import time
+import random
+import smtplib
+from threading import Thread, Event, Lock
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from email.mime.text import MIMEText
+from sqlalchemy import select, update, insert
+from sqlalchemy.orm import Session
+from loguru import logger as logging
+from src.config.config import (
+    EMAIL_FROM,
+    EMAIL_RATE_PER_SECOND,
+    EMAIL_BATCH_SIZE,
+    EMAIL_MAX_ATTEMPTS,
+    EMAIL_RETRY_BASE_SECONDS,
+    EMAIL_POLL_INTERVAL_SECONDS,
+)
+from src.utils.rate_limit import TokenBucket
+from .models import EmailOutbox
+from .pool import SMTPConnectionPool
+
+# Messages left in "sending" longer than this (e.g. the process died) are retried
+STALE_LOCK_MINUTES = 10
+MAX_RETRY_DELAY_SECONDS = 6 * 60 * 60
+
+# Rejections that may be permanent; only 5xx replies are, 4xx ones are retried
+REJECTION_ERRORS = (smtplib.SMTPSenderRefused, smtplib.SMTPDataError)
+
+
+def is_permanent(error: Exception) -> bool:
+    """True for errors that will not go away by retrying (5xx rejections)."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return bool(error.recipients) and all(code >= 500 for code, _ in error.recipients.values())
+    if isinstance(error, REJECTION_ERRORS):
+        return error.smtp_code >= 500
+    return False
+
+
+def enqueue_email(db: Session, to_email: str, subject: str, body: str, content_type: str = "plain"):
+    """
+    Adds one email to the durable outbox. The caller commits, so the email is only sent
+    if the surrounding transaction succeeds.
+    """
+    enqueue_emails(db, [{"to_email": to_email, "subject": subject, "body": body, "content_type": content_type}])
+
+
+def enqueue_emails(db: Session, messages):
+    """Adds many emails to the outbox with a single multi-row INSERT."""
+    if messages:
+        db.execute(insert(EmailOutbox).values(list(messages)))
+
+
+def retry_delay(attempts: int, base: int = EMAIL_RETRY_BASE_SECONDS) -> float:
+    """Exponential backoff with jitter: base * 2^(attempts - 1), capped."""
+    delay = min(MAX_RETRY_DELAY_SECONDS, base * (2 ** max(0, attempts - 1)))
+    return delay * random.uniform(0.8, 1.2)
+
+
+class OutboxSender:
+    """
+    Drains the `email_outbox` table: claims due messages in batches, sends them over the
+    SMTP connection pool within the configured rate, and records the outcome.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        pool: SMTPConnectionPool = None,
+        rate_per_second: float = EMAIL_RATE_PER_SECOND,
+        batch_size: int = EMAIL_BATCH_SIZE,
+        max_attempts: int = EMAIL_MAX_ATTEMPTS,
+        poll_interval: float = EMAIL_POLL_INTERVAL_SECONDS,
+        from_email: str = EMAIL_FROM,
+    ):
+        self.session_factory = session_factory
+        self.pool = pool or SMTPConnectionPool()
+        self.rate_limiter = TokenBucket(rate_per_second)
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.from_email = from_email
+        self.executor = ThreadPoolExecutor(max_workers=self.pool.size, thread_name_prefix="smtp")
+        self.stop_event = Event()
+        self.thread = None
+        self.metrics_lock = Lock()
+        self.metrics = {
+            "sent": 0,
+            "failed_attempts": 0,
+            "retried": 0,
+            "dead": 0,
+            "batches": 0,
+            "last_batch_size": 0,
+            "last_batch_ms": 0.0,
+            "send_ms_total": 0.0,
+        }
+
+    def _count(self, **increments):
+        with self.metrics_lock:
+            for key, value in increments.items():
+                self.metrics[key] += value
+
+    def get_metrics(self) -> dict:
+        """Delivery counters plus the current outbox backlog."""
+        with self.metrics_lock:
+            metrics = dict(self.metrics)
+        metrics["smtp_connections_opened"] = self.pool.connections_opened
+        db = self.session_factory()
+        try:
+            metrics["pending"] = db.query(EmailOutbox).filter(EmailOutbox.status == "pending").count()
+        finally:
+            db.close()
+        return metrics
+
+    def claim_batch(self, db: Session):
+        """Locks up to `batch_size` due messages for this sender and returns them."""
+        now = datetime.utcnow()
+        # Put back messages whose sender died mid-batch
+        db.execute(
+            update(EmailOutbox)
+            .where(
+                EmailOutbox.status == "sending",
+                EmailOutbox.locked_at < now - timedelta(minutes=STALE_LOCK_MINUTES),
+            )
+            .values(status="pending", locked_at=None)
+        )
+        due = (
+            select(EmailOutbox.id)
+            .where(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= now)
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        claimed = db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(due.scalar_subquery()))
+            .values(status="sending", locked_at=now)
+            .returning(
+                EmailOutbox.id,
+                EmailOutbox.to_email,
+                EmailOutbox.subject,
+                EmailOutbox.body,
+                EmailOutbox.content_type,
+                EmailOutbox.attempts,
+            )
+        ).all()
+        db.commit()
+        return claimed
+
+    def _deliver(self, message):
+        """Sends one claimed message. Returns (message, error)."""
+        self.rate_limiter.acquire()
+        mime = MIMEText(message.body, message.content_type)
+        mime["Subject"] = message.subject
+        mime["From"] = self.from_email
+        mime["To"] = message.to_email
+        started = time.perf_counter()
+        try:
+            self.pool.send(self.from_email, message.to_email, mime.as_string())
+            return message, None
+        except Exception as e:
+            return message, e
+        finally:
+            self._count(send_ms_total=(time.perf_counter() - started) * 1000)
+
+    def run_once(self) -> int:
+        """Claims and sends one batch. Returns the number of messages processed."""
+        started = time.perf_counter()
+        db = self.session_factory()
+        try:
+            batch = self.claim_batch(db)
+            if not batch:
+                return 0
+
+            results = list(self.executor.map(self._deliver, batch))
+            now = datetime.utcnow()
+
+            sent_ids = [message.id for message, error in results if error is None]
+            if sent_ids:
+                db.execute(
+                    update(EmailOutbox)
+                    .where(EmailOutbox.id.in_(sent_ids))
+                    .values(status="sent", sent_at=now, locked_at=None, attempts=EmailOutbox.attempts + 1)
+                )
+
+            retried = dead = 0
+            for message, error in results:
+                if error is None:
+                    continue
+                attempts = message.attempts + 1
+                give_up = is_permanent(error) or attempts >= self.max_attempts
+                logging.warning(f"Email {message.id} to {message.to_email} failed (attempt {attempts}): {error}")
+                db.execute(
+                    update(EmailOutbox)
+                    .where(EmailOutbox.id == message.id)
+                    .values(
+                        status="dead" if give_up else "pending",
+                        attempts=attempts,
+                        locked_at=None,
+                        last_error=str(error)[:2000],
+                        next_attempt_at=now + timedelta(seconds=retry_delay(attempts)),
+                    )
+                )
+                if give_up:
+                    dead += 1
+                else:
+                    retried += 1
+            db.commit()
+
+            duration_ms = (time.perf_counter() - started) * 1000
+            self._count(
+                sent=len(sent_ids),
+                failed_attempts=retried + dead,
+                retried=retried,
+                dead=dead,
+                batches=1,
+            )
+            with self.metrics_lock:
+                self.metrics["last_batch_size"] = len(batch)
+                self.metrics["last_batch_ms"] = round(duration_ms, 2)
+            return len(batch)
+        except Exception as e:
+            db.rollback()
+            logging.error(f"Error in OutboxSender.run_once: {e}")
+            return 0
+        finally:
+            db.close()
+
+    def run_forever(self):
+        """Drains the outbox until `stop` is called, sleeping when it is empty."""
+        while not self.stop_event.is_set():
+            if self.run_once() < self.batch_size:
+                self.stop_event.wait(self.poll_interval)
+
+    def start(self):
+        """Starts the sender in a daemon thread."""
+        if self.thread is None or not self.thread.is_alive():
+            self.stop_event.clear()
+            self.thread = Thread(target=self.run_forever, name="email-outbox", daemon=True)
+            self.thread.start()
+
+    def stop(self, timeout: float = 10):
+        """Stops the sender thread and closes pooled connections."""
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+        self.executor.shutdown(wait=False)
+        self.pool.close()
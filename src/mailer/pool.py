@@ -0,0 +1,119 @@
+import smtplib
+from queue import Queue, Empty
+from loguru import logger as logging
+from src.config.config import (
+    SMTP_HOST,
+    SMTP_PORT,
+    SMTP_USE_SSL,
+    SMTP_STARTTLS,
+    SMTP_USERNAME,
+    SMTP_PASSWORD,
+    SMTP_POOL_SIZE,
+    SMTP_TIMEOUT_SECONDS,
+)
+
+
+class SMTPConnectionPool:
+    """
+    Keeps up to `size` logged-in SMTP connections open and hands them out one at a time,
+    so the TLS handshake and login are paid once per connection instead of once per email.
+
+    For local testing point it at a plain SMTP stand-in, e.g.
+    `python -m aiosmtpd -n -l localhost:8025` with SMTP_HOST=localhost, SMTP_PORT=8025,
+    SMTP_USE_SSL=false and no SMTP_USERNAME.
+    """
+
+    def __init__(
+        self,
+        host: str = SMTP_HOST,
+        port: int = SMTP_PORT,
+        use_ssl: bool = SMTP_USE_SSL,
+        starttls: bool = SMTP_STARTTLS,
+        username: str = SMTP_USERNAME,
+        password: str = SMTP_PASSWORD,
+        size: int = SMTP_POOL_SIZE,
+        timeout: int = SMTP_TIMEOUT_SECONDS,
+    ):
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self.starttls = starttls
+        self.username = username
+        self.password = password
+        self.size = size
+        self.timeout = timeout
+        self.idle = Queue()
+        self.connections_opened = 0
+
+    def _connect(self):
+        if self.use_ssl:
+            server = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.starttls:
+                server.starttls()
+        if self.username:
+            server.login(self.username, self.password)
+        self.connections_opened += 1
+        return server
+
+    def acquire(self):
+        """Returns an idle connection that still answers NOOP, or a new one."""
+        while True:
+            try:
+                server = self.idle.get_nowait()
+            except Empty:
+                return self._connect()
+            try:
+                if server.noop()[0] == 250:
+                    return server
+            except smtplib.SMTPException:
+                pass
+            except OSError:
+                pass
+            self._close(server)
+
+    def release(self, server, broken: bool = False):
+        """Puts a connection back, or closes it when it failed or the pool is full."""
+        if broken or self.idle.qsize() >= self.size:
+            self._close(server)
+        else:
+            self.idle.put(server)
+
+    def _close(self, server):
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception as e:
+                logging.debug(f"Error while closing SMTP connection: {e}")
+
+    def close(self):
+        """Closes every idle connection."""
+        while True:
+            try:
+                self._close(self.idle.get_nowait())
+            except Empty:
+                return
+
+    def send(self, from_email: str, to_email: str, message: str):
+        """Sends one already-formatted message over a pooled connection."""
+        server = self.acquire()
+        try:
+            server.sendmail(from_email, to_email, message)
+        except smtplib.SMTPServerDisconnected:
+            self.release(server, broken=True)
+            raise
+        except smtplib.SMTPException:
+            # A refused recipient or message; the connection itself is fine
+            # (checked before OSError, which SMTPException subclasses)
+            self.release(server)
+            raise
+        except OSError:
+            self.release(server, broken=True)
+            raise
+        except Exception:
+            self.release(server)
+            raise
+        self.release(server)
@@ -0,0 +1,162 @@
+import os
+import re
+import html
+from functools import lru_cache
+from html.parser import HTMLParser
+
+TEMPLATE_DIRECTORY = os.path.join(os.path.dirname(__file__), "templates")
+
+PLACEHOLDER = re.compile(r"{{\s*(\w+)\s*}}")
+STYLE_BLOCK = re.compile(r"<style[^>]*>(.*?)</style>", re.S | re.I)
+CSS_RULE = re.compile(r"([^{}]+){([^{}]*)}")
+VOID_ELEMENTS = {"area", "base", "br", "col", "hr", "img", "input", "link", "meta", "source", "wbr"}
+
+
+def parse_css(css: str):
+    """
+    Parses a stylesheet into (selector parts, declarations) rules.
+    Supports the selectors the email templates use: `tag`, `.class` and descendant
+    combinations of those, e.g. `.email-body p`.
+    """
+    rules = []
+    for selectors, body in CSS_RULE.findall(css):
+        declarations = "; ".join(
+            " ".join(part.split()) for part in body.split(";") if part.strip()
+        )
+        for selector in selectors.split(","):
+            parts = selector.split()
+            if parts:
+                rules.append((parts, declarations))
+    return rules
+
+
+def _matches(simple_selector: str, tag: str, classes) -> bool:
+    if simple_selector.startswith("."):
+        return simple_selector[1:] in classes
+    return simple_selector.lower() == tag
+
+
+class _CSSInliner(HTMLParser):
+    """Re-serializes an HTML document with matching CSS rules moved into `style` attributes."""
+
+    def __init__(self, rules):
+        super().__init__(convert_charrefs=False)
+        self.rules = rules
+        self.ancestors = []
+        self.output = []
+
+    def _style_for(self, tag, attrs):
+        classes = (attrs.get("class") or "").split()
+        declarations = []
+        for parts, body in self.rules:
+            if not _matches(parts[-1], tag, classes):
+                continue
+            # Every remaining part must match some ancestor, in order
+            remaining = list(parts[:-1])
+            for ancestor_tag, ancestor_classes in reversed(self.ancestors):
+                if remaining and _matches(remaining[-1], ancestor_tag, ancestor_classes):
+                    remaining.pop()
+            if not remaining:
+                declarations.append(body)
+        if attrs.get("style"):
+            declarations.append(attrs["style"].strip().rstrip(";"))
+        return "; ".join(declarations)
+
+    def _render_tag(self, tag, attrs, closing=""):
+        attributes = dict(attrs)
+        style = self._style_for(tag, attributes)
+        if style:
+            attributes["style"] = style + ";"
+        rendered = "".join(
+            f' {name}="{html.escape(value)}"' if value is not None else f" {name}"
+            for name, value in attributes.items()
+        )
+        self.output.append(f"<{tag}{rendered}{closing}>")
+        return attributes
+
+    def handle_starttag(self, tag, attrs):
+        attributes = self._render_tag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.ancestors.append((tag, (attributes.get("class") or "").split()))
+
+    def handle_startendtag(self, tag, attrs):
+        self._render_tag(tag, attrs, closing=" /")
+
+    def handle_endtag(self, tag):
+        for index in range(len(self.ancestors) - 1, -1, -1):
+            if self.ancestors[index][0] == tag:
+                del self.ancestors[index:]
+                break
+        self.output.append(f"</{tag}>")
+
+    def handle_data(self, data):
+        self.output.append(data)
+
+    def handle_entityref(self, name):
+        self.output.append(f"&{name};")
+
+    def handle_charref(self, name):
+        self.output.append(f"&#{name};")
+
+    def handle_decl(self, decl):
+        self.output.append(f"<!{decl}>")
+
+    def handle_comment(self, data):
+        pass
+
+
+def inline_css(document: str) -> str:
+    """Moves the rules of every <style> block into `style` attributes and drops the blocks."""
+    rules = parse_css(" ".join(STYLE_BLOCK.findall(document)))
+    document = STYLE_BLOCK.sub("", document)
+    inliner = _CSSInliner(rules)
+    inliner.feed(document)
+    inliner.close()
+    # Collapse the indentation whitespace; it has no meaning in the rendered email
+    return re.sub(r">\s+<", "><", "".join(inliner.output)).strip()
+
+
+class EmailTemplate:
+    """
+    An email template compiled once: CSS is already inlined and the `{{ field }}` slots are
+    split out, so rendering is a single join of static segments and escaped values.
+    """
+
+    def __init__(self, source: str):
+        parts = PLACEHOLDER.split(inline_css(source))
+        # parts alternates static text and field names: [text, field, text, field, ..., text]
+        self.head = parts[0]
+        self.slots = tuple(zip(parts[1::2], parts[2::2]))
+        self.fields = tuple(dict.fromkeys(parts[1::2]))
+
+    def render(self, **values) -> str:
+        """Renders the template for one recipient. Values are HTML-escaped."""
+        return self.render_many((values,))[0]
+
+    def render_many(self, rows):
+        """Renders the template for many recipients (an iterable of dicts)."""
+        head = self.head
+        slots = self.slots
+        escape = html.escape
+        rendered = []
+        for values in rows:
+            parts = [head]
+            for field, static in slots:
+                parts.append(escape(str(values[field])))
+                parts.append(static)
+            rendered.append("".join(parts))
+        return rendered
+
+
+@lru_cache(maxsize=None)
+def get_template(name: str) -> EmailTemplate:
+    """Loads and compiles `templates/<name>.html` once per process."""
+    with open(os.path.join(TEMPLATE_DIRECTORY, f"{name}.html"), encoding="utf-8") as template_file:
+        return EmailTemplate(template_file.read())
+
+
+def compile_all():
+    """Compiles every bundled template. Called at startup so no request pays for it."""
+    for filename in sorted(os.listdir(TEMPLATE_DIRECTORY)):
+        if filename.endswith(".html"):
+            get_template(filename[: -len(".html")])
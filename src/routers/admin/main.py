@@ -0,0 +1,71 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from fastapi.security import OAuth2PasswordBearer
+from loguru import logger as logging
+from src.utils.db import db_util
+from src.utils.jwt import get_email_from_token
+from src.routers.users.models import users as users_model
+from .profiler import MAX_DURATION_SECONDS, ProfilerBusy, profiler, render_collapsed
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+
+# Defining the router
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    responses={404: {"description": "Not found"}},
+)
+
+
+def require_admin(token: str = Depends(oauth2_scheme)):
+    """
+    Returns the logged-in user when they are an admin; 403 otherwise.
+    The lookup uses its own short-lived session: a `get_db` session would stay checked out,
+    idle in a transaction, until the response is sent, i.e. for the whole capture.
+    """
+    email = get_email_from_token(token)
+    db = db_util.SessionLocal()
+    try:
+        user = db.query(users_model.User).filter(users_model.User.email == email).first()
+    finally:
+        db.close()
+    if not user or user.role != users_model.UserRole.admin:
+        raise HTTPException(status_code=403, detail="Admin access required.")
+    return user
+
+
+@router.post("/profile", response_class=PlainTextResponse)
+def capture_profile(
+    seconds: float = Query(10, gt=0, le=MAX_DURATION_SECONDS),
+    interval_ms: float = Query(10, ge=1, le=1000),
+    thread: str = Query(None, description="Only sample threads whose name contains this."),
+    admin: users_model.User = Depends(require_admin),
+):
+    """
+    Samples the stacks of this worker process for `seconds` and returns them as collapsed
+    stacks, ready for flamegraph.pl or speedscope. With several workers, each capture profiles
+    the worker that serves the request.
+    """
+    logging.info(f"Admin {admin.email} started a {seconds}s profile (interval {interval_ms} ms).")
+    try:
+        result = profiler.capture(seconds, interval_ms / 1000, thread_filter=thread)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return PlainTextResponse(
+        render_collapsed(result["stacks"]),
+        headers={
+            "X-Profile-Samples": str(result["samples"]),
+            "X-Profile-Duration": str(result["duration_seconds"]),
+            "X-Profile-Pid": str(result["pid"]),
+            "Content-Disposition": f"attachment; filename=profile-{result['pid']}.folded",
+        },
+    )
+
+
+@router.get("/profile/status")
+def profile_status(admin: users_model.User = Depends(require_admin)):
+    """
+    Whether a capture is running in this worker.
+    """
+    return profiler.status()
@@ -0,0 +1,128 @@
+"""
+On-demand sampling profiler of the running worker process.
+
+While a capture runs, the thread that called `capture` (the request's threadpool thread)
+reads the stack of every other thread (`sys._current_frames`) every `interval` seconds and
+counts the stacks. The result is in the
+collapsed-stack format read by flamegraph.pl, speedscope and inferno:
+
+    MainThread;run (uvicorn/server.py:61);...;extract_text_from_pdf (qna/controller.py:32) 412
+
+Nothing runs between captures, so the profiler costs nothing while idle. Threads that are
+blocked (waiting on a lock, a socket or the database) are sampled too; their stacks end in
+the waiting call.
+"""
+import os
+import sys
+import time
+import threading
+from collections import Counter
+from threading import Lock
+
+MAX_DURATION_SECONDS = 60
+MIN_INTERVAL_SECONDS = 0.001
+MAX_STACK_DEPTH = 128
+
+
+class ProfilerBusy(Exception):
+    """Raised when a capture is already running in this process."""
+
+
+def _frame_label(code) -> str:
+    # Path relative to the nearest two directories keeps labels short but unambiguous
+    filename = os.path.join(*code.co_filename.split(os.sep)[-2:]) if code.co_filename else "?"
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+def collapse_stack(frame, thread_name: str) -> str:
+    """One collapsed line (root first) for the stack ending at `frame`."""
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    labels.append(thread_name.replace(";", ":").replace(" ", "_"))
+    return ";".join(reversed(labels))
+
+
+class SamplingProfiler:
+    """Samples the stacks of all threads of the process during a bounded capture."""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.running = False
+        self.started_at = None
+        self.captures = 0
+
+    def _sample(self, stacks: Counter, own_id: int, thread_filter: str = None):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            name = names.get(thread_id, f"thread-{thread_id}")
+            if thread_filter and thread_filter not in name:
+                continue
+            stacks[collapse_stack(frame, name)] += 1
+
+    def capture(self, duration: float, interval: float = 0.01, thread_filter: str = None, stop: threading.Event = None) -> dict:
+        """
+        Samples for `duration` seconds, in the calling thread.
+
+        Args:
+            duration (float): Length of the capture in seconds (at most `MAX_DURATION_SECONDS`).
+            interval (float): Seconds between samples.
+            thread_filter (str): Only sample threads whose name contains this (optional).
+            stop (threading.Event): Ends the capture early when set (optional).
+
+        Returns:
+            dict: The collapsed stacks (`stacks`, a Counter) and the capture statistics.
+
+        Raises:
+            ProfilerBusy: Another capture is running.
+        """
+        duration = min(max(duration, 0.0), MAX_DURATION_SECONDS)
+        interval = max(interval, MIN_INTERVAL_SECONDS)
+        with self.lock:
+            if self.running:
+                raise ProfilerBusy("A profile is already being captured in this worker.")
+            self.running = True
+            self.started_at = time.time()
+
+        stacks = Counter()
+        samples = 0
+        own_id = threading.get_ident()
+        started = time.perf_counter()
+        deadline = started + duration
+        try:
+            while time.perf_counter() < deadline and not (stop is not None and stop.is_set()):
+                self._sample(stacks, own_id, thread_filter)
+                samples += 1
+                time.sleep(interval)
+        finally:
+            with self.lock:
+                self.running = False
+                self.started_at = None
+                self.captures += 1
+        return {
+            "stacks": stacks,
+            "samples": samples,
+            "duration_seconds": round(time.perf_counter() - started, 3),
+            "interval_seconds": interval,
+            "pid": os.getpid(),
+        }
+
+    def status(self) -> dict:
+        with self.lock:
+            return {
+                "running": self.running,
+                "started_at": self.started_at,
+                "captures": self.captures,
+                "pid": os.getpid(),
+            }
+
+
+def render_collapsed(stacks: Counter) -> str:
+    """The collapsed-stack text, heaviest stacks first."""
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+profiler = SamplingProfiler()
@@ -0,0 +1,89 @@
+from datetime import datetime
+from collections import defaultdict
+from sqlalchemy import literal_column
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from .models import SessionScoreSummary, UserScoreSummary
+
+SCORE_BUCKETS = (1, 2, 3, 4, 5)
+
+
+def _empty_delta():
+    return {"question_count": 0, "score_sum": 0, **{f"score_{b}": 0 for b in SCORE_BUCKETS}}
+
+
+def _upsert(db: Session, model, key_values: dict, delta: dict, last_activity: datetime):
+    """
+    Adds `delta` onto the aggregate row identified by `key_values`, creating it if needed.
+    Returns True when the row was created by this statement.
+    """
+    table = model.__table__
+    stmt = insert(table).values(**key_values, **delta, last_activity=last_activity)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[column.name for column in table.primary_key.columns],
+        set_={
+            **{column: table.c[column] + stmt.excluded[column] for column in delta},
+            "last_activity": stmt.excluded.last_activity,
+        },
+    ).returning(literal_column("xmax = 0"))
+    return bool(db.execute(stmt).scalar())
+
+
+def apply_score_deltas(db: Session, changes):
+    """
+    Incrementally maintains the per-session and per-user score aggregates.
+
+    Args:
+        db (Session): The database session. The caller owns the commit, so the
+            aggregates are written in the same transaction as the QnA rows.
+        changes (iterable): Tuples of (user_id, session_id, previous_score, new_score).
+            `previous_score` is None when the answer is reviewed for the first time.
+    """
+    now = datetime.utcnow()
+    session_deltas = {}
+    session_owner = {}
+    for user_id, session_id, previous_score, new_score in changes:
+        delta = session_deltas.setdefault(session_id, _empty_delta())
+        session_owner[session_id] = user_id
+        if previous_score is None:
+            delta["question_count"] += 1
+        else:
+            delta["score_sum"] -= previous_score
+            delta[f"score_{previous_score}"] -= 1
+        delta["score_sum"] += new_score
+        delta[f"score_{new_score}"] += 1
+
+    user_deltas = defaultdict(_empty_delta)
+    new_sessions = defaultdict(int)
+    for session_id, delta in session_deltas.items():
+        user_id = session_owner[session_id]
+        created = _upsert(
+            db, SessionScoreSummary, {"session_id": session_id, "user_id": user_id}, delta, now
+        )
+        if created:
+            new_sessions[user_id] += 1
+        for column, value in delta.items():
+            user_deltas[user_id][column] += value
+
+    for user_id, delta in user_deltas.items():
+        delta["session_count"] = new_sessions[user_id]
+        _upsert(db, UserScoreSummary, {"user_id": user_id}, delta, now)
+
+
+def record_score(db: Session, user_id: int, session_id: int, new_score: int, previous_score=None):
+    """Updates the aggregates for a single reviewed answer."""
+    apply_score_deltas(db, [(user_id, session_id, previous_score, new_score)])
+
+
+def summary_to_dict(summary):
+    """Formats an aggregate row for the dashboard response."""
+    if summary is None:
+        return None
+    question_count = summary.question_count or 0
+    return {
+        "question_count": question_count,
+        "score_sum": summary.score_sum,
+        "average_score": round(summary.score_sum / question_count, 2) if question_count else None,
+        "score_histogram": {str(b): getattr(summary, f"score_{b}") for b in SCORE_BUCKETS},
+        "last_activity": summary.last_activity.isoformat() if summary.last_activity else None,
+    }
@@ -4,8 +4,11 @@ from loguru import logger as logging
 from src.utils.jwt import  get_email_from_token
 from fastapi.security import OAuth2PasswordBearer
 from src.routers.qna.models import qna as qna_models
+from . import controller
+from .models import SessionScoreSummary, UserScoreSummary
+from typing import Optional
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from src.routers.users.models import users as users_model
 
 
@@ -68,4 +71,48 @@ async def get_user_qna(
         }
     except Exception as e:
         logging.error(f"Error in get_user_qna: {e}")
-        raise HTTPException(status_code=500, detail="An error occurred while retrieving QnA records.")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="An error occurred while retrieving QnA records.")
+
+
+@router.get("/summary/")
+async def get_summary(
+    session_id: Optional[int] = Query(None),
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+):
+    """
+    Returns the user's score summary, read from the pre-aggregated summary tables.
+    Pass `session_id` to also get the summary of a single interview session.
+    """
+    try:
+        # Decode email from the token
+        email = get_email_from_token(token)
+        user = db.query(users_model.User).filter(users_model.User.email == email).first()
+
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found.")
+
+        user_summary = db.get(UserScoreSummary, user.id)
+
+        session_summary = None
+        if session_id is not None:
+            session_summary = db.get(SessionScoreSummary, session_id)
+            if session_summary is not None and session_summary.user_id != user.id:
+                raise HTTPException(status_code=404, detail="Session not found.")
+
+        summary = controller.summary_to_dict(user_summary)
+        if summary is not None:
+            summary["session_count"] = user_summary.session_count
+
+        return {
+            "success": True,
+            "status": 200,
+            "message": "Summary retrieved successfully.",
+            "summary": summary,
+            "session_summary": controller.summary_to_dict(session_summary),
+        }
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        logging.error(f"Error in get_summary: {e}")
+        raise HTTPException(status_code=500, detail="An error occurred while retrieving the summary.")
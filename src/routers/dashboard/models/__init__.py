@@ -0,0 +1,6 @@
+from .dashboard import SessionScoreSummary,UserScoreSummary
+
+__all__= [
+    "SessionScoreSummary",
+    "UserScoreSummary"
+]
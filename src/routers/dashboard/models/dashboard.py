@@ -0,0 +1,81 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    TIMESTAMP,
+    func,
+)
+from sqlalchemy.ext.declarative import declarative_base
+Base = declarative_base()
+
+
+class SessionScoreSummary(Base):
+    __tablename__ = "session_score_summary"
+
+    session_id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False, index=True)
+    question_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Integer, nullable=False, default=0)
+    score_1 = Column(Integer, nullable=False, default=0)
+    score_2 = Column(Integer, nullable=False, default=0)
+    score_3 = Column(Integer, nullable=False, default=0)
+    score_4 = Column(Integer, nullable=False, default=0)
+    score_5 = Column(Integer, nullable=False, default=0)
+    last_activity = Column(TIMESTAMP, server_default=func.now())
+
+
+class UserScoreSummary(Base):
+    __tablename__ = "user_score_summary"
+
+    user_id = Column(Integer, primary_key=True)
+    session_count = Column(Integer, nullable=False, default=0)
+    question_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Integer, nullable=False, default=0)
+    score_1 = Column(Integer, nullable=False, default=0)
+    score_2 = Column(Integer, nullable=False, default=0)
+    score_3 = Column(Integer, nullable=False, default=0)
+    score_4 = Column(Integer, nullable=False, default=0)
+    score_5 = Column(Integer, nullable=False, default=0)
+    last_activity = Column(TIMESTAMP, server_default=func.now())
+
+
+"""
+CREATE TABLE session_score_summary (
+    session_id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    question_count INTEGER NOT NULL DEFAULT 0,
+    score_sum INTEGER NOT NULL DEFAULT 0,
+    score_1 INTEGER NOT NULL DEFAULT 0,
+    score_2 INTEGER NOT NULL DEFAULT 0,
+    score_3 INTEGER NOT NULL DEFAULT 0,
+    score_4 INTEGER NOT NULL DEFAULT 0,
+    score_5 INTEGER NOT NULL DEFAULT 0,
+    last_activity TIMESTAMP DEFAULT NOW()
+);
+CREATE INDEX ix_session_score_summary_user_id ON session_score_summary (user_id);
+
+CREATE TABLE user_score_summary (
+    user_id INTEGER PRIMARY KEY,
+    session_count INTEGER NOT NULL DEFAULT 0,
+    question_count INTEGER NOT NULL DEFAULT 0,
+    score_sum INTEGER NOT NULL DEFAULT 0,
+    score_1 INTEGER NOT NULL DEFAULT 0,
+    score_2 INTEGER NOT NULL DEFAULT 0,
+    score_3 INTEGER NOT NULL DEFAULT 0,
+    score_4 INTEGER NOT NULL DEFAULT 0,
+    score_5 INTEGER NOT NULL DEFAULT 0,
+    last_activity TIMESTAMP DEFAULT NOW()
+);
+
+-- One-off backfill from existing qna rows
+INSERT INTO session_score_summary
+SELECT session_id, MIN(user_id), COUNT(*), SUM(answer_review),
+       COUNT(*) FILTER (WHERE answer_review = 1), COUNT(*) FILTER (WHERE answer_review = 2),
+       COUNT(*) FILTER (WHERE answer_review = 3), COUNT(*) FILTER (WHERE answer_review = 4),
+       COUNT(*) FILTER (WHERE answer_review = 5), MAX(updated_at)
+FROM qna WHERE answer_review IS NOT NULL GROUP BY session_id;
+
+INSERT INTO user_score_summary
+SELECT user_id, COUNT(*), SUM(question_count), SUM(score_sum), SUM(score_1), SUM(score_2),
+       SUM(score_3), SUM(score_4), SUM(score_5), MAX(last_activity)
+FROM session_score_summary GROUP BY user_id;
+"""
@@ -31,7 +31,7 @@ def create_feedback(
         # Decode user information from the token
         email = get_email_from_token(token)
         user = db.query(users_model.User).filter(users_model.User.email == email).first()
-        logging.error(f"users:{user}")
+        logging.debug(f"users:{user}")
         
         if not user:
             return {
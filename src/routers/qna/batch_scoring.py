@@ -0,0 +1,245 @@
+"""
+Batch re-scoring of stored answers.
+
+Packs many (question, answer) pairs into each LLM request, runs the requests with bounded
+parallelism and writes the scores back with bulk updates. Progress is checkpointed on the
+`scoring_runs` row after every page, so a run can be stopped and resumed at any time. A pack
+that still fails after retries stops the run at the last scored answer; the job is retried
+from there.
+
+    python -m src.routers.qna.batch_scoring --mode fallback           # queue a run on the job worker
+    python -m src.routers.qna.batch_scoring --mode all --inline       # run it in this process
+    python -m src.routers.qna.batch_scoring --resume 12 --inline      # continue run 12
+"""
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import update, or_
+from sqlalchemy.orm import Session
+from loguru import logger as logging
+from src.llm import Priority, complete
+from src.routers.dashboard import controller as dashboard_controller
+from . import models
+from .prescore import prescore
+
+RUBRIC_VERSION = 1
+PACK_SIZE = 25  # answers per LLM request
+PARALLELISM = 8  # concurrent LLM requests
+PAGE_SIZE = 1000  # rows per checkpoint
+SLICE_SECONDS = 240  # a job invocation stops after this long and re-queues itself
+PACK_ATTEMPTS = 3  # LLM requests per pack before the page fails
+RETRY_BASE_SECONDS = 2
+
+SYSTEM_PROMPT = (
+    "You are an expert interviewer grading interview answers. Rate each answer on a scale "
+    "from 1 to 5, where 1 is very poor and 5 is excellent. Consider clarity, relevance to the "
+    "question, and detail. Respond with JSON: {\"scores\": [{\"id\": <id>, \"score\": <1-5>}, ...]} "
+    "with one entry for every answer."
+)
+
+
+class PackFailed(Exception):
+    """Raised when a pack could not be scored within `PACK_ATTEMPTS` attempts."""
+
+
+def _request_scores(pack):
+    """One LLM request for a pack; returns qna id -> score for the rows scored validly."""
+    items = [
+        {"id": row.id, "question": row.question_asked, "answer": row.answer_given}
+        for row in pack
+    ]
+    response = complete(
+        "batch_scoring",
+        priority=Priority.BATCH,
+        messages=[
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": json.dumps(items, ensure_ascii=False)},
+        ],
+        max_tokens=20 + 12 * len(items),
+        temperature=0,
+        response_format={"type": "json_object"},
+    )
+    content = response['choices'][0]['message']['content']
+    expected = {row.id for row in pack}
+    scores = {}
+    for entry in json.loads(content).get("scores", []):
+        qna_id, score = int(entry["id"]), int(entry["score"])
+        if qna_id in expected and 1 <= score <= 5:
+            scores[qna_id] = score
+    return scores
+
+
+def score_pack(pack):
+    """
+    Scores a pack of rows, retrying failed requests and the rows the model left out.
+
+    Args:
+        pack (list): Rows with `id`, `question_asked` and `answer_given`.
+
+    Returns:
+        dict: qna id -> score for every row of the pack.
+
+    Raises:
+        PackFailed: Some rows were still unscored after `PACK_ATTEMPTS` attempts (LLM
+        errors, backpressure or invalid responses).
+    """
+    scores = {}
+    remaining = list(pack)
+    last_error = None
+    for attempt in range(PACK_ATTEMPTS):
+        if attempt:
+            time.sleep(RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+        try:
+            scores.update(_request_scores(remaining))
+        except Exception as e:
+            last_error = e
+            logging.warning(f"Scoring a pack of {len(remaining)} answers failed (attempt {attempt + 1}): {e}")
+        remaining = [row for row in remaining if row.id not in scores]
+        if not remaining:
+            return scores
+    raise PackFailed(f"{len(remaining)} answers left unscored after {PACK_ATTEMPTS} attempts: {last_error or 'missing from the responses'}")
+
+
+def fetch_page(db: Session, run: models.ScoringRun, page_size: int = PAGE_SIZE):
+    """Next page of answered rows after the run's checkpoint, in id order."""
+    query = db.query(
+        models.QnA.id,
+        models.QnA.user_id,
+        models.QnA.session_id,
+        models.QnA.question_asked,
+        models.QnA.answer_given,
+        models.QnA.answer_review,
+    ).filter(models.QnA.id > run.last_qna_id, models.QnA.answer_given.isnot(None))
+    if run.mode == "fallback":
+        query = query.filter(or_(models.QnA.answer_review.is_(None), models.QnA.answer_review == 3))
+    return query.order_by(models.QnA.id).limit(page_size).all()
+
+
+def score_page(rows, executor: ThreadPoolExecutor, pack_size: int = PACK_SIZE):
+    """
+    Scores a page: non-answers locally, the rest in packs on the executor.
+
+    Returns:
+        tuple: (qna id -> score, the first pack error or None). Rows of failed packs are
+        missing from the scores.
+    """
+    scores = {}
+    remaining = []
+    for row in rows:
+        local = prescore(row.answer_given, row.question_asked)
+        if local is not None:
+            scores[row.id] = local[0]
+        else:
+            remaining.append(row)
+    packs = [remaining[index:index + pack_size] for index in range(0, len(remaining), pack_size)]
+    error = None
+    for future in [executor.submit(score_pack, pack) for pack in packs]:
+        try:
+            scores.update(future.result())
+        except PackFailed as e:
+            error = error or e
+    return scores, error
+
+
+def run_batch_scoring(db: Session, run_id: int, pack_size: int = PACK_SIZE, parallelism: int = PARALLELISM, max_seconds: float = None) -> bool:
+    """
+    Continues a scoring run from its checkpoint.
+
+    Args:
+        db (Session): The database session.
+        run_id (int): The `scoring_runs` row to continue.
+        pack_size (int): Answers per LLM request.
+        parallelism (int): Concurrent LLM requests.
+        max_seconds (float): Stop after this long (at a page boundary); None runs to the end.
+
+    Returns:
+        bool: True when the run is complete.
+    """
+    started = time.monotonic()
+    run = db.get(models.ScoringRun, run_id)
+    if run is None or run.status == "done":
+        return True
+
+    with ThreadPoolExecutor(max_workers=parallelism, thread_name_prefix="batch-score") as executor:
+        while max_seconds is None or time.monotonic() - started < max_seconds:
+            rows = fetch_page(db, run)
+            if not rows:
+                run.status = "done"
+                db.commit()
+                logging.info(f"Scoring run {run.id} done: {run.scored} scored, {run.changed} changed, {run.failed} failed.")
+                return True
+
+            scores, error = score_page(rows, executor, pack_size)
+            if error is not None:
+                # Only the rows before the first unscored one are written; the checkpoint never
+                # moves past an answer that was not scored
+                run.failed += 1
+                done = []
+                for row in rows:
+                    if row.id not in scores:
+                        break
+                    done.append(row)
+                rows = done
+
+            if rows:
+                changed_rows = [row for row in rows if scores[row.id] != row.answer_review]
+                if changed_rows:
+                    # ORM bulk UPDATE by primary key (one executemany)
+                    db.execute(
+                        update(models.QnA),
+                        [{"id": row.id, "answer_review": scores[row.id]} for row in changed_rows],
+                    )
+                    dashboard_controller.apply_score_deltas(
+                        db,
+                        [(row.user_id, row.session_id, row.answer_review, scores[row.id]) for row in changed_rows],
+                    )
+
+                # Scores, aggregates and the checkpoint are committed together
+                run.last_qna_id = rows[-1].id
+                run.scored += len(rows)
+                run.changed += len(changed_rows)
+            db.commit()
+            if error is not None:
+                # The job fails and is retried from the checkpoint
+                raise error
+            logging.info(f"Scoring run {run.id}: checkpoint at qna {run.last_qna_id}, {run.scored} scored so far.")
+    return False
+
+
+def create_run(db: Session, mode: str = "fallback", rubric_version: int = RUBRIC_VERSION) -> models.ScoringRun:
+    run = models.ScoringRun(rubric_version=rubric_version, mode=mode, status="running", last_qna_id=0, scored=0, changed=0, failed=0)
+    db.add(run)
+    db.flush()
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["fallback", "all"], default="fallback")
+    parser.add_argument("--rubric-version", type=int, default=RUBRIC_VERSION)
+    parser.add_argument("--resume", type=int, help="Continue an existing run instead of creating one.")
+    parser.add_argument("--inline", action="store_true", help="Run here instead of queueing a job.")
+    parser.add_argument("--pack-size", type=int, default=PACK_SIZE)
+    parser.add_argument("--parallelism", type=int, default=PARALLELISM)
+    args = parser.parse_args()
+
+    from src.utils.db import db_util
+    from src import jobs
+
+    db = db_util.SessionLocal()
+    try:
+        run_id = args.resume or create_run(db, args.mode, args.rubric_version).id
+        if args.inline:
+            db.commit()
+            run_batch_scoring(db, run_id, args.pack_size, args.parallelism)
+        else:
+            jobs.enqueue(db, "batch_score_answers", {"run_id": run_id}, unique_key=f"scoring_run:{run_id}")
+            db.commit()
+            print(f"Queued scoring run {run_id}.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
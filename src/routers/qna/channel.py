@@ -0,0 +1,220 @@
+"""
+Interview over a WebSocket.
+
+The connection authenticates once and keeps the user, session and resume context in memory,
+so a turn doesn't re-read the `users`, `sessions` and `qna` rows. Each turn's writes (answer,
+score, dashboard aggregates, summary and the next question) go out in one transaction using
+a short-lived database session, so an open connection doesn't hold a pooled connection.
+
+Client messages (JSON):
+    {"type": "auth", "token": "..."}                 must be the first message
+    {"type": "start"}
+    {"type": "answer", "answer": "..."}
+    {"type": "end"}
+
+Server messages (JSON):
+    {"type": "ready"}                                after a successful auth
+    {"type": "question", "session_id": 1, "qna_id": 2, "question": "..."}
+    {"type": "score", "qna_id": 2, "score": 4}      sent before the next question is generated
+    {"type": "ended", "session_id": 1, "reason": "..."}
+    {"type": "error", "detail": "..."}
+"""
+from datetime import datetime, timedelta
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from src import jobs
+from src.utils.jwt import get_email_from_token
+from src.routers.users.models import users as users_model
+from src.routers.dashboard import controller as dashboard_controller
+from . import controller, dedupe, models
+from .summary import update_summary
+from .warm_start import warm_start_cache
+
+
+class ChannelError(Exception):
+    """A client error reported on the socket; the connection stays open."""
+
+
+def authenticate(token: str, session_factory):
+    """The user id for a JWT, or None when the token or the user is invalid."""
+    try:
+        email = get_email_from_token(token or "")
+    except Exception:
+        return None
+    db = session_factory()
+    try:
+        row = db.query(users_model.User.id).filter(users_model.User.email == email).first()
+        return row.id if row else None
+    finally:
+        db.close()
+
+
+class InterviewChannel:
+    """State of one interview connection. Its methods block and run in the threadpool."""
+
+    def __init__(self, user_id: int, session_factory):
+        self.user_id = user_id
+        self.session_factory = session_factory
+        self.session_id = None
+        self.job_title = None
+        self.job_description = None
+        self.resume_text = None
+        self.summary = None
+        self.qna_id = None
+        self.question = None
+
+    def start(self) -> dict:
+        """Starts a session and returns the first question."""
+        if self.session_id is not None:
+            raise ChannelError("An interview session is already active.")
+        db = self.session_factory()
+        try:
+            if db.query(models.Session.id).filter_by(user_id=self.user_id, is_active=True).first():
+                raise ChannelError("An interview session is already active.")
+            resume_upload = (
+                db.query(models.ResumeUpload)
+                .filter(models.ResumeUpload.user_id == self.user_id)
+                .order_by(models.ResumeUpload.id.desc())
+                .first()
+            )
+            if not resume_upload:
+                raise ChannelError("No resume uploaded.")
+
+            warm = warm_start_cache.take(resume_upload.id)
+            self.resume_text = warm[0] if warm else controller.extract_resume_text(resume_upload)
+            self.job_title = resume_upload.job_title
+            self.job_description = resume_upload.job_description
+
+            new_session = models.Session(user_id=self.user_id, is_active=True, start_time=datetime.utcnow())
+            db.add(new_session)
+            try:
+                db.flush()
+            except IntegrityError:
+                # A concurrent start created the active session first (ux_sessions_one_active)
+                raise ChannelError("An interview session is already active.")
+            jobs.enqueue(
+                db,
+                "enforce_session_timeout",
+                {"session_id": new_session.id},
+                run_at=new_session.start_time + timedelta(minutes=controller.SESSION_TIMEOUT_MINUTES),
+            )
+            if warm:
+                question = f"Question 1: {warm[1]}"
+            else:
+                question = controller.generate_question(
+                    self.job_title, self.job_description, self.resume_text, new_session.id, db
+                )
+            qna_id = self._insert_question(db, question, new_session.id)
+            db.commit()
+            self.session_id, self.summary, self.qna_id, self.question = new_session.id, None, qna_id, question
+            return self._question_message()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def score(self, answer: str) -> dict:
+        """Scores the answer to the current question (the LLM part of a turn, no writes)."""
+        if self.session_id is None:
+            raise ChannelError("No active interview session found.")
+        if not (answer or "").strip():
+            raise ChannelError("The answer is empty.")
+        score = controller.analyze_answer(answer, self.question)
+        generated_answer = controller.generate_answer(self.question) if score < 3 else None
+        return {"score": score, "generated_answer": generated_answer}
+
+    def next_question(self, answer: str, score: int, generated_answer: str = None):
+        """
+        Stores the answered turn and the next question in one transaction.
+
+        Returns:
+            dict: The question message, or the "ended" message when the session has ended.
+        """
+        db = self.session_factory()
+        try:
+            summary = update_summary(self.summary, self.question, answer, score)
+            # Generate first, so the turn's row locks aren't held during the LLM call
+            question = controller.generate_question(
+                job_title=self.job_title,
+                job_description=self.job_description,
+                resume_text=self.resume_text,
+                session_id=self.session_id,
+                db=db,
+                previous_answer=answer,
+                follow_up=controller.needs_follow_up(score),
+                summary=summary,
+            )
+
+            # The timeout job may have ended the session since the last turn
+            still_active = db.execute(
+                update(models.Session)
+                .where(models.Session.id == self.session_id, models.Session.is_active == True)
+                .values(summary=summary)
+                .returning(models.Session.id)
+            ).first()
+            # The question may already have been answered over POST /qna/submit-answer/: lock the
+            # row and replace its score in the dashboard totals instead of counting it twice
+            previous_score = db.execute(
+                select(models.QnA.answer_review).where(models.QnA.id == self.qna_id).with_for_update()
+            ).scalar_one_or_none()
+            db.execute(
+                update(models.QnA)
+                .where(models.QnA.id == self.qna_id)
+                .values(answer_given=answer, answer_review=score, generated_answer=generated_answer)
+            )
+            dashboard_controller.record_score(db, self.user_id, self.session_id, score, previous_score)
+            if not still_active:
+                db.commit()
+                return self._ended("The interview session has timed out.")
+            if not question:
+                db.execute(
+                    update(models.Session)
+                    .where(models.Session.id == self.session_id)
+                    .values(is_active=False, end_time=datetime.utcnow())
+                )
+                db.commit()
+                return self._ended("Interview ended as no new questions were generated.")
+            qna_id = self._insert_question(db, question)
+            db.commit()
+            self.summary, self.qna_id, self.question = summary, qna_id, question
+            return self._question_message()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def end(self, reason: str = "Interview session has been ended.") -> dict:
+        """Ends the session. A dropped connection leaves it to the session timeout instead."""
+        if self.session_id is None:
+            raise ChannelError("No active interview session found.")
+        db = self.session_factory()
+        try:
+            db.execute(
+                update(models.Session)
+                .where(models.Session.id == self.session_id, models.Session.is_active == True)
+                .values(is_active=False, end_time=datetime.utcnow())
+            )
+            db.commit()
+        finally:
+            db.close()
+        return self._ended(reason)
+
+    def _insert_question(self, db: Session, question: str, session_id: int = None) -> int:
+        return db.execute(
+            insert(models.QnA)
+            .values(user_id=self.user_id, session_id=session_id or self.session_id, question_asked=question)
+            .returning(models.QnA.id)
+        ).scalar()
+
+    def _question_message(self) -> dict:
+        return {"type": "question", "session_id": self.session_id, "qna_id": self.qna_id, "question": self.question}
+
+    def _ended(self, reason: str) -> dict:
+        session_id = self.session_id
+        controller.discard_question_buffer(session_id)
+        dedupe.discard_session_index(session_id)
+        self.session_id = self.qna_id = self.question = None
+        return {"type": "ended", "session_id": session_id, "reason": reason}
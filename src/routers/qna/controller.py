@@ -3,13 +3,26 @@ from PyPDF2 import PdfReader
 from docx import Document
 import openai
 import os
+import jwt
 from loguru import logger as logging
 from sqlalchemy.orm import Session
+from sqlalchemy import func, insert
+from pydantic import TypeAdapter, ValidationError
+from typing import List
 from datetime import datetime, timedelta
 from . import models
-
-import smtplib  # For sending emails
-from email.mime.text import MIMEText
+from . import schemas
+from .prescore import prescore
+from .question_bank import question_bank
+from . import dedupe
+import time
+import json
+from collections import deque, OrderedDict
+from bisect import bisect_right
+from sqlalchemy.dialects.postgresql import Range
+from threading import Lock
+from src.mailer import get_template
+from src.llm import Priority, LLMQueueFull, LLMQueueTimeout, CircuitOpen, complete
 
 
 # Set up OpenAI API key
@@ -24,32 +37,29 @@ def extract_text_from_docx(file_path):
     doc = Document(file_path)
     return "\n".join(paragraph.text for paragraph in doc.paragraphs)
 
+def extract_resume_text(resume_upload):
+    if resume_upload.file_format == "pdf":
+        return extract_text_from_pdf(resume_upload.file_path)
+    return extract_text_from_docx(resume_upload.file_path)
+
 
-def generate_question(job_title, job_description, resume_text, session_id, db: Session, previous_answer=None):
+def build_question_messages(job_title, job_description, resume_text, question_count, previous_answer=None, candidates=1, summary=None):
     """
-    Generate an interview question in a conversational and human-like manner.
+    Builds the chat messages for question generation.
 
     Args:
         job_title (str): The job title from the resume.
         job_description (str): The job description from the resume.
         resume_text (str): The extracted text from the resume.
-        session_id (int): The ID of the current session.
-        db (Session): The database session to fetch existing questions.
+        question_count (int): The number of the question being generated.
         previous_answer (str): The answer to the previous question (optional).
+        candidates (int): How many questions to ask for. With more than one, the model
+            returns a JSON list whose first entry is the follow-up (if any).
+        summary (str): The rolling summary of the interview so far (optional).
 
     Returns:
-        str: A generated interview question.
+        list: The messages for the OpenAI chat model.
     """
-    # Fetch the number of questions already asked in the current session
-    existing_questions_count = (
-        db.query(models.QnA)
-        .filter(models.QnA.session_id == session_id)
-        .count()
-    )
-
-    # Determine the current question number
-    question_count = existing_questions_count + 1
-
     # Define the style and focus of the question
     if question_count == 1:
         prompt = f"Start with a friendly question to break the ice, based on their job title: {job_title}."
@@ -58,8 +68,18 @@ def generate_question(job_title, job_description, resume_text, session_id, db: S
     else:
         prompt = "Focus on their skills, accomplishments, or notable projects mentioned in their resume."
 
+    if candidates > 1:
+        prompt += (
+            f"\n            Return a JSON object {{\"questions\": [...]}} with {candidates} different questions."
+            " If a previous answer is given, the first one follows up on it; the others must stand on their own,"
+            " each about a different skill or project, so they can be asked later in any order."
+        )
+
+    # The whole interview so far, as a fixed-size summary rather than the full transcript
+    history = f"- Interview so far (don't repeat these topics unless following up):\n{summary}" if summary else ""
+
     # Prepare messages for the OpenAI chat model
-    messages = [
+    return [
         {"role": "system", "content": "You are an expert interviewer conducting a friendly and engaging interview."},
         {
             "role": "user",
@@ -67,37 +87,209 @@ def generate_question(job_title, job_description, resume_text, session_id, db: S
             Generate a concise and conversational interview question:
             - Context: Resume details, job title ({job_title}), and job description ({job_description}).
             - Resume Content: {resume_text}
+            {history}
             {f"- Follow up based on the previous answer: {previous_answer}" if previous_answer else ""}
             {prompt}
             """
         },
     ]
-    # Call OpenAI Chat API
-    response = openai.ChatCompletion.create(
-        model="gpt-3.5-turbo",  # The same model as in the original code
+
+
+def parse_question_candidates(content: str):
+    """Reads the JSON list of questions; falls back to the raw text as a single question."""
+    try:
+        questions = [str(question).strip() for question in json.loads(content)["questions"]]
+        questions = [question for question in questions if question]
+        if questions:
+            return questions
+    except (ValueError, KeyError, TypeError):
+        pass
+    return [content.strip()]
+
+
+# Per-session buffer of questions generated ahead of time (least recently used sessions are evicted)
+question_buffers = OrderedDict()
+question_buffers_lock = Lock()
+
+
+def take_buffered_question(session_id: int):
+    """Pops the next pre-generated question of the session, or returns None."""
+    with question_buffers_lock:
+        buffer = question_buffers.get(session_id)
+        if buffer:
+            return buffer.popleft()
+    return None
+
+
+def buffer_questions(session_id: int, questions):
+    """Adds pre-generated questions to the session's buffer (oldest are dropped past the cap)."""
+    with question_buffers_lock:
+        buffer = question_buffers.setdefault(session_id, deque(maxlen=QUESTION_BUFFER_SIZE))
+        buffer.extend(questions)
+        question_buffers.move_to_end(session_id)
+        while len(question_buffers) > MAX_BUFFERED_SESSIONS:
+            question_buffers.popitem(last=False)
+
+
+def discard_question_buffer(session_id: int):
+    """Drops the session's buffered questions (e.g. when the session ends)."""
+    with question_buffers_lock:
+        question_buffers.pop(session_id, None)
+
+
+def needs_follow_up(score: int) -> bool:
+    """
+    Whether the next question should follow up on this answer. Weak answers get a targeted
+    follow-up; otherwise the interview moves on with a buffered question.
+    """
+    return score <= FOLLOW_UP_MAX_SCORE
+
+
+def generate_question(job_title, job_description, resume_text, session_id, db: Session, previous_answer=None, follow_up=True, summary=None):
+    """
+    Generate an interview question in a conversational and human-like manner.
+
+    The opening questions come from the precomputed question bank when it covers the job.
+    From the third question on, one LLM call returns several questions: the first is used
+    now and the rest are buffered for the session. Turns that don't need a follow-up on the
+    previous answer are served from the buffer without an LLM call.
+
+    Args:
+        job_title (str): The job title from the resume.
+        job_description (str): The job description from the resume.
+        resume_text (str): The extracted text from the resume.
+        session_id (int): The ID of the current session.
+        db (Session): The database session to fetch existing questions.
+        previous_answer (str): The answer to the previous question (optional).
+        follow_up (bool): Whether the question should follow up on `previous_answer`.
+        summary (str): The session's rolling summary, giving the model the whole interview
+            at a fixed prompt size (optional).
+
+    Returns:
+        str: A generated interview question.
+    """
+    # Fetch the questions already asked in the current session
+    asked = [
+        question for (question,) in
+        db.query(models.QnA.question_asked).filter(models.QnA.session_id == session_id).all()
+    ]
+
+    # Determine the current question number
+    question_count = len(asked) + 1
+
+    if question_count == 1 or (question_count == 2 and not follow_up):
+        for _ in range(BANK_DRAWS):
+            banked = question_bank.lookup(db, job_title, job_description, question_count)
+            if not banked:
+                break
+            if not dedupe.is_duplicate(session_id, banked, asked, source="bank"):
+                logging.info(f"Question served from the question bank: {banked}")
+                return _ask(session_id, question_count, banked, asked)
+
+    if question_count > 2 and not follow_up:
+        buffered = _take_unique_buffered_question(session_id, asked)
+        if buffered:
+            logging.info(f"Question served from the session buffer: {buffered}")
+            return _ask(session_id, question_count, buffered, asked)
+
+    candidates = QUESTION_CANDIDATES if question_count > 2 else 1
+    messages = build_question_messages(
+        job_title,
+        job_description,
+        resume_text,
+        question_count,
+        previous_answer=previous_answer if follow_up else None,
+        candidates=candidates,
+        summary=summary,
+    )
+    extra = {"response_format": {"type": "json_object"}} if candidates > 1 else {}
+
+    # Call OpenAI Chat API (a candidate is waiting on this one)
+    response = complete(
+        "question",
+        priority=Priority.INTERACTIVE,
         messages=messages,
-        max_tokens=80,  # Limit to 80 tokens to ensure concise output
+        max_tokens=80 * candidates,  # Limit to 80 tokens per question to ensure concise output
         temperature=0.8,  # Allow creativity while staying relevant
         frequency_penalty=0.2,
         presence_penalty=0.3,
+        **extra,
     )
 
-    # Extract and format the generated question
-    question = response['choices'][0]['message']['content'].strip()
+    # Extract and format the generated question, skipping repeats of earlier questions
+    content = response['choices'][0]['message']['content'].strip()
+    questions = parse_question_candidates(content) if candidates > 1 else [content]
+    unique = [question for question in questions if not dedupe.is_duplicate(session_id, question, asked)]
+    if unique:
+        question = unique[0]
+    else:
+        question = _take_unique_buffered_question(session_id, asked)
+        if question is None:
+            # Nothing else to ask without another LLM call
+            dedupe.record_accepted_duplicate()
+            question = questions[0]
+    formatted = _ask(session_id, question_count, question, asked)
+    if len(unique) > 1:
+        buffer_questions(session_id, dedupe.distinct(unique)[1:])
     logging.info(f"Generated question: {question}")
+    return formatted
+
+
+def prepare_first_question(job_title, job_description, resume_text, db: Session, priority=Priority.BACKGROUND) -> str:
+    """
+    The first question of an interview, prepared before the session exists (see warm_start.py):
+    from the question bank when it covers the job, otherwise from the LLM.
+
+    Returns:
+        str: The question, without the "Question 1:" prefix.
+    """
+    banked = question_bank.lookup(db, job_title, job_description, 1)
+    if banked:
+        return banked
+    response = complete(
+        "question",
+        priority=priority,
+        messages=build_question_messages(job_title, job_description, resume_text, 1),
+        max_tokens=80,
+        temperature=0.8,
+        frequency_penalty=0.2,
+        presence_penalty=0.3,
+    )
+    return response['choices'][0]['message']['content'].strip()
+
+
+def _ask(session_id: int, question_count: int, question: str, asked) -> str:
+    """Records the chosen question in the session's similarity index and formats it."""
+    dedupe.record_question(session_id, question, asked)
     return f"Question {question_count}: {question}"
 
 
-def analyze_answer(user_answer: str) -> int:
+def _take_unique_buffered_question(session_id: int, asked):
+    """Pops buffered questions until one isn't a near-duplicate of an earlier question."""
+    while True:
+        buffered = take_buffered_question(session_id)
+        if buffered is None or not dedupe.is_duplicate(session_id, buffered, asked, source="buffer"):
+            return buffered
+
+
+def analyze_answer(user_answer: str, question: str = None) -> int:
     """
-    Analyzes the user's answer using OpenAI API and assigns a score between 1 and 5.
+    Analyzes the user's answer and assigns a score between 1 and 5. Non-answers (empty,
+    "I don't know", a copy of the question) are scored locally; the rest by the OpenAI API.
     
     Args:
         user_answer (str): The answer provided by the user.
+        question (str): The question that was asked (optional, used to spot copied questions).
         
     Returns:
         int: A score between 1 (poor) and 5 (excellent).
     """
+    local = prescore(user_answer, question)
+    if local is not None:
+        score, reason = local
+        logging.info(f"Answer scored locally ({reason}): {score}")
+        return score
+
     try:
         # Define the prompt to analyze the user's answer
         prompt = (
@@ -108,9 +300,10 @@ def analyze_answer(user_answer: str) -> int:
             "Score (1-5):"
         )
 
-        # Call the OpenAI API using the "gpt-4-mini" model
-        response = openai.ChatCompletion.create(
-            model="gpt-4o-mini-2024-07-18",  # Changed to gpt-4-mini
+        # Call the OpenAI API (the "scoring" route picks the model)
+        response = complete(
+            "scoring",
+            priority=Priority.INTERACTIVE,
             messages=[ 
                 {"role": "system", "content": "You are a helpful assistant."},
                 {"role": "user", "content": prompt}
@@ -119,7 +312,7 @@ def analyze_answer(user_answer: str) -> int:
             temperature=0.3,
         )
 
-        logging.error(f"response: {response}")
+        logging.debug(f"response in analyze_answer: {response}")
         # Extract the score from the response
         score = int(response['choices'][0]['message']['content'].strip())
         
@@ -128,6 +321,9 @@ def analyze_answer(user_answer: str) -> int:
             return score
         else:
             raise ValueError(f"Invalid score received from OpenAI: {score}")
+    except (LLMQueueFull, LLMQueueTimeout, CircuitOpen):
+        # Backpressure is not a failed answer: the caller returns 503 and the candidate retries
+        raise
     except Exception as e:
         # Handle exceptions and fallback to a default score
         logging.error(f"Error in analyze_answer: {e}")
@@ -153,8 +349,9 @@ def generate_answer(question: str) -> str:
         )
 
         # Call the OpenAI API using the correct endpoint for chat-based models
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",  # Or "gpt-4" if available
+        response = complete(
+            "answer",
+            priority=Priority.BACKGROUND,
             messages=[
                 {"role": "system", "content": "You are a helpful assistant."},
                 {"role": "user", "content": prompt}
@@ -163,12 +360,15 @@ def generate_answer(question: str) -> str:
             temperature=0.5,
         )
 
-        logging.error(f"response in generate_answer: {response}")
+        logging.debug(f"response in generate_answer: {response}")
         # Extract the answer from the response
         generated_answer = response['choices'][0]['message']['content'].strip()
 
         # Return the generated answer
         return generated_answer
+    except (LLMQueueFull, LLMQueueTimeout, CircuitOpen):
+        # Backpressure is not a failed answer: the caller returns 503 and the candidate retries
+        raise
     except Exception as e:
         # Handle exceptions and fallback to a default answer
         logging.error(f"Error in generate_answer: {e}")
@@ -177,6 +377,15 @@ def generate_answer(question: str) -> str:
 
 # Settings
 SESSION_TIMEOUT_MINUTES = 30
+FRONTEND_URL = "http://ec2-3-219-12-193.compute-1.amazonaws.com:5173"
+MAX_BULK_INTERVIEWS = 1000
+QUESTION_CANDIDATES = 4  # questions requested per LLM call from the third question on
+QUESTION_BUFFER_SIZE = 8
+MAX_BUFFERED_SESSIONS = 5000
+FOLLOW_UP_MAX_SCORE = 2  # answers scored at or below this get a follow-up question
+BANK_DRAWS = 3  # random bank picks tried before falling back to the LLM on repeats
+
+bulk_interviews_adapter = TypeAdapter(List[schemas.InterviewCreate])
 
 
 # Function to handle session timeouts
@@ -198,24 +407,263 @@ def enforce_session_timeout(session_id: int, db: Session):
     except Exception as e:
         logging.error(f"Error in enforce_session_timeout: {e}")
 
-# Utility function to send email
-def send_email(to_email: str, subject: str, message: str):
+# Metrics for the periodic interview completion job
+completion_job_metrics = {
+    "runs": 0,
+    "failures": 0,
+    "rows_affected_total": 0,
+    "last_rows_affected": 0,
+    "last_duration_ms": 0.0,
+    "last_run_at": None,
+}
+completion_job_metrics_lock = Lock()
+
+
+def complete_past_interviews(db: Session) -> int:
+    """
+    Marks every overdue scheduled interview as completed with a single set-based UPDATE.
+
+    Args:
+        db (Session): A database session owned by the caller (not a request session).
+
+    Returns:
+        int: The number of interviews marked as completed.
+    """
+    started = time.perf_counter()
     try:
-        sender_email = os.environ['EMAIL'] # Replace with your email
-        sender_password = os.environ['APP_PASSWORD']       # Replace with your email password
-
-        # Create the email
-        msg = MIMEText(message)
-        msg['Subject'] = subject
-        msg['From'] = sender_email
-        msg['To'] = to_email
-
-        # Connect to the server and send the email
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:  # Adjust for your email provider
-            server.login(sender_email, sender_password)
-            server.sendmail(sender_email, to_email, msg.as_string())
-    except Exception as e:
-        print(f"Failed to send email: {e}")
+        rows_affected = (
+            db.query(models.ScheduleInterview)
+            .filter(
+                models.ScheduleInterview.is_completed == False,
+                models.ScheduleInterview.interview_date <= func.now(),
+            )
+            .update({models.ScheduleInterview.is_completed: True}, synchronize_session=False)
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        with completion_job_metrics_lock:
+            completion_job_metrics["failures"] += 1
+        raise
+
+    duration_ms = (time.perf_counter() - started) * 1000
+    with completion_job_metrics_lock:
+        completion_job_metrics["runs"] += 1
+        completion_job_metrics["rows_affected_total"] += rows_affected
+        completion_job_metrics["last_rows_affected"] = rows_affected
+        completion_job_metrics["last_duration_ms"] = round(duration_ms, 2)
+        completion_job_metrics["last_run_at"] = datetime.utcnow().isoformat()
+    logging.info(f"Marked {rows_affected} past interviews as completed in {duration_ms:.1f} ms.")
+    return rows_affected
+
+
+def interview_slot(interview_date, interview_time, duration_minutes: int = 60):
+    """Returns the half-open [start, end) datetimes of an interview."""
+    start = datetime.combine(interview_date, interview_time)
+    return start, start + timedelta(minutes=duration_minutes)
+
+
+def slot_range(start: datetime, end: datetime) -> Range:
+    """Builds the TSRANGE value stored in `ScheduleInterview.slot`."""
+    return Range(start, end, bounds="[)")
+
+
+def find_conflicting_interview(db: Session, user_id: int, start: datetime, end: datetime):
+    """
+    Returns an open interview of the interviewer overlapping [start, end), or None.
+    Served by the GiST index of the `interviews_scheduler_no_overlap` constraint.
+    """
+    return (
+        db.query(models.ScheduleInterview)
+        .filter(
+            models.ScheduleInterview.user_id == user_id,
+            models.ScheduleInterview.is_completed == False,
+            models.ScheduleInterview.slot.op("&&")(slot_range(start, end)),
+        )
+        .first()
+    )
+
+
+class BusySlots:
+    """
+    Sorted, non-overlapping busy intervals of one interviewer.
+
+    The exclusion constraint guarantees open interviews of an interviewer never overlap,
+    so sorting by start also sorts by end and a single bisect answers an overlap query.
+    """
+
+    def __init__(self, intervals=()):
+        self.starts = []
+        self.ends = []
+        self.ids = []
+        for start, end, interview_id in sorted(intervals):
+            self.starts.append(start)
+            self.ends.append(end)
+            self.ids.append(interview_id)
+
+    def conflict(self, start: datetime, end: datetime):
+        """Returns the id of the busy interval overlapping [start, end), or None (O(log n))."""
+        index = bisect_right(self.ends, start)
+        if index < len(self.starts) and self.starts[index] < end:
+            return self.ids[index]
+        return None
+
+    def add(self, start: datetime, end: datetime, interview_id=None):
+        """Marks [start, end) as busy. The caller must have checked `conflict` first."""
+        index = bisect_right(self.starts, start)
+        self.starts.insert(index, start)
+        self.ends.insert(index, end)
+        self.ids.insert(index, interview_id)
+
+
+def get_busy_slots(db: Session, user_id: int, window_start: datetime, window_end: datetime) -> BusySlots:
+    """Loads the interviewer's open interviews overlapping the window with one indexed query."""
+    rows = (
+        db.query(
+            func.lower(models.ScheduleInterview.slot),
+            func.upper(models.ScheduleInterview.slot),
+            models.ScheduleInterview.id,
+        )
+        .filter(
+            models.ScheduleInterview.user_id == user_id,
+            models.ScheduleInterview.is_completed == False,
+            models.ScheduleInterview.slot.op("&&")(slot_range(window_start, window_end)),
+        )
+        .all()
+    )
+    return BusySlots(rows)
+
+
+def check_availability(db: Session, user_id: int, slots):
+    """
+    Checks many candidate slots of one interviewer against the schedule in a single query.
+
+    Args:
+        db (Session): The database session.
+        user_id (int): The interviewer.
+        slots (list): (start, end) tuples.
+
+    Returns:
+        list: The id of the conflicting interview for each slot, or None when it is free.
+    """
+    if not slots:
+        return []
+    busy = get_busy_slots(
+        db, user_id, min(start for start, _ in slots), max(end for _, end in slots)
+    )
+    return [busy.conflict(start, end) for start, end in slots]
+
+
+def parse_bulk_interviews(rows):
+    """
+    Validates all bulk-scheduling rows in one pass.
+
+    Args:
+        rows (list): Raw dicts from the CSV or JSON payload.
+
+    Returns:
+        tuple: (valid, rejected) where `valid` is a list of (row_number, InterviewCreate)
+        and `rejected` a list of {"row", "reason"} dicts.
+    """
+    errors = {}
+    try:
+        interviews = bulk_interviews_adapter.validate_python(rows)
+        return list(enumerate(interviews, start=1)), []
+    except ValidationError as e:
+        for error in e.errors():
+            row_number = error["loc"][0] + 1
+            errors.setdefault(row_number, f"{'.'.join(map(str, error['loc'][1:]))}: {error['msg']}")
+
+    # Only re-validate the rows that passed, in one more batch call
+    valid_rows = [(number, row) for number, row in enumerate(rows, start=1) if number not in errors]
+    interviews = bulk_interviews_adapter.validate_python([row for _, row in valid_rows])
+    valid = [(number, interview) for (number, _), interview in zip(valid_rows, interviews)]
+    rejected = [{"row": number, "reason": reason} for number, reason in sorted(errors.items())]
+    return valid, rejected
+
+
+def schedule_interviews_bulk(db: Session, user_id: int, interviews):
+    """
+    Schedules many interviews for one interviewer.
+
+    Conflicts (with the existing schedule and inside the batch) are checked in one pass
+    over the busy intervals, and the accepted rows are written with one multi-row INSERT.
+
+    Args:
+        db (Session): The database session.
+        user_id (int): The interviewer.
+        interviews (list): (row_number, InterviewCreate) tuples.
+
+    Returns:
+        tuple: (created, rejected) where `created` is a list of (row_number, InterviewCreate, id).
+    """
+    if not interviews:
+        return [], []
+
+    slots = [
+        interview_slot(interview.interview_date, interview.interview_time, interview.duration_minutes)
+        for _, interview in interviews
+    ]
+    busy = get_busy_slots(db, user_id, min(start for start, _ in slots), max(end for _, end in slots))
+
+    accepted, rejected = [], []
+    for (row_number, interview), (start, end) in zip(interviews, slots):
+        conflict = busy.conflict(start, end)
+        if conflict is not None:
+            rejected.append({"row": row_number, "reason": f"Conflicts with interview {conflict}."})
+            continue
+        busy.add(start, end)
+        accepted.append((row_number, interview, start, end))
+
+    if not accepted:
+        return [], rejected
+
+    values = [
+        {
+            "user_id": user_id,
+            "candidate_name": interview.candidate_name,
+            "candidate_email": interview.candidate_email,
+            "interview_date": interview.interview_date,
+            "interview_time": interview.interview_time,
+            "duration_minutes": interview.duration_minutes,
+            "slot": slot_range(start, end),
+            "is_completed": False,
+        }
+        for _, interview, start, end in accepted
+    ]
+    # Accepted slots are disjoint, so the slot start identifies each inserted row.
+    # The caller commits, together with the confirmation emails.
+    inserted = db.execute(
+        insert(models.ScheduleInterview)
+        .values(values)
+        .returning(models.ScheduleInterview.id, func.lower(models.ScheduleInterview.slot))
+    ).all()
+
+    ids_by_start = {start: interview_id for interview_id, start in inserted}
+    created = [(row_number, interview, ids_by_start[start]) for row_number, interview, start, _ in accepted]
+    return created, rejected
+
+
+def confirmation_link(interview_id: int) -> str:
+    """Builds the tokenized link a candidate uses to confirm the interview."""
+    return f"{FRONTEND_URL}/confirm-interview/{interview_id}?token={generate_token(interview_id)}"
+
+
+def interview_email_fields(candidate_name, interview_date, interview_time, confirmation_link) -> dict:
+    """The per-recipient fields of the "interview_scheduled" email template."""
+    return {
+        "candidate_name": candidate_name,
+        "interview_date": interview_date.strftime('%d-%m-%Y'),
+        "interview_time": interview_time.strftime('%H:%M'),
+        "confirmation_link": confirmation_link,
+    }
+
+
+def build_interview_email(candidate_name, interview_date, interview_time, confirmation_link):
+    """Renders the HTML body of the "Interview Scheduled" email."""
+    return get_template("interview_scheduled").render(
+        **interview_email_fields(candidate_name, interview_date, interview_time, confirmation_link)
+    )
 
 
 def generate_token(interview_id: int):
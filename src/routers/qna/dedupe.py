@@ -0,0 +1,142 @@
+"""
+Near-duplicate question detection within an interview session.
+
+Every question asked in a session is reduced to a MinHash signature over its word unigrams
+and bigrams. A candidate question is a near-duplicate when its estimated Jaccard similarity
+to any earlier question reaches `DUPLICATE_THRESHOLD`; the check is one vectorized comparison
+against the session's signature matrix.
+"""
+import re
+import zlib
+from collections import Counter, OrderedDict
+from threading import Lock
+import numpy as np
+from .prescore import tokenize
+
+NUM_PERMUTATIONS = 64
+DUPLICATE_THRESHOLD = 0.5  # estimated Jaccard similarity of the shingle sets
+MAX_INDEXED_SESSIONS = 5000
+QUESTION_PREFIX = re.compile(r"^\s*question\s+\d+\s*:\s*", re.I)
+SUFFIX = re.compile(r"(ing|ed|est|er|ly|es|s)$")
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20240718)
+_A = _rng.integers(1, _PRIME, NUM_PERMUTATIONS, dtype=np.uint64)
+_B = _rng.integers(0, _PRIME, NUM_PERMUTATIONS, dtype=np.uint64)
+
+dedupe_metrics = {"checked": 0, "rejected": 0, "accepted_duplicates": 0, "rejected_by_source": Counter()}
+dedupe_metrics_lock = Lock()
+
+
+def shingles(question: str):
+    """Stopword-free unigrams and bigrams of the question, without the "Question N:" prefix."""
+    # Crude suffix stripping, so "proudest"/"proud" and "projects"/"project" match
+    tokens = [SUFFIX.sub("", token) if len(token) > 4 else token for token in tokenize(QUESTION_PREFIX.sub("", question or ""))]
+    return set(tokens) | {f"{first} {second}" for first, second in zip(tokens, tokens[1:])}
+
+
+def signature(question: str):
+    """MinHash signature of the question's shingles, or None when it has no content words."""
+    items = shingles(question)
+    if not items:
+        return None
+    hashes = np.fromiter((zlib.crc32(item.encode()) for item in items), dtype=np.uint64, count=len(items))
+    return ((np.outer(hashes, _A) + _B) % _PRIME).min(axis=0)
+
+
+class SessionQuestionIndex:
+    """Signatures of the questions asked in one session."""
+
+    def __init__(self):
+        self.signatures = np.empty((0, NUM_PERMUTATIONS), dtype=np.uint64)
+        self.size = 0  # questions added, including those without a signature
+
+    def similarity(self, candidate_signature) -> float:
+        """Highest estimated Jaccard similarity between the candidate and an indexed question."""
+        if candidate_signature is None or not len(self.signatures):
+            return 0.0
+        return float((self.signatures == candidate_signature).mean(axis=1).max())
+
+    def add(self, candidate_signature):
+        self.size += 1
+        if candidate_signature is not None:
+            self.signatures = np.vstack([self.signatures, candidate_signature])
+
+
+# Least recently used sessions are evicted; an evicted session is rebuilt from its stored questions
+session_indexes = OrderedDict()
+session_indexes_lock = Lock()
+
+
+def _index(session_id: int, asked):
+    index = session_indexes.get(session_id)
+    if index is None or index.size < len(asked):
+        index = SessionQuestionIndex()
+        for question in asked:
+            index.add(signature(question))
+        session_indexes[session_id] = index
+    session_indexes.move_to_end(session_id)
+    while len(session_indexes) > MAX_INDEXED_SESSIONS:
+        session_indexes.popitem(last=False)
+    return index
+
+
+def is_duplicate(session_id: int, question: str, asked=(), source: str = "llm") -> bool:
+    """
+    Checks a candidate question against the questions already asked in the session.
+
+    Args:
+        session_id (int): The ID of the session.
+        question (str): The candidate question.
+        asked (list): The questions stored for the session, used to rebuild its index if needed.
+        source (str): Where the candidate came from, for the metrics (bank, buffer, llm).
+
+    Returns:
+        bool: True when the candidate is a near-duplicate of an earlier question.
+    """
+    candidate_signature = signature(question)
+    with session_indexes_lock:
+        duplicate = _index(session_id, asked).similarity(candidate_signature) >= DUPLICATE_THRESHOLD
+    with dedupe_metrics_lock:
+        dedupe_metrics["checked"] += 1
+        if duplicate:
+            dedupe_metrics["rejected"] += 1
+            dedupe_metrics["rejected_by_source"][source] += 1
+    return duplicate
+
+
+def record_question(session_id: int, question: str, asked=()):
+    """Adds the question chosen for the session to its index."""
+    candidate_signature = signature(question)
+    with session_indexes_lock:
+        _index(session_id, asked).add(candidate_signature)
+
+
+def distinct(questions):
+    """The questions that aren't near-duplicates of an earlier one in the list, in order."""
+    index, kept = SessionQuestionIndex(), []
+    for question in questions:
+        candidate_signature = signature(question)
+        if index.similarity(candidate_signature) < DUPLICATE_THRESHOLD:
+            index.add(candidate_signature)
+            kept.append(question)
+    return kept
+
+
+def record_accepted_duplicate():
+    """Counts a duplicate that was asked anyway because no replacement was available."""
+    with dedupe_metrics_lock:
+        dedupe_metrics["accepted_duplicates"] += 1
+
+
+def discard_session_index(session_id: int):
+    with session_indexes_lock:
+        session_indexes.pop(session_id, None)
+
+
+def get_dedupe_metrics() -> dict:
+    with dedupe_metrics_lock:
+        metrics = dict(dedupe_metrics)
+        metrics["rejected_by_source"] = dict(dedupe_metrics["rejected_by_source"])
+    metrics["dedupe_rate"] = round(metrics["rejected"] / metrics["checked"], 4) if metrics["checked"] else 0.0
+    return metrics
@@ -0,0 +1,204 @@
+"""
+Idempotency keys for the interview endpoints.
+
+A client sends an `Idempotency-Key` header and reuses it when it retries. The first request
+claims the key (a committed `in_progress` row) and stores its response in the same
+transaction as its own writes. A retry then gets the stored response, without scoring or
+generating anything again. A retry that arrives while the first request is still running
+waits for it. Keys are per user and expire after `KEY_TTL_HOURS`.
+"""
+import json
+import time
+import hashlib
+from collections import Counter
+from datetime import datetime, timedelta
+from threading import Lock
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import select, update, delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from loguru import logger as logging
+from . import models
+
+WAIT_SECONDS = 60  # how long a retry waits for the original request to finish
+IN_PROGRESS_TIMEOUT_SECONDS = 180  # after this, an unfinished claim is treated as abandoned
+KEY_TTL_HOURS = 24
+MAX_KEY_LENGTH = 255
+
+idempotency_metrics = Counter()
+idempotency_metrics_lock = Lock()
+
+
+def _count(key: str):
+    with idempotency_metrics_lock:
+        idempotency_metrics[key] += 1
+
+
+def request_hash(endpoint: str, payload) -> str:
+    """Fingerprint of the request, so a key can't be reused for a different request."""
+    body = json.dumps(jsonable_encoder(payload), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"{endpoint}\n{body}".encode()).hexdigest()
+
+
+class Claim:
+    """Outcome of `claim`: either `replay` is the stored response, or this request runs."""
+
+    def __init__(self, user_id: int, key: str, replay: JSONResponse = None):
+        self.user_id = user_id
+        self.key = key
+        self.replay = replay
+        self.finished = key is None or replay is not None
+
+    def complete(self, db: Session, response, status_code: int = 200):
+        """Stores the response in the caller's transaction, to be committed with its writes."""
+        if self.finished:
+            return
+        db.execute(
+            update(models.IdempotencyKey)
+            .where(models.IdempotencyKey.user_id == self.user_id, models.IdempotencyKey.key == self.key)
+            .values(
+                status="completed",
+                status_code=status_code,
+                response=jsonable_encoder(response),
+                completed_at=datetime.utcnow(),
+            )
+        )
+        self.finished = True
+
+    def release(self, db: Session):
+        """Drops an unfinished claim after a failure, so a retry runs the request again."""
+        if self.finished:
+            return
+        self.finished = True
+        try:
+            db.rollback()
+            db.execute(
+                delete(models.IdempotencyKey).where(
+                    models.IdempotencyKey.user_id == self.user_id,
+                    models.IdempotencyKey.key == self.key,
+                    models.IdempotencyKey.status == "in_progress",
+                )
+            )
+            db.commit()
+        except Exception as e:
+            logging.error(f"Error while releasing idempotency key {self.key!r}: {e}")
+
+
+def claim(db: Session, user_id: int, key: str, endpoint: str, payload=None) -> Claim:
+    """
+    Claims an idempotency key for a request.
+
+    Args:
+        db (Session): The database session of the request (the claim is committed).
+        user_id (int): The ID of the user the key belongs to.
+        key (str): The `Idempotency-Key` header, or None to run without one.
+        endpoint (str): The name of the endpoint.
+        payload: The request body.
+
+    Returns:
+        Claim: The claim; its `replay` is the stored response when the request already ran.
+
+    Raises:
+        HTTPException: 422 when the key was used for a different request, 409 when the
+        original request is still running after `WAIT_SECONDS`.
+    """
+    if not key:
+        return Claim(user_id, None)
+    if len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(status_code=400, detail="The Idempotency-Key header is too long.")
+
+    digest = request_hash(endpoint, payload)
+    deadline = time.monotonic() + WAIT_SECONDS
+    delay, waited = 0.05, False
+    while True:
+        inserted = db.execute(
+            insert(models.IdempotencyKey)
+            .values(
+                user_id=user_id,
+                key=key,
+                endpoint=endpoint,
+                request_hash=digest,
+                status="in_progress",
+                created_at=datetime.utcnow(),
+            )
+            .on_conflict_do_nothing(index_elements=["user_id", "key"])
+            .returning(models.IdempotencyKey.key)
+        ).first()
+        if inserted:
+            db.commit()
+            _count("claimed")
+            return Claim(user_id, key)
+
+        stored = db.execute(
+            select(
+                models.IdempotencyKey.endpoint,
+                models.IdempotencyKey.request_hash,
+                models.IdempotencyKey.status,
+                models.IdempotencyKey.status_code,
+                models.IdempotencyKey.response,
+                models.IdempotencyKey.created_at,
+            ).where(models.IdempotencyKey.user_id == user_id, models.IdempotencyKey.key == key)
+        ).first()
+        db.commit()  # end the read, so the next poll sees the other request's commit
+        if stored is None:
+            continue  # released by a failed request in the meantime
+
+        if stored.endpoint != endpoint or stored.request_hash != digest:
+            _count("mismatched")
+            raise HTTPException(status_code=422, detail="This Idempotency-Key was used for a different request.")
+        if stored.status == "completed":
+            _count("replayed_after_wait" if waited else "replayed")
+            return Claim(
+                user_id,
+                key,
+                replay=JSONResponse(
+                    status_code=stored.status_code,
+                    content=stored.response,
+                    headers={"Idempotent-Replayed": "true"},
+                ),
+            )
+        if datetime.utcnow() - stored.created_at > timedelta(seconds=IN_PROGRESS_TIMEOUT_SECONDS):
+            # The original request died without releasing the key; take it over
+            taken = db.execute(
+                update(models.IdempotencyKey)
+                .where(
+                    models.IdempotencyKey.user_id == user_id,
+                    models.IdempotencyKey.key == key,
+                    models.IdempotencyKey.status == "in_progress",
+                    models.IdempotencyKey.created_at == stored.created_at,
+                )
+                .values(created_at=datetime.utcnow())
+                .returning(models.IdempotencyKey.key)
+            ).first()
+            db.commit()
+            if taken:
+                _count("taken_over")
+                return Claim(user_id, key)
+            continue
+
+        if time.monotonic() >= deadline:
+            _count("conflicts")
+            raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress.")
+        if not waited:
+            _count("waited")
+            waited = True
+        time.sleep(delay)
+        delay = min(delay * 2, 1.0)
+
+
+def purge_expired_keys(db: Session) -> int:
+    """Deletes keys older than `KEY_TTL_HOURS`."""
+    result = db.execute(
+        delete(models.IdempotencyKey).where(
+            models.IdempotencyKey.created_at < datetime.utcnow() - timedelta(hours=KEY_TTL_HOURS)
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+
+def get_idempotency_metrics() -> dict:
+    with idempotency_metrics_lock:
+        return dict(idempotency_metrics)
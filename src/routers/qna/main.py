@@ -1,24 +1,38 @@
 from . import models
 from . import schemas
 from . import controller
-from fastapi import UploadFile,File,Form,Query
+from . import dedupe
+from . import idempotency
+from .summary import update_summary
+from .warm_start import warm_start_cache, prewarm
+from .channel import ChannelError, InterviewChannel, authenticate
+from fastapi import UploadFile,File,Form,Query,Request,BackgroundTasks,WebSocket,WebSocketDisconnect
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 from fastapi.security import OAuth2PasswordBearer
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
-from src.utils.db import get_db
+from src.utils.db import get_db, db_util
 from fastapi.security import OAuth2PasswordBearer
-from fastapi import APIRouter, Depends, HTTPException,status,BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Header, status
 from loguru import logger as logging
 from typing import Optional
 import os
 from src.utils.jwt import  get_email_from_token
 from src.routers.users.models import users as users_model
+from src.routers.dashboard import controller as dashboard_controller
+from src import mailer
+from src import jobs
+from src.llm import Priority, LLMQueueFull, LLMQueueTimeout, CircuitOpen, complete
 import urllib
-from datetime import datetime
+from datetime import datetime, timedelta
 import openai
 from threading import Lock
 import boto3
 import io
+import csv
+import json
+import asyncio
 
 # Global dictionary to store session-related data
 session_data_store = {}
@@ -36,12 +50,13 @@ UPLOAD_DIRECTORY = os.environ['RESUME_UPLOAD_PATH']
 # Initialize Boto3 client (IAM role will automatically be used)
 s3_client = boto3.client('s3', region_name='us-east-1')  # replace with your region
 BUCKET_NAME = 'ai-interview-bot'
-logging.error(f"s3_client:{s3_client}")
+logging.debug(f"s3_client:{s3_client}")
 
 
 
 @router.post("/upload-resume", response_model=schemas.ResumeUploadResponse)
 async def upload_resume(
+    background_tasks: BackgroundTasks,
     job_title: str = Form(...),  # Get job title from form data
     job_description: str = Form(...),  # Get job description from form data
     file: UploadFile = File(...),  # Get resume file
@@ -134,6 +149,10 @@ async def upload_resume(
         db.commit()
         db.refresh(new_resume)
 
+        # Prepare the first question while the user gets to the start button
+        warm_start_cache.begin(new_resume.id, user_id)
+        background_tasks.add_task(prewarm, new_resume.id, db_util.SessionLocal)
+
         # Prepare and return the response
         return schemas.ResumeUploadResponse(
             id=new_resume.id,
@@ -158,11 +177,12 @@ async def upload_resume(
 
 # Start interview endpoint
 @router.post("/start-interview/")
-async def start_interview(
-    background_tasks: BackgroundTasks,
+def start_interview(
     db: Session = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
+    token: str = Depends(oauth2_scheme),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
 ):
+    claim = None
     try:
         # Decode email from the token
         email = get_email_from_token(token)
@@ -171,6 +191,11 @@ async def start_interview(
         if not user:
             raise HTTPException(status_code=404, detail="User not found.")
 
+        # A retried request gets the stored response of the first one
+        claim = idempotency.claim(db, user.id, idempotency_key, "start_interview")
+        if claim.replay is not None:
+            return claim.replay
+
         # Check if an active session exists
         active_session = db.query(models.Session).filter_by(user_id=user.id, is_active=True).first()
         if active_session:
@@ -181,12 +206,10 @@ async def start_interview(
         if not resume_upload:
             raise HTTPException(status_code=404, detail="No resume uploaded.")
         
-        file_extention = resume_upload.file_format
-        if file_extention == "pdf":
-            resume_text = controller.extract_text_from_pdf(resume_upload.file_path)
-        else:
-            resume_text = controller.extract_text_from_docx(resume_upload.file_path)
-        
+        # Use the text and first question prepared at upload time, if ready
+        warm = warm_start_cache.take(resume_upload.id)
+        resume_text = warm[0] if warm else controller.extract_resume_text(resume_upload)
+
         # Retrieve job_title and job_description from ResumeUpload table
         job_title = resume_upload.job_title
         job_description = resume_upload.job_description
@@ -207,6 +230,19 @@ async def start_interview(
             start_time=datetime.utcnow()
         )
         db.add(new_session)
+        try:
+            db.flush()
+        except IntegrityError:
+            # A concurrent start created the active session first (ux_sessions_one_active)
+            raise HTTPException(status_code=400, detail="An interview session is already active.")
+
+        # Queue the session timeout check for when the session expires
+        jobs.enqueue(
+            db,
+            "enforce_session_timeout",
+            {"session_id": new_session.id},
+            run_at=new_session.start_time + timedelta(minutes=controller.SESSION_TIMEOUT_MINUTES),
+        )
         db.commit()
         db.refresh(new_session)
 
@@ -214,11 +250,11 @@ async def start_interview(
         with session_data_lock:
             session_data_store[user.id]["session_id"] = new_session.id
 
-        # Add the background task to monitor session timeout
-        background_tasks.add_task(controller.enforce_session_timeout, new_session.id, db)
-
         # Generate the first question
-        first_question = controller.generate_question(job_title,job_description,resume_text, new_session.id, db)
+        if warm:
+            first_question = f"Question 1: {warm[1]}"
+        else:
+            first_question = controller.generate_question(job_title,job_description,resume_text, new_session.id, db)
 
         # Record the first QnA entry
         qna_entry = models.QnA(
@@ -228,26 +264,39 @@ async def start_interview(
             generated_answer=None
         )
         db.add(qna_entry)
-        db.commit()
+        db.flush()
 
-        return {
+        response = {
             "success": True,
             "session_id": new_session.id,
             "question": first_question,
             "qna_id": qna_entry.id,
         }
+        claim.complete(db, response)
+        db.commit()
+        return response
+    except HTTPException:
+        raise
+    except (LLMQueueFull, LLMQueueTimeout, CircuitOpen) as e:
+        logging.warning(f"LLM capacity exhausted in start_interview: {e}")
+        raise HTTPException(status_code=503, detail="The interviewer is busy. Please retry in a moment.")
     except Exception as e:
         logging.error(f"Error in start_interview: {e}")
         raise HTTPException(status_code=500, detail="An error occurred.")
+    finally:
+        if claim is not None:
+            claim.release(db)
 
 
 # Submit answer endpoint
 @router.post("/submit-answer/")
-async def submit_answer(
+def submit_answer(
     request: schemas.SubmitAnswerRequest,
     db: Session = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
+    token: str = Depends(oauth2_scheme),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
 ):
+    claim = None
     try:
         # Decode email from the token
         email = get_email_from_token(token)
@@ -256,6 +305,11 @@ async def submit_answer(
         if not user:
             raise HTTPException(status_code=404, detail="User not found.")
 
+        # A retried request gets the stored response instead of scoring the answer again
+        claim = idempotency.claim(db, user.id, idempotency_key, "submit_answer", request.model_dump())
+        if claim.replay is not None:
+            return claim.replay
+
         # Validate active session
         active_session = db.query(models.Session).filter_by(user_id=user.id, is_active=True).first()
         if not active_session:
@@ -275,17 +329,22 @@ async def submit_answer(
             job_description = session_data_store[user.id]["job_description"]
 
         # Analyze the given answer and assign a score
-        score = controller.analyze_answer(request.user_answer)
+        score = controller.analyze_answer(request.user_answer, qna_entry.question_asked)
 
         # If the score is low, generate a suitable answer
         generated_answer = None
         if score < 3:  # Threshold for a poor answer
             generated_answer = controller.generate_answer(qna_entry.question_asked)
 
-        # Update the current QnA entry
+        # Update the current QnA entry and the dashboard aggregates in one transaction. The row is
+        # re-read under a lock, so an answer sent meanwhile over the channel isn't counted twice
+        db.refresh(qna_entry, with_for_update=True)
+        previous_score = qna_entry.answer_review
         qna_entry.answer_given = request.user_answer
         qna_entry.answer_review = score
         qna_entry.generated_answer = generated_answer
+        dashboard_controller.record_score(db, user.id, qna_entry.session_id, score, previous_score)
+        active_session.summary = update_summary(active_session.summary, qna_entry.question_asked, request.user_answer, score)
         db.commit()
 
         # Generate the next question
@@ -295,7 +354,9 @@ async def submit_answer(
             resume_text=resume_text,
             session_id=active_session.id,
             db=db,
-            previous_answer=request.user_answer
+            previous_answer=request.user_answer,
+            follow_up=controller.needs_follow_up(score),
+            summary=active_session.summary
         )
 
         # Create a new QnA entry for the next question, if valid
@@ -306,26 +367,113 @@ async def submit_answer(
                 question_asked=next_question
             )
             db.add(next_qna)
-            db.commit()
-            return {
+            db.flush()
+            response = {
                 "success": True,
                 "score": score,
                 "next_qna_id": next_qna.id,
                 "next_question": next_question,
             }
+            claim.complete(db, response)
+            db.commit()
+            return response
         else:
             # End session if no more questions
             active_session.is_active = False
             active_session.end_time = datetime.utcnow()
-            db.commit()
-            return {
+            response = {
                 "success": True,
                 "score": score,
                 "message": "Interview ended as no new questions were generated."
             }
+            claim.complete(db, response)
+            db.commit()
+            controller.discard_question_buffer(active_session.id)
+            dedupe.discard_session_index(active_session.id)
+            return response
+    except HTTPException:
+        raise
+    except (LLMQueueFull, LLMQueueTimeout, CircuitOpen) as e:
+        logging.warning(f"LLM capacity exhausted in submit_answer: {e}")
+        raise HTTPException(status_code=503, detail="The interviewer is busy. Please retry in a moment.")
     except Exception as e:
         logging.error(f"Error in submit_answer: {e}")
         raise HTTPException(status_code=500, detail="An error occurred.")
+    finally:
+        if claim is not None:
+            claim.release(db)
+
+
+CHANNEL_AUTH_TIMEOUT_SECONDS = 10
+
+
+@router.websocket("/ws/interview")
+async def interview_channel(websocket: WebSocket):
+    """
+    The whole interview over one connection (see channel.py for the protocol). The client
+    authenticates once with its first message; the score of an answer is sent as soon as it is
+    known and the next question follows.
+    """
+    await websocket.accept()
+    try:
+        message = await asyncio.wait_for(websocket.receive_json(), timeout=CHANNEL_AUTH_TIMEOUT_SECONDS)
+        user_id = None
+        if isinstance(message, dict) and message.get("type") == "auth":
+            user_id = await run_in_threadpool(authenticate, message.get("token"), db_util.SessionLocal)
+    except (asyncio.TimeoutError, ValueError):
+        user_id = None
+    except WebSocketDisconnect:
+        return
+    if user_id is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    channel = InterviewChannel(user_id, db_util.SessionLocal)
+    await websocket.send_json({"type": "ready"})
+    try:
+        while True:
+            text = await websocket.receive_text()
+            try:
+                message = json.loads(text)
+                kind = message.get("type") if isinstance(message, dict) else None
+                if kind == "start":
+                    reply = await run_in_threadpool(channel.start)
+                    # Keep the HTTP endpoints (submit-answer, report) usable for this session
+                    with session_data_lock:
+                        session_data_store[user_id] = {
+                            "resume_text": channel.resume_text,
+                            "job_title": channel.job_title,
+                            "job_description": channel.job_description,
+                            "session_id": channel.session_id,
+                        }
+                    await websocket.send_json(reply)
+                elif kind == "answer":
+                    answer = str(message.get("answer") or "")
+                    result = await run_in_threadpool(channel.score, answer)
+                    await websocket.send_json({"type": "score", "qna_id": channel.qna_id, "score": result["score"]})
+                    reply = await run_in_threadpool(
+                        channel.next_question, answer, result["score"], result["generated_answer"]
+                    )
+                    await websocket.send_json(reply)
+                elif kind == "end":
+                    await websocket.send_json(await run_in_threadpool(channel.end))
+                else:
+                    raise ChannelError(f"Unknown message type: {kind}")
+            except ChannelError as e:
+                await websocket.send_json({"type": "error", "detail": str(e)})
+            except ValueError:
+                await websocket.send_json({"type": "error", "detail": "Messages must be JSON objects."})
+            except (LLMQueueFull, LLMQueueTimeout, CircuitOpen) as e:
+                logging.warning(f"LLM capacity exhausted in interview_channel: {e}")
+                await websocket.send_json({"type": "error", "detail": "The interviewer is busy. Please retry in a moment."})
+            except WebSocketDisconnect:
+                raise
+            except Exception as e:
+                logging.error(f"Error in interview_channel: {e}")
+                await websocket.send_json({"type": "error", "detail": "An error occurred."})
+    except WebSocketDisconnect:
+        # An unfinished session is left to the session timeout, like an abandoned HTTP interview
+        logging.info(f"Interview channel of user {user_id} closed (session {channel.session_id}).")
 
 
 @router.post("/end-interview/")
@@ -357,6 +505,8 @@ async def end_interview(
         session.is_active = False
         session.end_time = datetime.utcnow()
         db.commit()
+        controller.discard_question_buffer(session.id)
+        dedupe.discard_session_index(session.id)
 
         return {
             "success": True,
@@ -371,7 +521,7 @@ async def end_interview(
 
 
 @router.get("/generate-interview-report/")
-async def generate_interview_report(
+def generate_interview_report(
     request: schemas.EndInterviewRequest,
     db: Session = Depends(get_db),
     token: str = Depends(oauth2_scheme)
@@ -439,8 +589,9 @@ async def generate_interview_report(
                 if not openai.api_key:
                     raise ValueError("Missing OpenAI API key.")
 
-                openai_response = openai.ChatCompletion.create(
-                    model="gpt-4o-mini-2024-07-18",
+                openai_response = complete(
+                    "suggestions",
+                    priority=Priority.BACKGROUND,
                     messages=[
                         {
                             "role": "system",
@@ -494,23 +645,9 @@ async def generate_interview_report(
         }
 
 
-# Background task to check and update completed interviews
-async def mark_completed_interviews(db: Session):
-    now = datetime.utcnow()
-    interviews = db.query(models.ScheduleInterview).filter(
-        models.ScheduleInterview.is_completed == False, 
-        models.ScheduleInterview.interview_date <= now  # Interviews whose date has passed
-    ).all()
-
-    for interview in interviews:
-        interview.is_completed = True
-        db.commit()
-
-# Schedule this background task in your existing interview scheduling endpoint
 @router.post("/schedule-interview/", response_model=dict)
 async def schedule_interview(
     interview: schemas.InterviewCreate,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     token: str = Depends(oauth2_scheme)
 ):
@@ -527,18 +664,19 @@ async def schedule_interview(
             "report": None
         }
 
-    # Check if an interview already exists for the same time and interviewer
-    existing_interview = db.query(models.ScheduleInterview).filter(
-        models.ScheduleInterview.is_completed == False  # Check for ongoing interviews
-    ).first()
+    conflict_response = {
+        "success": False,
+        "status": 400,
+        "message": "The interviewer is already scheduled at this time for an ongoing interview.",
+        "report": None
+    }
 
-    if existing_interview:
-        return {
-            "success": False,
-            "status": 400,
-            "message": "The interviewer is already scheduled at this time for an ongoing interview.",
-            "report": None
-        }
+    # Check if the interviewer already has an open interview overlapping this slot
+    start, end = controller.interview_slot(
+        interview.interview_date, interview.interview_time, interview.duration_minutes
+    )
+    if controller.find_conflicting_interview(db, user.id, start, end):
+        return conflict_response
 
     # Create a new interview record with user_id
     new_interview = models.ScheduleInterview(
@@ -547,95 +685,36 @@ async def schedule_interview(
         candidate_email=interview.candidate_email,
         interview_date=interview.interview_date,
         interview_time=interview.interview_time,
+        duration_minutes=interview.duration_minutes,
+        slot=controller.slot_range(start, end),
     )
     db.add(new_interview)
-    db.commit()
-    db.refresh(new_interview)
-
-    # Add background task to check completed interviews
-    background_tasks.add_task(mark_completed_interviews, db)
-
-    # Generate confirmation link with token
-    confirmation_link = f"http://ec2-3-219-12-193.compute-1.amazonaws.com:5173/confirm-interview/{new_interview.id}?token={controller.generate_token(new_interview.id)}"
-
-    # Prepare HTML email content
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <style>
-            body {{
-                font-family: Arial, sans-serif;
-                background-color: #f9f9f9;
-                margin: 0;
-                padding: 0;
-            }}
-            .email-container {{
-                max-width: 600px;
-                margin: 50px auto;
-                background-color: #ffffff;
-                border: 1px solid #e0e0e0;
-                border-radius: 8px;
-                box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-                overflow: hidden;
-            }}
-            .email-header {{
-                background-color: #4caf50;
-                color: #ffffff;
-                padding: 20px;
-                text-align: center;
-                font-size: 20px;
-            }}
-            .email-body {{
-                padding: 20px;
-                color: #333333;
-                line-height: 1.6;
-            }}
-            .email-body p {{
-                margin: 10px 0;
-            }}
-            .email-footer {{
-                background-color: #f1f1f1;
-                padding: 10px;
-                text-align: center;
-                font-size: 12px;
-                color: #666666;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="email-container">
-            <div class="email-header">
-                Interview Scheduled
-            </div>
-            <div class="email-body">
-            <p>Dear <span style="font-weight: bold;">{interview.candidate_name}</span>,</p>
-            <p>Your interview has been scheduled. Please find the details below:</p>
-            <p><strong>Date:</strong> {interview.interview_date.strftime('%d-%m-%Y')}</p>
-            <p><strong>Time:</strong> {interview.interview_time.strftime('%H:%M')}</p>
-            <p>We recommend that you join the meeting at least 10 minutes early to ensure your setup is working correctly. Please ensure you have a stable internet connection and a quiet environment for the interview. The meeting link will be shared with you separately.</p>
-            <p>To confirm the completion of your interview, please click the link below:</p>
-            <p><a href="{confirmation_link}">Confirm Interview Completion</a></p>
-            <p>Should you have any questions or need to reschedule, feel free to contact us at support@yourcompany.com.</p>
-            <p>Best regards,<br>Your Company</p>
-            </div>
-        <div class="email-footer">
-            &copy; 2025 Your Company. All rights reserved.
-        </div>
-        </div>
-    </body>
-    </html>
-    """
+    try:
+        db.flush()
+
+        # Build the confirmation email
+        html_content = controller.build_interview_email(
+            candidate_name=interview.candidate_name,
+            interview_date=interview.interview_date,
+            interview_time=interview.interview_time,
+            confirmation_link=controller.confirmation_link(new_interview.id),
+        )
 
-    # Send email with the confirmation link
-    subject = "Interview Scheduled"
-    background_tasks.add_task(
-        controller.send_email, 
-        to_email=email, 
-        subject=subject, 
-        message=html_content, 
-        content_type="html"
-    )
+        # Queue the email with the confirmation link in the same transaction
+        subject = "Interview Scheduled"
+        mailer.enqueue_email(
+            db,
+            to_email=email,
+            subject=subject,
+            body=html_content,
+            content_type="html"
+        )
+        db.commit()
+    except IntegrityError:
+        # A concurrent request booked an overlapping slot (exclusion constraint)
+        db.rollback()
+        return conflict_response
+    db.refresh(new_interview)
 
     # Return the response
     return {
@@ -651,6 +730,161 @@ async def schedule_interview(
         }
     }
 
+@router.post("/schedule-interviews/bulk/", response_model=dict)
+async def schedule_interviews_bulk(
+    request: Request,
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+):
+    """
+    Schedule many interviews at once.
+
+    Accepts either a JSON list of interviews or a multipart CSV upload (`file` field) with the
+    columns candidate_name, candidate_email, interview_date, interview_time and, optionally,
+    duration_minutes. Invalid or conflicting rows are reported and skipped, and the
+    confirmation emails are queued on the outbox.
+    """
+    email = get_email_from_token(token)
+    user = db.query(users_model.User).filter(users_model.User.email == email).first()
+
+    if not user:
+        return {
+            "success": False,
+            "status": 404,
+            "message": "User not found.",
+            "report": None
+        }
+
+    # Read the rows from the CSV upload or the JSON body
+    try:
+        if request.headers.get("content-type", "").startswith("multipart/form-data"):
+            form = await request.form()
+            upload = form.get("file")
+            if upload is None:
+                raise ValueError("Missing 'file' field.")
+            content = (await upload.read()).decode("utf-8-sig")
+            rows = [
+                {key: value for key, value in row.items() if value not in (None, "")}
+                for row in csv.DictReader(io.StringIO(content))
+            ]
+        else:
+            rows = json.loads(await request.body())
+            if not isinstance(rows, list):
+                raise ValueError("Expected a JSON list of interviews.")
+    except Exception as e:
+        logging.error(f"Invalid bulk scheduling payload: {e}")
+        return {
+            "success": False,
+            "status": 400,
+            "message": "Invalid payload. Send a JSON list or a CSV file.",
+            "report": None
+        }
+
+    if not rows or len(rows) > controller.MAX_BULK_INTERVIEWS:
+        return {
+            "success": False,
+            "status": 400,
+            "message": f"Send between 1 and {controller.MAX_BULK_INTERVIEWS} interviews.",
+            "report": None
+        }
+
+    valid, rejected = controller.parse_bulk_interviews(rows)
+    try:
+        created, conflicts = controller.schedule_interviews_bulk(db, user.id, valid)
+
+        # Render all confirmation emails in one batch and queue them with one multi-row insert
+        bodies = mailer.get_template("interview_scheduled").render_many(
+            controller.interview_email_fields(
+                candidate_name=interview.candidate_name,
+                interview_date=interview.interview_date,
+                interview_time=interview.interview_time,
+                confirmation_link=controller.confirmation_link(interview_id),
+            )
+            for _, interview, interview_id in created
+        )
+        mailer.enqueue_emails(db, [
+            {
+                "to_email": interview.candidate_email,
+                "subject": "Interview Scheduled",
+                "body": body,
+                "content_type": "html",
+            }
+            for (_, interview, _), body in zip(created, bodies)
+        ])
+        db.commit()
+    except IntegrityError:
+        # A concurrent request booked an overlapping slot (exclusion constraint)
+        db.rollback()
+        return {
+            "success": False,
+            "status": 409,
+            "message": "The schedule changed while importing. Please retry.",
+            "report": None
+        }
+    rejected = sorted(rejected + conflicts, key=lambda item: item["row"])
+
+    return {
+        "success": True,
+        "status": 200,
+        "message": f"Scheduled {len(created)} of {len(rows)} interviews.",
+        "report": {
+            "scheduled": [
+                {
+                    "row": row_number,
+                    "id": interview_id,
+                    "candidate_name": interview.candidate_name,
+                    "candidate_email": interview.candidate_email,
+                    "interview_date": interview.interview_date,
+                    "interview_time": interview.interview_time
+                }
+                for row_number, interview, interview_id in created
+            ],
+            "rejected": rejected
+        }
+    }
+
+@router.post("/interviewer-availability/", response_model=dict)
+async def interviewer_availability(
+    request: schemas.AvailabilityRequest,
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+):
+    """
+    Checks many candidate slots against the interviewer's schedule in one query.
+    """
+    email = get_email_from_token(token)
+    user = db.query(users_model.User).filter(users_model.User.email == email).first()
+
+    if not user:
+        return {
+            "success": False,
+            "status": 404,
+            "message": "User not found.",
+            "report": None
+        }
+
+    slots = [
+        controller.interview_slot(slot.interview_date, slot.interview_time, slot.duration_minutes)
+        for slot in request.slots
+    ]
+    conflicts = controller.check_availability(db, user.id, slots)
+
+    return {
+        "success": True,
+        "status": 200,
+        "message": "Availability checked successfully.",
+        "report": [
+            {
+                "interview_date": slot.interview_date,
+                "interview_time": slot.interview_time,
+                "duration_minutes": slot.duration_minutes,
+                "available": conflict is None,
+                "conflicting_interview_id": conflict,
+            }
+            for slot, conflict in zip(request.slots, conflicts)
+        ]
+    }
+
 @router.get("/confirm-interview/{interview_id}")
 async def confirm_interview(
     interview_id: int, 
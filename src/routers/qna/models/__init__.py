@@ -1,8 +1,12 @@
-from .qna import ResumeUpload,QnA,Session,ScheduleInterview
+from .qna import ResumeUpload,QnA,Session,ScheduleInterview,ScoringRun,QuestionBankVersion,QuestionBank,IdempotencyKey
 
 __all__= [
     "ResumeUpload",
     "QnA",
     "Session",
-    "ScheduleInterview"
+    "ScheduleInterview",
+    "ScoringRun",
+    "QuestionBankVersion",
+    "QuestionBank",
+    "IdempotencyKey"
 ]
@@ -10,8 +10,11 @@ from sqlalchemy import (
     DateTime,
     Boolean,
     Date,
-    Time
+    Time,
+    Index,
+    text
 )
+from sqlalchemy.dialects.postgresql import TSRANGE, ExcludeConstraint, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 Base = declarative_base()
@@ -56,7 +59,13 @@ class Session(Base):
     is_active = Column(Boolean, default=True)
     start_time = Column(DateTime, nullable=False)
     end_time = Column(DateTime, nullable=True)
-    
+    summary = Column(Text, nullable=True)  # rolling summary of the answers so far (see summary.py)
+
+    __table_args__ = (
+        # One active interview per user, even when two starts race
+        Index("ux_sessions_one_active", "user_id", unique=True, postgresql_where=text("is_active")),
+    )
+
 class ScheduleInterview(Base):
     __tablename__ = "interviews_scheduler"
 
@@ -66,7 +75,81 @@ class ScheduleInterview(Base):
     candidate_email = Column(String, nullable=False)
     interview_date = Column(Date, nullable=False)
     interview_time = Column(Time, nullable=False)
+    duration_minutes = Column(Integer, nullable=False, default=60)
+    slot = Column(TSRANGE, nullable=False)  # [start, end) of the interview
     is_completed = Column(Boolean, default=False)
+
+    __table_args__ = (
+        # One interviewer can't have two open interviews whose slots overlap.
+        # The GiST index behind this constraint also serves the overlap lookups.
+        ExcludeConstraint(
+            ("user_id", "="),
+            ("slot", "&&"),
+            name="interviews_scheduler_no_overlap",
+            using="gist",
+            where=text("NOT is_completed"),
+        ),
+    )
+
+
+class ScoringRun(Base):
+    __tablename__ = "scoring_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    rubric_version = Column(Integer, nullable=False)
+    mode = Column(String(20), nullable=False)  # "fallback" (rows stored with 3 or unscored) or "all"
+    status = Column(String(20), nullable=False, default="running")  # running, done
+    last_qna_id = Column(Integer, nullable=False, default=0)  # checkpoint: rows up to here are done
+    scored = Column(Integer, nullable=False, default=0)
+    changed = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)  # pages that stopped on a failed pack (retried)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+
+class QuestionBankVersion(Base):
+    __tablename__ = "question_bank_versions"
+
+    version = Column(Integer, primary_key=True)
+    status = Column(String(20), nullable=False, default="building")  # building, active, retired, failed
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    activated_at = Column(DateTime, nullable=True)
+
+
+class QuestionBank(Base):
+    __tablename__ = "question_bank"
+
+    id = Column(Integer, primary_key=True, index=True)
+    version = Column(Integer, nullable=False)
+    stage = Column(Integer, nullable=False)  # the question number it is meant for (1 or 2)
+    title_key = Column(String(255), nullable=True)  # normalized job title
+    skill = Column(String(100), nullable=True)
+    question = Column(Text, nullable=False)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_question_bank_version", "version"),
+    )
+
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    user_id = Column(Integer, primary_key=True)
+    key = Column(String(255), primary_key=True)
+    endpoint = Column(String(100), nullable=False)
+    request_hash = Column(String(64), nullable=False)
+    status = Column(String(20), nullable=False, default="in_progress")  # in_progress, completed
+    status_code = Column(Integer, nullable=True)
+    response = Column(JSONB, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_idempotency_keys_created_at", "created_at"),
+    )
+
+
 """
 CREATE TABLE sessions (
     id SERIAL PRIMARY KEY,
@@ -74,8 +157,75 @@ CREATE TABLE sessions (
     is_active BOOLEAN DEFAULT TRUE,
     start_time TIMESTAMP NOT NULL,
     end_time TIMESTAMP,
+    summary TEXT,
     FOREIGN KEY (user_id) REFERENCES users(id)
 );
 
 
-"""
\ No newline at end of file
+CREATE TABLE scoring_runs (
+    id SERIAL PRIMARY KEY,
+    rubric_version INTEGER NOT NULL,
+    mode VARCHAR(20) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'running',
+    last_qna_id INTEGER NOT NULL DEFAULT 0,
+    scored INTEGER NOT NULL DEFAULT 0,
+    changed INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE TABLE question_bank_versions (
+    version INTEGER PRIMARY KEY,
+    status VARCHAR(20) NOT NULL DEFAULT 'building',
+    created_at TIMESTAMP DEFAULT NOW(),
+    activated_at TIMESTAMP
+);
+
+CREATE TABLE question_bank (
+    id SERIAL PRIMARY KEY,
+    version INTEGER NOT NULL,
+    stage INTEGER NOT NULL,
+    title_key VARCHAR(255),
+    skill VARCHAR(100),
+    question TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+CREATE INDEX ix_question_bank_version ON question_bank (version);
+
+ALTER TABLE sessions ADD COLUMN summary TEXT;
+
+-- One active session per user (older duplicates are closed first)
+UPDATE sessions s SET is_active = FALSE, end_time = COALESCE(s.end_time, NOW())
+    WHERE s.is_active AND EXISTS (
+        SELECT 1 FROM sessions n WHERE n.user_id = s.user_id AND n.is_active AND n.id > s.id
+    );
+CREATE UNIQUE INDEX ux_sessions_one_active ON sessions (user_id) WHERE is_active;
+
+CREATE TABLE idempotency_keys (
+    user_id INTEGER NOT NULL,
+    key VARCHAR(255) NOT NULL,
+    endpoint VARCHAR(100) NOT NULL,
+    request_hash VARCHAR(64) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'in_progress',
+    status_code INTEGER,
+    response JSONB,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    completed_at TIMESTAMP,
+    PRIMARY KEY (user_id, key)
+);
+CREATE INDEX ix_idempotency_keys_created_at ON idempotency_keys (created_at);
+
+-- Interval-indexed scheduling (btree_gist is needed for the "user_id WITH =" part)
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+ALTER TABLE interviews_scheduler
+    ADD COLUMN duration_minutes INTEGER NOT NULL DEFAULT 60,
+    ADD COLUMN slot TSRANGE;
+UPDATE interviews_scheduler
+    SET slot = tsrange(interview_date + interview_time,
+                       interview_date + interview_time + make_interval(mins => duration_minutes));
+ALTER TABLE interviews_scheduler ALTER COLUMN slot SET NOT NULL;
+ALTER TABLE interviews_scheduler
+    ADD CONSTRAINT interviews_scheduler_no_overlap
+    EXCLUDE USING gist (user_id WITH =, slot WITH &&) WHERE (NOT is_completed);
+"""
@@ -0,0 +1,88 @@
+import re
+from collections import Counter
+from threading import Lock
+
+TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.\-']*")
+NON_ANSWERS = re.compile(
+    r"^\s*(i\s+(really\s+)?(do\s*n[o']?t|dont)\s+know|no\s+idea|not\s+sure|pass|skip|n/?a|nothing|none|idk|no\s+comment)[\s.!]*$",
+    re.I,
+)
+STOPWORDS = frozenset(
+    "a an the and or but if of to in on at for with by from as is are was were be been being am i me my we our "
+    "you your he she it its they them their this that these those do does did have has had not no so than too "
+    "very can could would should will just about into over also what which who whom how why when where there here "
+    "all any some such only own same other more most".split()
+)
+
+COPY_OVERLAP = 0.8  # share of the answer's words taken from the question
+COPY_COVERAGE = 0.8  # share of the question's words repeated in the answer
+
+prescore_metrics = {"checked": 0, "scored_locally": 0, "passed_to_llm": 0, "reasons": Counter()}
+prescore_metrics_lock = Lock()
+
+
+def tokenize(text: str):
+    # TOKEN keeps inner dots ("node.js"), so a sentence's final "." is stripped here
+    tokens = (token.rstrip(".") for token in TOKEN.findall((text or "").lower()))
+    return [token for token in tokens if token and token not in STOPWORDS]
+
+
+def prescore(answer: str, question: str = None):
+    """
+    Scores answers that are clearly not answers locally: empty ones, "I don't know" / "pass"
+    and copies of the question. Everything else, however short or differently worded, is left
+    to the LLM.
+
+    Args:
+        answer (str): The candidate's answer.
+        question (str): The question that was asked (optional).
+
+    Returns:
+        tuple: (score, reason) when the answer is not an answer, or None when it should be
+        scored by the LLM.
+
+    A copy must repeat most of the question; short answers naming what it mentions are answers:
+
+    >>> question = "Which orchestrator would you pick for a small team, Kubernetes or Nomad?"
+    >>> prescore("Kubernetes", question) is None
+    True
+    >>> prescore("Nomad, for a small team", question) is None
+    True
+    >>> prescore("Which orchestrator would you pick for a small team, Kubernetes or Nomad.", question)
+    (1, 'copied_question')
+    >>> prescore("Terraform", "How do you manage state in Terraform?") is None
+    True
+    >>> prescore("how do you monitor services in production.", "How do you monitor services in production?")
+    (1, 'copied_question')
+    >>> prescore("I don't know.", question)
+    (1, 'non_answer')
+    """
+    result = _prescore(answer, question)
+    with prescore_metrics_lock:
+        prescore_metrics["checked"] += 1
+        if result is None:
+            prescore_metrics["passed_to_llm"] += 1
+        else:
+            prescore_metrics["scored_locally"] += 1
+            prescore_metrics["reasons"][result[1]] += 1
+    return result
+
+
+def _prescore(answer, question):
+    words = TOKEN.findall((answer or "").lower())
+    if not words:
+        return 1, "empty"
+    if NON_ANSWERS.match(answer):
+        return 1, "non_answer"
+
+    tokens = tokenize(answer)
+    if question:
+        # Strip the "Question N:" prefix the generator adds
+        question = re.sub(r"^\s*question\s+\d+\s*:\s*", "", question, flags=re.I)
+        question_tokens = set(tokenize(question))
+        if tokens and question_tokens:
+            overlap = sum(1 for token in tokens if token in question_tokens) / len(tokens)
+            coverage = len(set(tokens) & question_tokens) / len(question_tokens)
+            if overlap >= COPY_OVERLAP and coverage >= COPY_COVERAGE and len(set(tokens)) <= len(question_tokens) + 2:
+                return 1, "copied_question"
+    return None
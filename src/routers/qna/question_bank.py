@@ -0,0 +1,249 @@
+"""
+Precomputed, versioned bank of opening questions.
+
+The first two questions of a session only depend on the job title (question 1) and the job
+description (question 2), so they are generated offline by the `build_question_bank` job
+and looked up in memory at interview time.
+
+    python -m src.routers.qna.question_bank            # build and activate a new version now
+"""
+import re
+import json
+import time
+import random
+from collections import Counter, defaultdict
+from datetime import datetime
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import func, insert, update
+from sqlalchemy.orm import Session
+from loguru import logger as logging
+from src.llm import Priority, complete
+from . import models
+
+MAX_TITLES = 500  # most frequent job titles covered by a build
+MAX_SKILLS = 200
+QUESTIONS_PER_KEY = 8
+BUILD_PARALLELISM = 4
+RELOAD_CHECK_SECONDS = 60  # how often lookups check for a newly activated version
+MIN_BUILD_COVERAGE = 0.9  # share of titles/skills that must get questions for a build to be activated
+
+SENIORITY_WORDS = frozenset(
+    "senior sr junior jr lead principal staff chief head associate intern trainee entry level mid i ii iii iv".split()
+)
+SKILLS = (
+    "python", "java", "javascript", "typescript", "golang", "rust", "c++", "c#", ".net", "php", "ruby",
+    "kotlin", "swift", "scala", "sql", "nosql", "postgresql", "mysql", "mongodb", "redis", "elasticsearch",
+    "kafka", "spark", "hadoop", "airflow", "dbt", "snowflake", "bigquery", "aws", "azure", "gcp", "docker",
+    "kubernetes", "terraform", "ansible", "linux", "git", "ci/cd", "jenkins", "react", "angular", "vue",
+    "node.js", "django", "flask", "fastapi", "spring", "rails", "graphql", "rest", "microservices",
+    "machine learning", "deep learning", "nlp", "computer vision", "pytorch", "tensorflow", "pandas", "numpy",
+    "statistics", "excel", "tableau", "power bi", "data analysis", "data engineering", "etl", "agile", "scrum",
+    "project management", "product management", "stakeholder management", "leadership", "communication",
+    "sales", "marketing", "seo", "content writing", "customer service", "accounting", "finance", "recruiting",
+    "figma", "ux", "ui design", "testing", "selenium", "security", "networking",
+)
+# Whole-word matches; "c++", "c#" and ".net" need custom boundaries
+SKILL_PATTERNS = tuple(
+    (skill, re.compile(r"(?<![\w+#.])" + re.escape(skill) + r"(?![\w+#])")) for skill in SKILLS
+)
+
+
+def normalize_title(job_title: str) -> str:
+    """Lowercases the title and drops punctuation and seniority words: "Sr. Python Developer" -> "python developer"."""
+    words = re.findall(r"[a-z0-9+#]+", (job_title or "").lower())
+    return " ".join(word for word in words if word not in SENIORITY_WORDS)
+
+
+def extract_skills(text: str):
+    """Skills of the fixed vocabulary mentioned in `text`, in vocabulary order."""
+    text = (text or "").lower()
+    found = []
+    for skill, pattern in SKILL_PATTERNS:
+        if pattern.search(text):
+            found.append(skill)
+    return found
+
+
+class QuestionBankIndex:
+    """In-memory copy of the active bank version, indexed by (title, stage) and (skill, stage)."""
+
+    def __init__(self):
+        self.version = None
+        self.by_title = {}
+        self.by_skill = {}
+        self.checked_at = 0.0
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def is_due(self) -> bool:
+        return time.monotonic() - self.checked_at >= RELOAD_CHECK_SECONDS
+
+    def refresh(self, db: Session, force: bool = False):
+        """Reloads the bank when a new version has been activated (checked once a minute)."""
+        if not force and not self.is_due():
+            return
+        with self.lock:
+            if not force and not self.is_due():
+                return
+            self.checked_at = time.monotonic()
+            active = (
+                db.query(func.max(models.QuestionBankVersion.version))
+                .filter(models.QuestionBankVersion.status == "active")
+                .scalar()
+            )
+            if active == self.version:
+                return
+            by_title, by_skill = defaultdict(list), defaultdict(list)
+            rows = db.query(
+                models.QuestionBank.stage,
+                models.QuestionBank.title_key,
+                models.QuestionBank.skill,
+                models.QuestionBank.question,
+            ).filter(models.QuestionBank.version == active).all()
+            for stage, title_key, skill, question in rows:
+                if title_key:
+                    by_title[(title_key, stage)].append(question)
+                if skill:
+                    by_skill[(skill, stage)].append(question)
+            self.by_title, self.by_skill, self.version = dict(by_title), dict(by_skill), active
+            logging.info(f"Question bank version {active} loaded ({len(rows)} questions).")
+
+    def lookup(self, db: Session, job_title: str, job_description: str, stage: int, rng=random):
+        """
+        A random bank question for this stage, or None.
+        Stage 1 is matched on the job title; stage 2 also on the skills in the job description.
+        """
+        if self.is_due():
+            try:
+                # Savepoint, so a failed reload can't abort the caller's transaction
+                with db.begin_nested():
+                    self.refresh(db)
+            except Exception as e:
+                logging.error(f"Error while refreshing the question bank: {e}")
+        pool = list(self.by_title.get((normalize_title(job_title), stage), ()))
+        if stage == 2:
+            for skill in extract_skills(job_description)[:5]:
+                pool.extend(self.by_skill.get((skill, stage), ()))
+        if not pool:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return rng.choice(pool)
+
+
+question_bank = QuestionBankIndex()
+
+
+class QuestionBankBuildFailed(Exception):
+    """Raised when a build produced too few questions to replace the active version."""
+
+
+def _generate(stage: int, subject: str):
+    """Asks the LLM for QUESTIONS_PER_KEY opening questions about a job title or skill."""
+    if stage == 1:
+        instruction = f"friendly ice-breaker interview questions for a candidate applying as: {subject}"
+    else:
+        instruction = f"interview questions about the candidate's hands-on experience with: {subject}"
+    try:
+        response = complete(
+            "question",
+            priority=Priority.BATCH,
+            messages=[
+                {"role": "system", "content": "You are an expert interviewer conducting a friendly and engaging interview."},
+                {
+                    "role": "user",
+                    "content": f"Write {QUESTIONS_PER_KEY} different, concise and conversational {instruction}. "
+                               "Respond with JSON: {\"questions\": [...]}",
+                },
+            ],
+            max_tokens=60 * QUESTIONS_PER_KEY,
+            temperature=0.9,
+            response_format={"type": "json_object"},
+        )
+        questions = json.loads(response['choices'][0]['message']['content'])["questions"]
+        return [str(question).strip() for question in questions if str(question).strip()]
+    except Exception as e:
+        logging.error(f"Error while generating bank questions for {subject!r}: {e}")
+        return []
+
+
+def build_question_bank(db: Session, max_titles: int = MAX_TITLES, max_skills: int = MAX_SKILLS) -> int:
+    """
+    Builds a new bank version from the most common job titles and skills of uploaded
+    resumes, then activates it and retires the previous one.
+
+    The new version is only activated when every job title got stage-1 questions and at
+    least `MIN_BUILD_COVERAGE` of the titles and skills got questions. Otherwise it is marked
+    `failed` and the active version stays in place.
+
+    Returns:
+        int: The new version number.
+
+    Raises:
+        QuestionBankBuildFailed: The build was not activated.
+    """
+    titles, skills = Counter(), Counter()
+    for job_title, job_description in db.query(models.ResumeUpload.job_title, models.ResumeUpload.job_description).yield_per(1000):
+        title_key = normalize_title(job_title)
+        if title_key:
+            titles[title_key] += 1
+        skills.update(set(extract_skills(job_description)))
+
+    version = (db.query(func.max(models.QuestionBankVersion.version)).scalar() or 0) + 1
+    db.add(models.QuestionBankVersion(version=version, status="building"))
+    db.commit()
+
+    work = [(1, title, {"title_key": title}) for title, _ in titles.most_common(max_titles)]
+    work += [(2, title, {"title_key": title}) for title, _ in titles.most_common(max_titles)]
+    work += [(2, skill, {"skill": skill}) for skill, _ in skills.most_common(max_skills)]
+
+    rows = []
+    covered = 0
+    missing_titles = []
+    with ThreadPoolExecutor(max_workers=BUILD_PARALLELISM) as executor:
+        for (stage, subject, key), questions in zip(work, executor.map(lambda item: _generate(item[0], item[1]), work)):
+            rows.extend({"version": version, "stage": stage, "question": question, **key} for question in questions)
+            covered += bool(questions)
+            if stage == 1 and not questions:
+                missing_titles.append(subject)
+
+    if not work or missing_titles or covered < MIN_BUILD_COVERAGE * len(work):
+        db.execute(
+            update(models.QuestionBankVersion)
+            .where(models.QuestionBankVersion.version == version)
+            .values(status="failed")
+        )
+        db.commit()
+        raise QuestionBankBuildFailed(
+            f"Question bank version {version} not activated: {covered}/{len(work)} titles and skills got questions, "
+            f"{len(missing_titles)} titles without a first question."
+        )
+
+    for start in range(0, len(rows), 1000):
+        db.execute(insert(models.QuestionBank), rows[start:start + 1000])
+
+    db.execute(
+        update(models.QuestionBankVersion)
+        .where(models.QuestionBankVersion.status == "active")
+        .values(status="retired")
+    )
+    db.execute(
+        update(models.QuestionBankVersion)
+        .where(models.QuestionBankVersion.version == version)
+        .values(status="active", activated_at=datetime.utcnow())
+    )
+    db.commit()
+    logging.info(f"Question bank version {version} activated with {len(rows)} questions.")
+    return version
+
+
+if __name__ == "__main__":
+    from src.utils.db import db_util
+
+    session = db_util.SessionLocal()
+    try:
+        print(f"Activated question bank version {build_question_bank(session)}.")
+    finally:
+        session.close()
@@ -1,4 +1,4 @@
-from .qna import  ResumeUploadBase,ResumeUploadCreate,ResumeUploadResponse,ResumeUploadUpdate,SubmitAnswerRequest,EndInterviewRequest,InterviewResponse,InterviewCreate
+from .qna import  ResumeUploadBase,ResumeUploadCreate,ResumeUploadResponse,ResumeUploadUpdate,SubmitAnswerRequest,EndInterviewRequest,InterviewResponse,InterviewCreate,InterviewSlot,AvailabilityRequest
 __all__= [
     "ResumeUploadBase",
     "ResumeUploadCreate",
@@ -7,5 +7,7 @@ __all__= [
     "SubmitAnswerRequest",
     "EndInterviewRequest",
     "InterviewResponse",
-    "InterviewCreate"
+    "InterviewCreate",
+    "InterviewSlot",
+    "AvailabilityRequest"
 ]
\ No newline at end of file
@@ -1,5 +1,5 @@
-from pydantic import BaseModel,EmailStr
-from typing import Optional
+from pydantic import BaseModel,EmailStr,Field
+from typing import Optional,List
 from datetime import datetime
 from datetime import date, time
 
@@ -56,6 +56,15 @@ class InterviewCreate(BaseModel):
     candidate_email: EmailStr
     interview_date: date
     interview_time: time
+    duration_minutes: int = Field(60, ge=5, le=480)
+
+class InterviewSlot(BaseModel):
+    interview_date: date
+    interview_time: time
+    duration_minutes: int = Field(60, ge=5, le=480)
+
+class AvailabilityRequest(BaseModel):
+    slots: List[InterviewSlot] = Field(..., min_length=1, max_length=5000)
 
 class InterviewResponse(InterviewCreate):
     id: int
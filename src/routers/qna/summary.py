@@ -0,0 +1,108 @@
+"""
+Rolling, size-capped summary of an interview session.
+
+After each answer the turn is condensed locally (no LLM call) into one line: the question
+and the answer's most informative sentences. Recent turns are kept as lines; when the summary
+outgrows `SUMMARY_MAX_TOKENS`, the oldest lines are folded into a list of earlier topics.
+Question generation gets the summary instead of the whole transcript, so the prompt stays
+the same size however long the session runs.
+"""
+import re
+from collections import Counter
+from .prescore import tokenize
+
+SUMMARY_MAX_TOKENS = 250
+TOPICS_PREFIX = "Earlier topics: "
+MAX_TOPICS = 24
+TURN_MAX_WORDS = 45  # words of the answer kept per turn
+QUESTION_MAX_WORDS = 18
+SENTENCE = re.compile(r"(?<=[.!?])\s+|\n+")
+QUESTION_PREFIX = re.compile(r"^\s*question\s+\d+\s*:\s*", re.I)
+TURN_ANSWER = re.compile(r" A(?: \(\d/5\))?: (.*)$")
+
+
+def estimate_tokens(text: str) -> int:
+    """Same 4-characters-per-token estimate the LLM dispatcher uses."""
+    return len(text) // 4
+
+
+def _truncate(text: str, max_words: int) -> str:
+    words = text.split()
+    return " ".join(words[:max_words]) + (" ..." if len(words) > max_words else "")
+
+
+def key_sentences(answer: str, question: str = "", max_words: int = TURN_MAX_WORDS):
+    """
+    The answer's most informative sentences, in their original order: sentences are ranked by
+    the content words they add beyond the question, favouring words repeated in the answer.
+    """
+    sentences = [sentence.strip() for sentence in SENTENCE.split(answer or "") if sentence.strip()]
+    if not sentences:
+        return ""
+    question_words = set(tokenize(question))
+    frequency = Counter(token for token in tokenize(answer) if token not in question_words)
+
+    def weight(sentence):
+        words = {token for token in tokenize(sentence) if token not in question_words}
+        return sum(frequency[word] for word in words) / (len(sentence.split()) ** 0.5)
+
+    ranked = sorted(range(len(sentences)), key=lambda index: weight(sentences[index]), reverse=True)
+    chosen, words = [], 0
+    for index in ranked:
+        length = len(sentences[index].split())
+        if chosen and words + length > max_words:
+            continue
+        chosen.append(index)
+        words += length
+        if words >= max_words:
+            break
+    return _truncate(" ".join(sentences[index] for index in sorted(chosen)), max_words)
+
+
+def summarize_turn(question: str, answer: str, score: int = None) -> str:
+    question = QUESTION_PREFIX.sub("", question or "")
+    rating = f" ({score}/5)" if score is not None else ""
+    return f"Q: {_truncate(question, QUESTION_MAX_WORDS)} A{rating}: {key_sentences(answer, question) or '(no answer)'}"
+
+
+def _topics(line: str):
+    """Most frequent content words of a turn's answer, used when the turn is folded into the topics."""
+    match = TURN_ANSWER.search(line)
+    answer = match.group(1) if match else line
+    return [word for word, _ in Counter(token for token in tokenize(answer) if len(token) > 3).most_common(3)]
+
+
+def update_summary(summary: str, question: str, answer: str, score: int = None, max_tokens: int = SUMMARY_MAX_TOKENS) -> str:
+    """
+    Adds a turn to the session summary, keeping it under `max_tokens`.
+
+    Args:
+        summary (str): The current summary (None or empty for a new session).
+        question (str): The question that was answered.
+        answer (str): The candidate's answer.
+        score (int): The answer's score (optional).
+        max_tokens (int): Size cap of the summary.
+
+    Returns:
+        str: The updated summary.
+    """
+    lines = (summary or "").splitlines()
+    topics = []
+    if lines and lines[0].startswith(TOPICS_PREFIX):
+        topics = [topic for topic in lines.pop(0)[len(TOPICS_PREFIX):].split(", ") if topic]
+    lines.append(summarize_turn(question, answer, score))
+
+    def render():
+        head = [TOPICS_PREFIX + ", ".join(topics[-MAX_TOPICS:])] if topics else []
+        return "\n".join(head + lines)
+
+    # Fold the oldest turns into the topic list until the summary fits (the newest turn always stays)
+    while len(lines) > 1 and estimate_tokens(render()) > max_tokens:
+        for topic in _topics(lines.pop(0)):
+            if topic in topics:
+                topics.remove(topic)
+            topics.append(topic)
+    text = render()
+    if estimate_tokens(text) > max_tokens:
+        text = text[: max_tokens * 4].rsplit(" ", 1)[0] + " ..."
+    return text
@@ -0,0 +1,142 @@
+"""
+Warm start of interviews.
+
+Right after a resume upload, the resume text is extracted and the first question prepared in
+the background, then held here keyed by the `resume_upload` id. `start_interview` takes the
+entry instead of parsing the file and calling the LLM; when the preparation is still running
+it waits for it rather than doing the same work twice.
+"""
+import time
+from threading import Event, Lock
+from loguru import logger as logging
+from . import controller, models
+
+WARM_START_TTL_SECONDS = 15 * 60
+WARM_START_WAIT_SECONDS = 10  # how long start_interview waits for a preparation in progress
+MAX_WARM_ENTRIES = 5000
+
+
+class _Entry:
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self.ready = Event()
+        self.resume_text = None
+        self.question = None
+        self.created_at = time.monotonic()
+
+
+class WarmStartCache:
+    """Prepared first questions by resume upload id, with at most one (the latest) per user."""
+
+    def __init__(self, ttl_seconds: float = WARM_START_TTL_SECONDS, max_entries: int = MAX_WARM_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.entries = {}
+        self.latest_by_user = {}
+        self.lock = Lock()
+        self.metrics = {"prepared": 0, "failed": 0, "hits": 0, "waited_hits": 0, "misses": 0, "expired": 0, "discarded": 0}
+
+    def _count(self, key: str):
+        self.metrics[key] += 1
+
+    def _remove(self, resume_upload_id: int):
+        entry = self.entries.pop(resume_upload_id)
+        if self.latest_by_user.get(entry.user_id) == resume_upload_id:
+            del self.latest_by_user[entry.user_id]
+        entry.ready.set()
+
+    def begin(self, resume_upload_id: int, user_id: int):
+        """Registers a preparation for a new upload; earlier uploads of the user are discarded."""
+        with self.lock:
+            previous = self.latest_by_user.get(user_id)
+            if previous in self.entries:
+                self._remove(previous)
+                self._count("discarded")
+            self.latest_by_user[user_id] = resume_upload_id
+            self.entries[resume_upload_id] = _Entry(user_id)
+            self._evict()
+
+    def put(self, resume_upload_id: int, resume_text: str, question: str):
+        """Stores a finished preparation (ignored when the upload has since been replaced)."""
+        with self.lock:
+            entry = self.entries.get(resume_upload_id)
+            if entry is None:
+                return
+            entry.resume_text, entry.question = resume_text, question
+            self._count("prepared")
+        entry.ready.set()
+
+    def fail(self, resume_upload_id: int):
+        """Drops a preparation that failed, releasing anyone waiting on it."""
+        with self.lock:
+            if resume_upload_id in self.entries:
+                self._remove(resume_upload_id)
+            self._count("failed")
+
+    def take(self, resume_upload_id: int, wait_seconds: float = WARM_START_WAIT_SECONDS):
+        """
+        Removes and returns `(resume_text, question)` for the upload, or None on a miss.
+        A preparation still in progress is waited for up to `wait_seconds`.
+        """
+        with self.lock:
+            entry = self.entries.get(resume_upload_id)
+        if entry is None:
+            with self.lock:
+                self._count("misses")
+            return None
+        waited = not entry.ready.is_set()
+        if waited and not entry.ready.wait(wait_seconds):
+            with self.lock:
+                self._count("misses")
+            return None
+        with self.lock:
+            if self.entries.get(resume_upload_id) is not entry or entry.question is None:
+                self._count("misses")
+                return None
+            self._remove(resume_upload_id)
+            if time.monotonic() - entry.created_at > self.ttl_seconds:
+                self._count("expired")
+                self._count("misses")
+                return None
+            self._count("waited_hits" if waited else "hits")
+            return entry.resume_text, entry.question
+
+    def _evict(self):
+        now = time.monotonic()
+        for resume_upload_id in [key for key, entry in self.entries.items() if now - entry.created_at > self.ttl_seconds]:
+            self._remove(resume_upload_id)
+            self._count("expired")
+        while len(self.entries) > self.max_entries:
+            self._remove(next(iter(self.entries)))
+            self._count("expired")
+
+    def get_metrics(self) -> dict:
+        with self.lock:
+            metrics = dict(self.metrics)
+            metrics["entries"] = len(self.entries)
+        lookups = metrics["hits"] + metrics["waited_hits"] + metrics["misses"]
+        metrics["warm_hit_ratio"] = round((metrics["hits"] + metrics["waited_hits"]) / lookups, 4) if lookups else 0.0
+        return metrics
+
+
+warm_start_cache = WarmStartCache()
+
+
+def prewarm(resume_upload_id: int, session_factory):
+    """
+    Background task run after an upload: extracts the resume text and prepares the first
+    question with its own database session.
+    """
+    db = session_factory()
+    try:
+        resume_upload = db.query(models.ResumeUpload).filter(models.ResumeUpload.id == resume_upload_id).first()
+        resume_text = controller.extract_resume_text(resume_upload)
+        question = controller.prepare_first_question(
+            resume_upload.job_title, resume_upload.job_description, resume_text, db
+        )
+        warm_start_cache.put(resume_upload_id, resume_text, question)
+    except Exception as e:
+        logging.warning(f"Could not prepare the first question for upload {resume_upload_id}: {e}")
+        warm_start_cache.fail(resume_upload_id)
+    finally:
+        db.close()
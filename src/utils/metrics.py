@@ -0,0 +1,264 @@
+# src/utils/metrics.py
+"""
+Prometheus metrics, served at `/metrics`.
+
+    http_request_duration_seconds{method, route, status}     per route template
+    llm_request_duration_seconds{model, purpose, outcome}    every attempt, hedges included
+    llm_tokens_total{model, purpose, direction}              prompt / completion tokens
+    llm_errors_total{model, purpose, error}
+    llm_queue_wait_seconds{priority}                         time waiting in the dispatcher
+    db_query_duration_seconds{operation}                     SELECT, INSERT, UPDATE, ...
+    db_pool_connections{state}                               checked_out, idle, overflow, size
+    interview_active_sessions, job_queue_depth{status}       read from the database per scrape
+    app_component_stat{component, stat}                      the in-process counters of the
+                                                             dispatcher, router, caches, ...
+
+With several uvicorn workers, set PROMETHEUS_MULTIPROC_DIR so the histograms and counters
+are aggregated across processes; the component stats are those of the process that serves
+the scrape.
+"""
+import os
+import time
+from threading import Lock
+from loguru import logger as logging
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+
+SCRAPE_CACHE_SECONDS = 15  # database-backed gauges are queried at most this often
+QUERY_OPERATIONS = ("SELECT", "INSERT", "UPDATE", "DELETE", "BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE")
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency per route template.",
+    ["method", "route", "status"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30),
+)
+LLM_REQUEST_DURATION = Histogram(
+    "llm_request_duration_seconds",
+    "Latency of outbound LLM requests.",
+    ["model", "purpose", "outcome"],
+    buckets=(0.25, 0.5, 1, 2, 3, 4, 6, 8, 10, 15, 30, 60),
+)
+LLM_TOKENS = Counter("llm_tokens_total", "Tokens used by LLM requests.", ["model", "purpose", "direction"])
+LLM_ERRORS = Counter("llm_errors_total", "Failed LLM requests.", ["model", "purpose", "error"])
+LLM_QUEUE_WAIT = Histogram(
+    "llm_queue_wait_seconds",
+    "Time LLM calls waited in the dispatcher for capacity.",
+    ["priority"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.5, 1, 2, 5, 10, 30),
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Latency of SQL statements.",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+
+
+class PrometheusMiddleware:
+    """ASGI middleware recording the latency of each HTTP request under its route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # FastAPI puts the matched route in the scope; unmatched paths share one label
+            route = getattr(scope.get("route"), "path", "unmatched")
+            if route != "/metrics":
+                HTTP_REQUEST_DURATION.labels(scope["method"], route, str(status[0])).observe(time.perf_counter() - started)
+
+
+def observe_llm_call(model: str, purpose: str, seconds: float, response=None, error: Exception = None):
+    """Records one LLM request (called by the model router for every attempt)."""
+    outcome = "error" if error is not None else "ok"
+    LLM_REQUEST_DURATION.labels(model, purpose, outcome).observe(seconds)
+    if error is not None:
+        LLM_ERRORS.labels(model, purpose, type(error).__name__).inc()
+        return
+    usage = response.get("usage") if hasattr(response, "get") else None
+    if usage:
+        LLM_TOKENS.labels(model, purpose, "prompt").inc(usage.get("prompt_tokens") or 0)
+        LLM_TOKENS.labels(model, purpose, "completion").inc(usage.get("completion_tokens") or 0)
+
+
+def observe_llm_queue_wait(priority: str, seconds: float):
+    LLM_QUEUE_WAIT.labels(priority).observe(seconds)
+
+
+def _operation(statement: str) -> str:
+    words = statement.lstrip().split(None, 1)
+    operation = words[0].upper() if words else ""
+    return operation if operation in QUERY_OPERATIONS else "OTHER"
+
+
+def instrument_engine(engine):
+    """Times every statement run on `engine`."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["metrics_query_started"].pop()
+        DB_QUERY_DURATION.labels(_operation(statement)).observe(time.perf_counter() - started)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("metrics_query_started"):
+            started = connection.info["metrics_query_started"].pop()
+            statement = exception_context.statement or ""
+            DB_QUERY_DURATION.labels(_operation(statement)).observe(time.perf_counter() - started)
+
+
+def _flatten(values: dict, prefix: str = ""):
+    """(stat, value) pairs of the numeric entries of a (nested) stats dict."""
+    for key, value in values.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{name}_")
+        elif isinstance(value, (int, float)):  # bools included; strings and None are skipped
+            yield name, float(value)
+
+
+class AppCollector:
+    """
+    Collects the pool, database and component gauges at scrape time. The database is queried
+    at most every `SCRAPE_CACHE_SECONDS`.
+    """
+
+    def __init__(self, engine, session_factory):
+        self.engine = engine
+        self.session_factory = session_factory
+        self.lock = Lock()
+        self.cached_at = 0.0
+        self.cached = None
+
+    def _database_gauges(self):
+        with self.lock:
+            if self.cached is not None and time.monotonic() - self.cached_at < SCRAPE_CACHE_SECONDS:
+                return self.cached
+            from src.jobs import queue_depth
+            from src.routers.qna import models as qna_models
+
+            db = self.session_factory()
+            try:
+                active = db.query(qna_models.Session).filter(qna_models.Session.is_active == True).count()
+                depth = queue_depth(db)
+            except Exception as e:
+                logging.warning(f"Could not read the database gauges: {e}")
+                return self.cached
+            finally:
+                db.close()
+            self.cached = (active, depth)
+            self.cached_at = time.monotonic()
+            return self.cached
+
+    def _component_stats(self):
+        from src.llm import dispatcher, router
+        from src.routers.qna import controller, dedupe, idempotency, prescore, warm_start
+
+        with prescore.prescore_metrics_lock:
+            prescore_stats = dict(prescore.prescore_metrics)
+            prescore_stats["reasons"] = dict(prescore_stats["reasons"])
+        with controller.completion_job_metrics_lock:
+            completion_stats = dict(controller.completion_job_metrics)
+        router_stats = router.get_stats()
+        router_stats["models"] = {
+            model: {**snapshot, "breaker_open": snapshot["breaker"] != "closed"}
+            for model, snapshot in router_stats["models"].items()
+        }
+        return {
+            "llm_dispatcher": dispatcher.get_stats(),
+            "llm_router": router_stats,
+            "prescore": prescore_stats,
+            "dedupe": dedupe.get_dedupe_metrics(),
+            "warm_start": warm_start.warm_start_cache.get_metrics(),
+            "idempotency": idempotency.get_idempotency_metrics(),
+            "completion_job": completion_stats,
+        }
+
+    def describe(self):
+        """The metric families without values, so registering doesn't run `collect`."""
+        yield GaugeMetricFamily("db_pool_connections", "Connections in the SQLAlchemy pool.", labels=["state"])
+        yield GaugeMetricFamily("interview_active_sessions", "Interview sessions in progress.")
+        yield GaugeMetricFamily("job_queue_depth", "Background jobs per status.", labels=["status"])
+        yield GaugeMetricFamily("app_component_stat", "In-process counters of the app components.", labels=["component", "stat"])
+
+    def collect(self):
+        pool = self.engine.pool
+        connections = GaugeMetricFamily("db_pool_connections", "Connections in the SQLAlchemy pool.", labels=["state"])
+        if hasattr(pool, "checkedout"):
+            connections.add_metric(["checked_out"], pool.checkedout())
+            connections.add_metric(["idle"], pool.checkedin())
+            connections.add_metric(["overflow"], max(0, pool.overflow()))
+            connections.add_metric(["size"], pool.size())
+        yield connections
+
+        database = self._database_gauges()
+        if database is not None:
+            active, depth = database
+            yield GaugeMetricFamily("interview_active_sessions", "Interview sessions in progress.", value=active)
+            queue = GaugeMetricFamily("job_queue_depth", "Background jobs per status.", labels=["status"])
+            for status in ("queued", "running"):
+                queue.add_metric([status], depth.get(status, 0))
+            yield queue
+
+        components = GaugeMetricFamily("app_component_stat", "In-process counters of the app components.", labels=["component", "stat"])
+        try:
+            for component, stats in self._component_stats().items():
+                for stat, value in _flatten(stats):
+                    components.add_metric([component, stat], value)
+        except Exception as e:
+            logging.warning(f"Could not read the component stats: {e}")
+        yield components
+
+
+_app_collector = None
+
+
+def register_app_collector(engine, session_factory):
+    global _app_collector
+    if _app_collector is None:
+        _app_collector = AppCollector(engine, session_factory)
+        REGISTRY.register(_app_collector)
+
+
+def render_metrics():
+    """Returns (body, content type) of the Prometheus exposition."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        body = generate_latest(registry)
+        if _app_collector is not None:
+            app_registry = CollectorRegistry()
+            app_registry.register(_app_collector)
+            body += generate_latest(app_registry)
+        return body, CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
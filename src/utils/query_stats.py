@@ -0,0 +1,203 @@
+# src/utils/query_stats.py
+"""
+Per-request SQL accounting: the number of statements, the time spent in them and the
+commits of each HTTP request.
+
+A request over its query budget, with slow statements, or running the same SELECT many times
+(usually an N+1 loop) is logged with its route. With QUERY_STATS_HEADER on (development and
+tests) every response carries
+
+    X-DB-Stats: queries=7; commits=2; db_ms=14.2; budget=25
+
+so tests can hold endpoints to their budget:
+
+    response = client.post("/qna/submit-answer/", json=payload, headers=auth)
+    assert_query_budget(response, max_queries=12, max_commits=2)
+
+Budgets per route template come from QUERY_BUDGETS, e.g. '{"POST /qna/submit-answer/": 12}'.
+"""
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from loguru import logger as logging
+from sqlalchemy import event
+from src.config.config import (
+    QUERY_BUDGETS,
+    QUERY_BUDGET_DEFAULT,
+    QUERY_STATS_HEADER,
+    SLOW_QUERY_MS,
+    REPEATED_QUERY_THRESHOLD,
+)
+
+HEADER = "X-DB-Stats"
+MAX_LOGGED_STATEMENT_LENGTH = 300
+
+
+class QueryStats:
+    """SQL statements, time and commits of one request (or one `query_budget` block)."""
+
+    def __init__(self):
+        self.queries = 0
+        self.commits = 0
+        self.rollbacks = 0
+        self.db_seconds = 0.0
+        self.statements = Counter()
+        self.slow = []  # (milliseconds, statement)
+
+    def record(self, statement: str, seconds: float):
+        self.queries += 1
+        self.db_seconds += seconds
+        self.statements[statement] += 1
+        if seconds * 1000 >= SLOW_QUERY_MS:
+            self.slow.append((round(seconds * 1000, 1), statement))
+
+    def repeated(self):
+        """Statements run at least `REPEATED_QUERY_THRESHOLD` times (likely N+1 loops)."""
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count >= REPEATED_QUERY_THRESHOLD and statement.lstrip().upper().startswith("SELECT")
+        ]
+
+    def header(self, budget: int = None) -> str:
+        value = f"queries={self.queries}; commits={self.commits}; db_ms={self.db_seconds * 1000:.1f}"
+        return f"{value}; budget={budget}" if budget is not None else value
+
+
+_current = ContextVar("query_stats", default=None)
+
+
+def current_stats():
+    return _current.get()
+
+
+def instrument_engine(engine):
+    """Counts the statements, commits and rollbacks run on `engine` into the current request's stats."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            conn.info.setdefault("query_stats_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = _current.get()
+        started = conn.info.get("query_stats_started")
+        if stats is not None and started:
+            stats.record(statement, time.perf_counter() - started.pop())
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_stats_started"):
+            connection.info["query_stats_started"].pop()
+
+    @event.listens_for(engine, "commit")
+    def _commit(conn):
+        stats = _current.get()
+        if stats is not None:
+            stats.commits += 1
+
+    @event.listens_for(engine, "rollback")
+    def _rollback(conn):
+        stats = _current.get()
+        if stats is not None:
+            stats.rollbacks += 1
+
+
+def budget_for(route: str) -> int:
+    return QUERY_BUDGETS.get(route, QUERY_BUDGET_DEFAULT)
+
+
+def report(route: str, stats: QueryStats):
+    """Logs a request that broke its budget, ran slow statements or repeated a SELECT."""
+    budget = budget_for(route)
+    if stats.queries > budget:
+        logging.warning(f"{route} ran {stats.queries} queries (budget {budget}, {stats.commits} commits, {stats.db_seconds * 1000:.1f} ms).")
+    for milliseconds, statement in stats.slow:
+        logging.warning(f"Slow query in {route} ({milliseconds} ms): {statement[:MAX_LOGGED_STATEMENT_LENGTH]}")
+    for statement, count in stats.repeated():
+        logging.warning(f"{route} ran the same query {count} times (possible N+1): {statement[:MAX_LOGGED_STATEMENT_LENGTH]}")
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware collecting the SQL stats of each HTTP request."""
+
+    def __init__(self, app, header: bool = QUERY_STATS_HEADER):
+        self.app = app
+        self.header = header
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current.set(stats)
+
+        async def send_with_stats(message):
+            if self.header and message["type"] == "http.response.start":
+                route = _route(scope)
+                value = stats.header(budget_for(route)).encode()
+                message["headers"] = list(message.get("headers") or []) + [(HEADER.lower().encode(), value)]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            _current.reset(token)
+            report(_route(scope), stats)
+
+
+def _route(scope) -> str:
+    return f"{scope['method']} {getattr(scope.get('route'), 'path', scope['path'])}"
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised by the test helpers when an endpoint or block goes over its query budget."""
+
+
+def parse_header(value: str) -> dict:
+    """{"queries": 7, "commits": 2, "db_ms": 14.2, "budget": 25} from an X-DB-Stats header."""
+    parsed = {}
+    for part in filter(None, (part.strip() for part in value.split(";"))):
+        name, _, number = part.partition("=")
+        parsed[name] = float(number) if "." in number else int(number)
+    return parsed
+
+
+def assert_query_budget(response, max_queries: int = None, max_commits: int = None) -> dict:
+    """
+    Checks a test client response against a query budget (its route's budget by default).
+    Needs QUERY_STATS_HEADER on in the app under test.
+    """
+    value = response.headers.get(HEADER)
+    if value is None:
+        raise QueryBudgetExceeded(f"The response has no {HEADER} header; set QUERY_STATS_HEADER=true.")
+    stats = parse_header(value)
+    limit = max_queries if max_queries is not None else stats.get("budget")
+    if limit is not None and stats["queries"] > limit:
+        raise QueryBudgetExceeded(f"{stats['queries']} queries, budget {limit} ({value}).")
+    if max_commits is not None and stats["commits"] > max_commits:
+        raise QueryBudgetExceeded(f"{stats['commits']} commits, budget {max_commits} ({value}).")
+    return stats
+
+
+@contextmanager
+def query_budget(max_queries: int = None, max_commits: int = None):
+    """
+    Counts the statements run in the block (in this thread's context) and raises
+    `QueryBudgetExceeded` when it goes over. For code called directly, e.g. a controller
+    function with a test session.
+    """
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+    if max_queries is not None and stats.queries > max_queries:
+        raise QueryBudgetExceeded(f"{stats.queries} queries, budget {max_queries}: {dict(stats.statements.most_common(5))}")
+    if max_commits is not None and stats.commits > max_commits:
+        raise QueryBudgetExceeded(f"{stats.commits} commits, budget {max_commits}.")
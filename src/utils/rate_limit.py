@@ -0,0 +1,60 @@
+# src/utils/rate_limit.py
+
+import time
+from threading import Condition
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    `rate` tokens are added per second up to `capacity`. `acquire` blocks until the
+    requested amount is available.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.condition = Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float = 1.0) -> float:
+        """Seconds until `amount` tokens are available (0 when they already are)."""
+        with self.condition:
+            self._refill()
+            missing = min(amount, self.capacity) - self.tokens
+            return max(0.0, missing / self.rate)
+
+    def try_acquire(self, amount: float = 1.0) -> bool:
+        """Takes `amount` tokens if they are available right now."""
+        amount = min(amount, self.capacity)
+        with self.condition:
+            self._refill()
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return True
+            return False
+
+    def acquire(self, amount: float = 1.0):
+        """Blocks until `amount` tokens are available and takes them."""
+        amount = min(amount, self.capacity)
+        with self.condition:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                self.condition.wait((amount - self.tokens) / self.rate)
+
+    def adjust(self, amount: float):
+        """Gives back (positive) or takes extra (negative) tokens after the fact."""
+        with self.condition:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens + amount)
+            self.condition.notify_all()
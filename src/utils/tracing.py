@@ -0,0 +1,233 @@
+# src/utils/tracing.py
+"""
+OpenTelemetry tracing of requests, controller functions, SQL statements and LLM calls.
+
+Tracing is off unless TRACING_EXPORTER is set:
+
+    otlp                a local collector (OTEL_EXPORTER_OTLP_ENDPOINT, default http://localhost:4318)
+    file:<path>         one JSON span per line
+    console             spans printed to stdout
+
+TRACING_SAMPLE_RATIO is the share of traces kept (head sampling; a trace started by a
+caller's `traceparent` header follows the caller's decision). When tracing is off none of the
+hooks are installed, and the LLM spans go to the no-op tracer.
+
+A request span looks like
+
+    POST /qna/submit-answer/
+      qna.controller.analyze_answer
+        llm scoring (gpt-4o-mini-2024-07-18)
+      db SELECT / db UPDATE / db COMMIT ...
+"""
+import inspect
+import functools
+from threading import Lock
+from loguru import logger as logging
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter, SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from sqlalchemy import event
+from src.config.config import TRACING_EXPORTER, TRACING_SAMPLE_RATIO
+
+MAX_STATEMENT_LENGTH = 2000
+
+tracer = trace.get_tracer("interview")
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Appends finished spans to a file, one JSON object per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = Lock()
+
+    def export(self, spans):
+        lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+        try:
+            with self.lock:
+                with open(self.path, "a", encoding="utf-8") as output:
+                    output.write(lines)
+        except OSError as e:
+            logging.warning(f"Could not write spans to {self.path}: {e}")
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        pass
+
+
+def build_exporter(spec: str):
+    mode, _, path = spec.partition(":")
+    if mode == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter()
+    if mode == "file":
+        return JsonLinesSpanExporter(path or "spans.jsonl")
+    if mode == "console":
+        return ConsoleSpanExporter()
+    raise ValueError(f"Unknown tracing exporter: {spec}")
+
+
+_enabled = False
+
+
+def configure_tracing(service_name: str, exporter: str = TRACING_EXPORTER, sample_ratio: float = TRACING_SAMPLE_RATIO) -> bool:
+    """Installs the tracer provider. Returns False (and does nothing) when tracing is off."""
+    global _enabled
+    if _enabled or not exporter or exporter == "none":
+        return _enabled
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": service_name}),
+        sampler=ParentBased(TraceIdRatioBased(sample_ratio)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(build_exporter(exporter)))
+    trace.set_tracer_provider(provider)
+    _enabled = True
+    logging.info(f"Tracing {sample_ratio:.0%} of traces to {exporter}.")
+    return True
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+class TracingMiddleware:
+    """ASGI middleware opening a server span per HTTP request, named after the route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope.get("headers") or []}
+        method = scope["method"]
+        with tracer.start_as_current_span(
+            f"{method} {scope['path']}",
+            context=propagate.extract(headers),
+            kind=SpanKind.SERVER,
+            attributes={"http.method": method, "http.target": scope["path"]},
+        ) as span:
+            trace_id = format(span.get_span_context().trace_id, "032x") if span.is_recording() else None
+
+            async def send_with_trace_id(message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_status(Status(StatusCode.ERROR))
+                    if trace_id:
+                        message["headers"] = list(message.get("headers") or []) + [(b"x-trace-id", trace_id.encode())]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_trace_id)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route:
+                    span.update_name(f"{method} {route}")
+                    span.set_attribute("http.route", route)
+
+
+def instrument_engine(engine):
+    """Opens a span per SQL statement run inside a traced request or job."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not trace.get_current_span().is_recording():
+            conn.info.setdefault("tracing_spans", []).append(None)
+            return
+        operation = (statement.lstrip().split(None, 1) or ["SQL"])[0].upper()
+        span = tracer.start_span(
+            f"db {operation}",
+            kind=SpanKind.CLIENT,
+            attributes={"db.system": "postgresql", "db.statement": statement[:MAX_STATEMENT_LENGTH]},
+        )
+        conn.info.setdefault("tracing_spans", []).append(span)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        span = conn.info["tracing_spans"].pop()
+        if span is not None:
+            if cursor.rowcount is not None and cursor.rowcount >= 0:
+                span.set_attribute("db.rows", cursor.rowcount)
+            span.end()
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("tracing_spans"):
+            span = connection.info["tracing_spans"].pop()
+            if span is not None:
+                span.record_exception(exception_context.original_exception)
+                span.set_status(Status(StatusCode.ERROR))
+                span.end()
+
+
+def _traced(function, name: str):
+    if inspect.iscoroutinefunction(function):
+        @functools.wraps(function)
+        async def async_wrapper(*args, **kwargs):
+            with tracer.start_as_current_span(name):
+                return await function(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        with tracer.start_as_current_span(name):
+            return function(*args, **kwargs)
+    return wrapper
+
+
+def trace_functions(module, prefix: str):
+    """
+    Wraps the public functions defined in `module` in spans named `<prefix>.<function>`.
+    Callers use `module.function`, so they (and calls inside the module) get the wrapped one.
+    """
+    functions = [
+        (name, value)
+        for name, value in vars(module).items()
+        if inspect.isfunction(value) and value.__module__ == module.__name__ and not name.startswith("_")
+    ]
+    for name, function in functions:
+        setattr(module, name, _traced(function, f"{prefix}.{name}"))
+
+
+def trace_controllers():
+    from src.routers.dashboard import controller as dashboard_controller
+    from src.routers.qna import controller as qna_controller
+
+    trace_functions(qna_controller, "qna.controller")
+    trace_functions(dashboard_controller, "dashboard.controller")
+
+
+def instrument_app(app, engine, service_name: str = "interview-api") -> bool:
+    """Configures tracing and installs the request, controller and database hooks."""
+    if not configure_tracing(service_name):
+        return False
+    app.add_middleware(TracingMiddleware)
+    instrument_engine(engine)
+    trace_controllers()
+    return True
+
+
+def llm_span(model: str, purpose: str, priority: str):
+    """Span of one outbound LLM request (a no-op unless tracing is on)."""
+    return tracer.start_as_current_span(
+        f"llm {purpose} ({model})",
+        kind=SpanKind.CLIENT,
+        attributes={"llm.model": model, "llm.purpose": purpose, "llm.priority": priority},
+    )
+
+
+def record_llm_response(span, response):
+    if not span.is_recording():
+        return
+    usage = response.get("usage") if hasattr(response, "get") else None
+    if usage:
+        span.set_attribute("llm.prompt_tokens", usage.get("prompt_tokens") or 0)
+        span.set_attribute("llm.completion_tokens", usage.get("completion_tokens") or 0)